@@ -1,19 +1,69 @@
 import streamlit as st
-import sqlite3
 import hashlib
 import pandas as pd
 import os
 from datetime import datetime
-import PyPDF2
-from docx import Document
 import json
+import uuid
+import socket
 import logging
-from bedrock_evaluator import BedrockEvaluator
+from database import get_connection, transaction, cached_query
+from migrations import run_migrations
+from backup import start_backup_scheduler
+from text_extraction import rar_supported, read_pdf_pages, sniff_format
+from extracted_documents import (
+    EXTRACTION_PENDING_MESSAGE, enqueue_extraction, delete_extracted_document, get_document_text,
+    start_extraction_worker
+)
+from evaluation_jobs import (
+    INTERRUPTED_MESSAGE, enqueue_evaluations, start_evaluation_job, renewing_lease, complete_evaluation_jobs,
+    fail_evaluation_jobs, cancel_evaluation_jobs, delete_evaluation_jobs, get_reference_file_paths,
+    get_evaluation_job_statuses, get_evaluation_job_counts, get_failed_evaluation_jobs
+)
+from bedrock_evaluator import get_evaluator, parse_partial_evaluation
+from batch_evaluation import evaluate_one
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 관리자 대시보드 목록의 페이지당 제출물 수
+SUBMISSIONS_PAGE_SIZE = 20
+
+# 제출물 정렬 옵션: 표시 이름 -> (정렬 방향, 정렬 열). submission_id가 항상 마지막 정렬 키로 붙습니다.
+SUBMISSION_SORT_OPTIONS = {
+    "최신순": ("DESC", ("s.submission_time",)),
+    "오래된순": ("ASC", ("s.submission_time",)),
+    # 학번이 같으면 제출 시간순. idx_submissions_student_time의 열 순서를 그대로 따라 정렬 없이 읽음
+    "학번순": ("ASC", ("s.student_id", "s.submission_time", "s.original_filename", "s.file_path")),
+}
+
+# 정렬 열이 조회 결과 행에서 차지하는 위치 (커서 생성용)
+SUBMISSION_SORT_COLUMN_INDEX = {
+    "s.student_id": 1,
+    "s.original_filename": 3,
+    "s.submission_time": 4,
+    "s.file_path": 5,
+}
+
+# 파일 미리보기: PDF는 처음 몇 페이지만 읽고 '더 보기'를 누를 때마다 다음 페이지를 읽습니다.
+PREVIEW_PAGES = 3
+PREVIEW_MAX_CHARS = 20000
+
+# 자동 평가 작업 상태를 다시 조회하는 간격 (초)
+EVALUATION_POLL_SECONDS = 3
+
+# 평가 상태 필터: 표시 이름 -> SQL 조건 (각각 인덱스로 찾을 수 있는 형태)
+EVALUATION_STATE_FILTERS = {
+    "전체": None,
+    "미평가": "s.is_evaluated = 0",
+    "AI 평가만": "e.grade IS NULL AND e.is_auto_evaluated = 1",
+    "교수 평가 완료": (
+        "s.submission_id IN (SELECT submission_id FROM evaluations WHERE grade IN ('A', 'B', 'C', 'D', 'F')) "
+        "AND e.grade IN ('A', 'B', 'C', 'D', 'F')"
+    ),
+}
+
 # 애플리케이션 설정
 st.set_page_config(
     page_title="학생 과제 제출 및 관리 시스템",
@@ -22,97 +72,14 @@ st.set_page_config(
 )
 
 # 데이터베이스 초기화 함수
+@st.cache_resource(show_spinner=False)
 def initialize_database():
-    """데이터베이스와 테이블을 초기화하고 초기 데이터를 삽입합니다."""
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
-    
-    # students 테이블 생성
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS students (
-            student_id TEXT PRIMARY KEY,
-            password TEXT NOT NULL,
-            name TEXT NOT NULL,
-            email TEXT NOT NULL
-        )
-    ''')
-    
-    # professors 테이블 생성
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS professors (
-            admin_id TEXT PRIMARY KEY,
-            password TEXT NOT NULL,
-            name TEXT NOT NULL
-        )
-    ''')
-    
-    # submissions 테이블 생성
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS submissions (
-            submission_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id TEXT NOT NULL,
-            file_path TEXT NOT NULL,
-            original_filename TEXT NOT NULL,
-            submission_time DATETIME NOT NULL,
-            FOREIGN KEY (student_id) REFERENCES students (student_id)
-        )
-    ''')
-    
-    # professor_files 테이블 생성 (평가기준, 모범답안 등)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS professor_files (
-            file_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            admin_id TEXT NOT NULL,
-            file_type TEXT NOT NULL,
-            file_path TEXT NOT NULL,
-            original_filename TEXT NOT NULL,
-            upload_time DATETIME NOT NULL,
-            FOREIGN KEY (admin_id) REFERENCES professors (admin_id)
-        )
-    ''')
-    
-    # evaluations 테이블 생성 (학생 과제 평가)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS evaluations (
-            evaluation_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            submission_id INTEGER NOT NULL,
-            admin_id TEXT NOT NULL,
-            grade TEXT CHECK(grade IN ('A', 'B', 'C', 'D', 'F')),
-            comments TEXT,
-            evaluation_time DATETIME NOT NULL,
-            is_auto_evaluated BOOLEAN DEFAULT 0,
-            auto_grade TEXT CHECK(auto_grade IN ('A', 'B', 'C', 'D', 'F', NULL)),
-            auto_comments TEXT,
-            auto_evaluation_time DATETIME,
-            FOREIGN KEY (submission_id) REFERENCES submissions (submission_id),
-            FOREIGN KEY (admin_id) REFERENCES professors (admin_id),
-            UNIQUE(submission_id, admin_id)
-        )
-    ''')
-    # 초기 데이터 확인 및 삽입
-    cursor.execute('SELECT COUNT(*) FROM students')
-    if cursor.fetchone()[0] == 0:
-        # 비밀번호 '1234'를 해싱
-        hashed_password = hashlib.sha256('1234'.encode()).hexdigest()
-        
-        # 학생 초기 데이터 삽입
-        students_data = [
-            ('20251111', hashed_password, '이국민', 'leegukmin@email.com'),
-            ('20252222', hashed_password, '김대학', 'kimdaehak@email.com'),
-            ('20253333', hashed_password, '최학생', 'choihaksaeng@email.com')
-        ]
-        cursor.executemany('INSERT INTO students VALUES (?, ?, ?, ?)', students_data)
-        
-        # 교수 초기 데이터 삽입
-        professors_data = [
-            ('admin1', hashed_password, '이교수'),
-            ('admin2', hashed_password, '김교수'),
-            ('admin3', hashed_password, '최교수')
-        ]
-        cursor.executemany('INSERT INTO professors VALUES (?, ?, ?)', professors_data)
-    
-    conn.commit()
-    conn.close()
+    """스키마 마이그레이션을 실행하고 예약 백업과 텍스트 추출 작업자를 시작합니다. 서버 프로세스당 한 번만 실행되고 이후 재실행에서는 캐시됩니다."""
+    schema_version = run_migrations()
+    logger.info(f"데이터베이스 스키마 버전: {schema_version}")
+    start_backup_scheduler()
+    start_extraction_worker()
+    return schema_version
 
 def hash_password(password):
     """비밀번호를 SHA256으로 해싱합니다."""
@@ -120,27 +87,23 @@ def hash_password(password):
 
 def authenticate_student(student_id, password):
     """학생 로그인 인증을 처리합니다."""
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
     
     hashed_password = hash_password(password)
     cursor.execute('SELECT student_id, name FROM students WHERE student_id = ? AND password = ?', 
                    (student_id, hashed_password))
     result = cursor.fetchone()
-    conn.close()
     
     return result
 
 def authenticate_admin(admin_id, password):
     """관리자 로그인 인증을 처리합니다."""
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
     
     hashed_password = hash_password(password)
     cursor.execute('SELECT admin_id, name FROM professors WHERE admin_id = ? AND password = ?', 
                    (admin_id, hashed_password))
     result = cursor.fetchone()
-    conn.close()
     
     return result
 
@@ -160,26 +123,24 @@ def save_submission(student_id, uploaded_file):
             f.write(uploaded_file.getbuffer())
         
         # 데이터베이스에 기록
-        conn = sqlite3.connect('database.db')
-        cursor = conn.cursor()
-        
         submission_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        cursor.execute('''
-            INSERT INTO submissions (student_id, file_path, original_filename, submission_time)
-            VALUES (?, ?, ?, ?)
-        ''', (student_id, file_path, uploaded_file.name, submission_time))
+        with transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO submissions (student_id, file_path, original_filename, submission_time)
+                VALUES (?, ?, ?, ?)
+            ''', (student_id, file_path, uploaded_file.name, submission_time))
         
-        conn.commit()
-        conn.close()
+        # 텍스트 추출은 백그라운드 작업자가 처리 (완료되면 검색 색인도 갱신됨)
+        enqueue_extraction(file_path)
         
         return True, "파일이 성공적으로 제출되었습니다!"
     except Exception as e:
         return False, f"파일 제출 중 오류가 발생했습니다: {str(e)}"
 
+@cached_query
 def get_student_submissions(student_id):
     """특정 학생의 제출 내역을 조회합니다."""
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
     
     cursor.execute('''
         SELECT 
@@ -203,7 +164,6 @@ def get_student_submissions(student_id):
     ''', (student_id,))
     
     results = cursor.fetchall()
-    conn.close()
     
     return results
 
@@ -214,22 +174,21 @@ def delete_submission(submission_id, file_path):
         if os.path.exists(file_path):
             os.remove(file_path)
         
-        # 데이터베이스에서 기록 삭제
-        conn = sqlite3.connect('database.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM submissions WHERE submission_id = ?', (submission_id,))
-        conn.commit()
-        conn.close()
+        # 데이터베이스에서 기록 삭제 (평가가 남아 통계에 집계되지 않도록 함께 삭제)
+        with transaction() as cursor:
+            cursor.execute('DELETE FROM evaluations WHERE submission_id = ?', (submission_id,))
+            delete_evaluation_jobs(cursor, submission_id)
+            cursor.execute('DELETE FROM submissions WHERE submission_id = ?', (submission_id,))
+            delete_extracted_document(cursor, file_path)
         
         return True, "제출 내역이 성공적으로 삭제되었습니다."
     except Exception as e:
         return False, f"삭제 중 오류가 발생했습니다: {str(e)}"
 
+@cached_query
 def get_all_submissions():
     """모든 제출 내역을 학생 정보와 함께 조회합니다."""
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
     
     cursor.execute('''
         SELECT s.student_id, st.name, s.original_filename, s.submission_time
@@ -239,7 +198,6 @@ def get_all_submissions():
     ''')
     
     results = cursor.fetchall()
-    conn.close()
     
     return results
 
@@ -264,26 +222,24 @@ def save_professor_file(admin_id, uploaded_file, file_type):
             f.write(uploaded_file.getbuffer())
         
         # 데이터베이스에 기록
-        conn = sqlite3.connect('database.db')
-        cursor = conn.cursor()
-        
         upload_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        cursor.execute('''
-            INSERT INTO professor_files (admin_id, file_type, file_path, original_filename, upload_time)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (admin_id, file_type, file_path, uploaded_file.name, upload_time))
+        with transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO professor_files (admin_id, file_type, file_path, original_filename, upload_time)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (admin_id, file_type, file_path, uploaded_file.name, upload_time))
         
-        conn.commit()
-        conn.close()
+        # 텍스트 추출은 백그라운드 작업자가 처리
+        enqueue_extraction(file_path)
         
         return True, "파일이 성공적으로 업로드되었습니다!"
     except Exception as e:
         return False, f"파일 업로드 중 오류가 발생했습니다: {str(e)}"
 
+@cached_query
 def get_professor_files(admin_id=None):
     """교수 파일 목록을 조회합니다."""
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
     
     if admin_id:
         cursor.execute('''
@@ -301,10 +257,23 @@ def get_professor_files(admin_id=None):
         ''')
     
     results = cursor.fetchall()
-    conn.close()
     
     return results
 
+@cached_query
+def get_latest_professor_file(file_type):
+    """가장 최근에 업로드된 특정 유형(평가기준/모범답안)의 교수 파일을 조회합니다."""
+    cursor = get_connection().cursor()
+    
+    cursor.execute('''
+        SELECT file_id, original_filename, upload_time, file_path
+        FROM professor_files 
+        WHERE file_type = ? 
+        ORDER BY upload_time DESC LIMIT 1
+    ''', (file_type,))
+    
+    return cursor.fetchone()
+
 def delete_professor_file(file_id, file_path):
     """교수 파일을 삭제합니다."""
     try:
@@ -313,224 +282,156 @@ def delete_professor_file(file_id, file_path):
             os.remove(file_path)
         
         # 데이터베이스에서 기록 삭제
-        conn = sqlite3.connect('database.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM professor_files WHERE file_id = ?', (file_id,))
-        conn.commit()
-        conn.close()
+        with transaction() as cursor:
+            cursor.execute('DELETE FROM professor_files WHERE file_id = ?', (file_id,))
+            delete_extracted_document(cursor, file_path)
         
         return True, "파일이 성공적으로 삭제되었습니다."
     except Exception as e:
         return False, f"삭제 중 오류가 발생했습니다: {str(e)}"
 
-def read_file_content(file_path):
-    """파일 내용을 읽어서 반환합니다."""
-    try:
-        file_extension = os.path.splitext(file_path)[1].lower()
-        
-        if file_extension == '.pdf':
-            return read_pdf_content(file_path)
-        elif file_extension in ['.docx', '.doc']:
-            return read_docx_content(file_path)
-        elif file_extension == '.txt':
-            return read_txt_content(file_path)
-        else:
-            return False, "지원하지 않는 파일 형식입니다. (PDF, Word, TXT 파일만 미리보기 가능)"
+def load_file_preview(file_path, position=None):
+    """
+    미리보기용 파일 내용을 position부터 읽습니다.
     
-    except Exception as e:
-        return False, f"파일을 읽는 중 오류가 발생했습니다: {str(e)}"
-
-def read_pdf_content(file_path):
-    """PDF 파일 내용을 읽습니다."""
-    try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            content = ""
-            
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                content += page.extract_text() + "\n"
-            
-            if content.strip():
-                return True, content
-            else:
-                return False, "PDF에서 텍스트를 추출할 수 없습니다."
+    업로드 시 추출된 텍스트가 있으면 PREVIEW_MAX_CHARS 글자씩 잘라 보여주고, 아직 추출 중인
+    PDF만 PREVIEW_PAGES 페이지(또는 PREVIEW_MAX_CHARS 글자)씩 파일에서 바로 읽습니다.
+    position은 (다음에 읽을 페이지 번호, 지금까지 보여준 글자 수)입니다. PDF 페이지는 추출된
+    텍스트와 같은 방식으로 이어 붙이므로, 보는 도중 추출이 끝나면 같은 글자 위치부터
+    추출된 텍스트로 이어 읽습니다.
     
-    except Exception as e:
-        return False, f"PDF 읽기 오류: {str(e)}"
-
-def read_docx_content(file_path):
-    """Word 문서 내용을 읽습니다."""
-    try:
-        doc = Document(file_path)
-        content = ""
-        
-        for paragraph in doc.paragraphs:
-            content += paragraph.text + "\n"
-        
-        if content.strip():
-            return True, content
-        else:
-            return False, "Word 문서에 텍스트가 없습니다."
+    Returns:
+        tuple: (성공 여부, 내용 또는 오류 메시지, 다음 position 또는 None)
+    """
+    next_page, offset = position or (0, 0)
+    success, content = get_document_text(file_path)
+    if success:
+        end = offset + PREVIEW_MAX_CHARS
+        return True, content[offset:end], (None, end) if end < len(content) else None
     
-    except Exception as e:
-        return False, f"Word 문서 읽기 오류: {str(e)}"
+    pending_pdf = (
+        content == EXTRACTION_PENDING_MESSAGE and next_page is not None
+        and os.path.exists(file_path) and sniff_format(file_path) == 'pdf'
+    )
+    if not pending_pdf:
+        return False, content, None
+    
+    success, content, next_page = read_pdf_pages(file_path, next_page, PREVIEW_PAGES, PREVIEW_MAX_CHARS)
+    if not success or next_page is None:
+        return success, content, None
+    return True, content, (next_page, offset + len(content))
 
-def read_txt_content(file_path):
-    """텍스트 파일 내용을 읽습니다."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        if content.strip():
-            return True, content
+def open_file_preview(content_key, file_path):
+    """파일 미리보기 첫 부분을 세션 상태에 저장합니다. 실패하면 오류 메시지를 반환합니다."""
+    success, content, position = load_file_preview(file_path)
+    if not success:
+        return content
+    st.session_state[content_key] = content
+    st.session_state[f"{content_key}_position"] = position
+    return None
+
+def close_file_preview(content_key):
+    """세션 상태의 파일 미리보기를 삭제합니다."""
+    st.session_state.pop(content_key, None)
+    st.session_state.pop(f"{content_key}_position", None)
+
+def render_load_more_button(content_key, file_path):
+    """남은 내용이 있으면 '더 보기' 버튼을 표시하고, 누르면 다음 부분을 이어 붙입니다."""
+    position = st.session_state.get(f"{content_key}_position")
+    if position is None:
+        return
+    
+    next_page = position[0]
+    label = f"⬇️ 더 보기 ({next_page + 1}페이지부터)" if next_page is not None else "⬇️ 더 보기"
+    if st.button(label, key=f"{content_key}_more"):
+        success, content, position = load_file_preview(file_path, position)
+        if success:
+            st.session_state[content_key] += content
+            st.session_state[f"{content_key}_position"] = position
+            st.rerun()
         else:
-            return False, "텍스트 파일이 비어있습니다."
-    
-    except UnicodeDecodeError:
-        try:
-            with open(file_path, 'r', encoding='cp949') as file:
-                content = file.read()
-            return True, content
-        except Exception as e:
-            return False, f"텍스트 파일 인코딩 오류: {str(e)}"
-    except Exception as e:
-        return False, f"텍스트 파일 읽기 오류: {str(e)}"
+            st.error(content)
 
-def auto_evaluate_submission(submission_id, admin_id):
-    """Bedrock을 사용하여 학생 과제를 자동으로 평가합니다."""
+def auto_evaluate_submission(submission_id, admin_id, force=False, on_text=None):
+    """
+    제출물 하나를 앱에서 바로 자동 평가하고 결과를 저장합니다.
+    
+    응답은 스트리밍으로 받아 텍스트 조각이 도착할 때마다 on_text를 호출합니다. 평가는 진행 중인
+    평가 작업으로 기록되므로 작업자와 중복 평가되지 않으며, 평가 도중 화면을 벗어나거나 오류가
+    발생하면 작업을 실패로 처리해 다시 평가할 수 있게 합니다. force이면 캐시된 결과를 무시합니다.
+    """
+    worker_id = f"app:{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    job_id = None
     try:
-        conn = sqlite3.connect('database.db')
-        cursor = conn.cursor()
+        cursor = get_connection().cursor()
         
-        # 제출물 정보 가져오기
+        # 제출물 확인
         cursor.execute('''
             SELECT file_path FROM submissions WHERE submission_id = ?
         ''', (submission_id,))
-        submission_result = cursor.fetchone()
         
-        if not submission_result:
-            conn.close()
+        submission = cursor.fetchone()
+        if not submission:
             return False, "제출물을 찾을 수 없습니다."
         
-        submission_path = submission_result[0]
-        
-        # 평가 기준 파일 가져오기
-        cursor.execute('''
-            SELECT file_path FROM professor_files 
-            WHERE file_type = '평가기준' 
-            ORDER BY upload_time DESC LIMIT 1
-        ''')
-        criteria_result = cursor.fetchone()
-        
-        if not criteria_result:
-            conn.close()
+        # 평가 기준 파일 확인
+        criteria_path, model_answer_path = get_reference_file_paths()
+        if not criteria_path:
             return False, "평가 기준 파일을 찾을 수 없습니다."
         
-        criteria_path = criteria_result[0]
-        
-        # 모범 답안 파일 가져오기 (선택적)
-        cursor.execute('''
-            SELECT file_path FROM professor_files 
-            WHERE file_type = '모범답안' 
-            ORDER BY upload_time DESC LIMIT 1
-        ''')
-        model_answer_result = cursor.fetchone()
-        
-        model_answer_path = None
-        if model_answer_result:
-            model_answer_path = model_answer_result[0]
-        
-        # Bedrock 평가기 초기화
-        evaluator = BedrockEvaluator()
-        
-        # 자동 평가 실행
-        evaluation_result = evaluator.evaluate_submission(
-            submission_path, 
-            criteria_path, 
-            model_answer_path
-        )
-        
-        auto_grade = evaluation_result.get('grade')
-        auto_comments = evaluation_result.get('comments')
-        auto_evaluation_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # 평가 결과 저장
-        cursor.execute('''
-            SELECT evaluation_id FROM evaluations 
-            WHERE submission_id = ? AND admin_id = ?
-        ''', (submission_id, admin_id))
-        
-        existing = cursor.fetchone()
-        
-        if existing:
-            # 기존 평가 업데이트
-            cursor.execute('''
-                UPDATE evaluations 
-                SET is_auto_evaluated = 1, auto_grade = ?, auto_comments = ?, auto_evaluation_time = ?
-                WHERE submission_id = ? AND admin_id = ?
-            ''', (auto_grade, auto_comments, auto_evaluation_time, submission_id, admin_id))
-        else:
-            # 새 평가 추가
-            cursor.execute('''
-                INSERT INTO evaluations 
-                (submission_id, admin_id, grade, comments, evaluation_time, 
-                is_auto_evaluated, auto_grade, auto_comments, auto_evaluation_time)
-                VALUES (?, ?, NULL, NULL, ?, 1, ?, ?, ?)
-            ''', (submission_id, admin_id, auto_evaluation_time, auto_grade, auto_comments, auto_evaluation_time))
-        
-        conn.commit()
-        conn.close()
+        job_id = start_evaluation_job(admin_id, submission_id, worker_id, force)
+        if job_id is None:
+            return False, "이미 자동 평가가 대기 중이거나 진행 중입니다."
         
-        return True, f"자동 평가가 완료되었습니다. 등급: {auto_grade}"
+        # 평가가 오래 걸려도 작업자가 가져가지 않도록 평가하는 동안 임대를 연장
+        with renewing_lease(worker_id, job_id):
+            result = evaluate_one(
+                get_evaluator(), submission_id, submission[0], criteria_path, model_answer_path, force, on_text
+            )
+        result.update(job_id=job_id, admin_id=admin_id)
+        saved = complete_evaluation_jobs(worker_id, [result])
+        
+        if not result['success']:
+            return False, result['error']
+        if not saved:
+            return False, "평가 시간이 초과되어 결과를 저장하지 못했습니다. 평가 작업자가 다시 평가합니다."
+        return True, f"자동 평가가 완료되었습니다: {result['grade']} 등급"
     except Exception as e:
         logger.error(f"자동 평가 중 오류 발생: {str(e)}")
-        return False, f"자동 평가 중 오류가 발생했습니다: {str(e)}"
+        message = f"자동 평가 중 오류가 발생했습니다: {str(e)}"
+        if job_id is not None:
+            fail_evaluation_jobs(worker_id, message)
+        return False, message
+    finally:
+        # 완료 처리되지 않은 작업(화면 이동으로 중단 등)은 실패로 처리 (대기열로 돌려놓으면
+        # 평가 작업자가 실행 중이지 않을 때 대기 상태로 남아 다시 평가할 수 없음)
+        if job_id is not None:
+            fail_evaluation_jobs(worker_id, INTERRUPTED_MESSAGE)
 
 def save_evaluation(submission_id, admin_id, grade, comments):
     """학생 과제 평가를 저장하거나 업데이트합니다."""
     try:
-        conn = sqlite3.connect('database.db')
-        cursor = conn.cursor()
-        
         evaluation_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        # 기존 평가가 있는지 확인
-        cursor.execute('''
-            SELECT evaluation_id, is_auto_evaluated, auto_grade, auto_comments FROM evaluations 
-            WHERE submission_id = ? AND admin_id = ?
-        ''', (submission_id, admin_id))
-        
-        existing = cursor.fetchone()
-        
-        if existing:
-            # 기존 평가 업데이트
-            cursor.execute('''
-                UPDATE evaluations 
-                SET grade = ?, comments = ?, evaluation_time = ?
-                WHERE submission_id = ? AND admin_id = ?
-            ''', (grade, comments, evaluation_time, submission_id, admin_id))
-            message = "평가가 성공적으로 수정되었습니다!"
-        else:
-            # 새 평가 추가
+        # UNIQUE(submission_id, admin_id)를 이용해 조회 없이 한 문장으로 추가 또는 수정
+        with transaction() as cursor:
             cursor.execute('''
                 INSERT INTO evaluations (submission_id, admin_id, grade, comments, evaluation_time)
                 VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (submission_id, admin_id) DO UPDATE SET
+                    grade = excluded.grade,
+                    comments = excluded.comments,
+                    evaluation_time = excluded.evaluation_time
             ''', (submission_id, admin_id, grade, comments, evaluation_time))
-            message = "평가가 성공적으로 저장되었습니다!"
         
-        conn.commit()
-        conn.close()
-        
-        return True, message
+        return True, "평가가 성공적으로 저장되었습니다!"
     except Exception as e:
         return False, f"평가 저장 중 오류가 발생했습니다: {str(e)}"
 
+@cached_query
 def get_evaluation(submission_id, admin_id):
     """특정 제출물에 대한 평가를 조회합니다."""
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
     
     cursor.execute('''
         SELECT grade, comments, evaluation_time, is_auto_evaluated, auto_grade, auto_comments, auto_evaluation_time
@@ -539,16 +440,246 @@ def get_evaluation(submission_id, admin_id):
     ''', (submission_id, admin_id))
     
     result = cursor.fetchone()
-    conn.close()
     
     return result
 
-def get_submissions_with_evaluations():
-    """모든 제출물을 평가와 함께 조회합니다."""
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+@cached_query
+def get_pending_auto_evaluations(admin_id, stale_before=None):
+    """
+    일괄 자동 평가 대상 제출물을 조회합니다.
+
+    이 관리자의 자동 평가가 없는 제출물과, stale_before(평가 기준/모범 답안 업로드 시간)
+    이전에 자동 평가되어 결과가 오래된 제출물을 제출 순서대로 반환합니다.
+
+    Returns:
+        list: (submission_id, file_path, student_id, name, original_filename) 목록
+    """
+    cursor = get_connection().cursor()
+
+    cursor.execute('''
+        SELECT s.submission_id, s.file_path, s.student_id, st.name, s.original_filename
+        FROM submissions s
+        JOIN students st ON s.student_id = st.student_id
+        LEFT JOIN evaluations e ON s.submission_id = e.submission_id AND e.admin_id = ?
+        WHERE COALESCE(e.is_auto_evaluated, 0) = 0 OR e.auto_evaluation_time < ?
+        ORDER BY s.submission_time, s.submission_id
+    ''', (admin_id, stale_before))
+
+    return cursor.fetchall()
+
+def get_stale_before():
+    """자동 평가가 이 시간보다 오래되었으면 다시 평가합니다 (최신 평가 기준/모범 답안 업로드 시간)."""
+    criteria_file = get_latest_professor_file('평가기준')
+    answer_file = get_latest_professor_file('모범답안')
+    upload_times = [file[2] for file in (criteria_file, answer_file) if file]
+    return max(upload_times) if upload_times else None
+
+def auto_evaluate_pending(admin_id, force=False):
+    """
+    자동 평가가 없거나 오래된 제출물의 자동 평가 작업을 한 번에 등록합니다.
+
+    평가는 평가 작업자가 동시에 처리하며, 이미 대기 중이거나 진행 중인 제출물은 다시
+    등록하지 않습니다. force이면 캐시된 평가 결과를 무시하고 Bedrock으로 다시 평가합니다.
+
+    Returns:
+        tuple: (성공 여부, 메시지)
+    """
+    try:
+        if not get_latest_professor_file('평가기준'):
+            return False, "평가 기준 파일을 찾을 수 없습니다."
+
+        pending = get_pending_auto_evaluations(admin_id, get_stale_before())
+        if not pending:
+            return True, "자동 평가할 제출물이 없습니다."
+
+        queued = enqueue_evaluations(admin_id, [row[0] for row in pending], force)
+        return True, f"자동 평가 작업 {queued}건을 등록했습니다. (이미 진행 중 {len(pending) - queued}건)"
+    except Exception as e:
+        logger.error(f"일괄 자동 평가 작업 등록 중 오류 발생: {str(e)}")
+        return False, f"자동 평가 작업 등록 중 오류가 발생했습니다: {str(e)}"
+
+@cached_query
+def get_submission_stats():
+    """
+    대시보드 통계를 조회합니다.
+    
+    건수는 트리거로 갱신되는 submission_stats 요약 행에서, 최근 제출 시간은 인덱스의 마지막
+    항목에서 읽으므로 제출물 수와 관계없이 한 행만 읽습니다.
+    """
+    cursor = get_connection().cursor()
+    
+    cursor.execute('''
+        SELECT
+            total_submissions,
+            unique_students,
+            evaluated_submissions,
+            (SELECT MAX(submission_time) FROM submissions)
+        FROM submission_stats
+        WHERE id = 1
+    ''')
+    
+    total_submissions, unique_students, evaluated_submissions, latest_submission = cursor.fetchone()
+    
+    return {
+        'total_submissions': total_submissions,
+        'unique_students': unique_students,
+        'evaluated_submissions': evaluated_submissions,
+        'latest_submission': latest_submission,
+    }
+
+def build_search_query(text):
+    """검색어를 FTS5 질의로 변환합니다. 각 단어는 조사가 붙은 형태도 찾도록 접두어로 검색합니다."""
+    terms = []
+    for word in text.split():
+        escaped = word.replace('"', '""')
+        terms.append(f'"{escaped}"*')
+    return ' '.join(terms)
+
+@cached_query
+def search_submissions(text, limit=20):
+    """제출물 내용과 교수/AI 피드백을 전문 검색해 관련도 순으로 반환합니다."""
+    match_query = build_search_query(text)
+    if not match_query:
+        return []
+    
+    cursor = get_connection().cursor()
+    
+    cursor.execute('''
+        SELECT
+            s.submission_id,
+            s.student_id,
+            st.name,
+            s.original_filename,
+            s.submission_time,
+            snippet(submission_search, -1, '**', '**', '…', 16)
+        FROM submission_search
+        JOIN submissions s ON s.submission_id = submission_search.rowid
+        JOIN students st ON s.student_id = st.student_id
+        WHERE submission_search MATCH ?
+        ORDER BY rank
+        LIMIT ?
+    ''', (match_query, limit))
+    
+    return cursor.fetchall()
+
+def reindex_submission_contents():
+    """
+    검색 색인에 내용이 비어 있는 제출물을 다시 색인합니다.
     
+    이미 추출된 텍스트는 바로 색인하고, 추출되지 않았거나 실패한 파일은 추출 작업을 다시 등록합니다.
+    """
+    cursor = get_connection().cursor()
     cursor.execute('''
+        SELECT s.submission_id, s.file_path, d.status, d.content
+        FROM submission_search
+        JOIN submissions s ON s.submission_id = submission_search.rowid
+        LEFT JOIN extracted_documents d ON d.file_path = s.file_path
+        WHERE submission_search.content = ''
+    ''')
+    pending = cursor.fetchall()
+    
+    indexed = [(content, submission_id) for submission_id, _, status, content in pending if status == 'done']
+    if indexed:
+        with transaction() as cursor:
+            cursor.executemany('UPDATE submission_search SET content = ? WHERE rowid = ?', indexed)
+    
+    requeue_paths = {file_path for _, file_path, status, _ in pending if status in (None, 'failed')}
+    for file_path in requeue_paths:
+        enqueue_extraction(file_path)
+    
+    return len(indexed), len(requeue_paths)
+
+def _prefix_range(prefix):
+    """접두어 검색을 인덱스 범위 조건(>= 시작, < 끝)으로 바꾸기 위한 경계값을 반환합니다."""
+    return prefix, prefix + chr(0x10FFFF)
+
+def build_submission_filter(filters):
+    """
+    제출물 필터 딕셔너리를 SQL WHERE 조건 목록과 매개변수로 변환합니다.
+    
+    지원하는 키: student_query(학번 또는 이름 접두어), date_from/date_to(date),
+    eval_state(EVALUATION_STATE_FILTERS의 키), grade(교수 평가가 없으면 AI 평가 등급 기준)
+    """
+    conditions = []
+    params = []
+    if not filters:
+        return conditions, params
+    
+    student_query = (filters.get('student_query') or '').strip()
+    if student_query.isdigit():
+        # 숫자로만 이루어진 검색어는 학번 접두어로 검색
+        conditions.append("s.student_id >= ? AND s.student_id < ?")
+        params.extend(_prefix_range(student_query))
+    elif student_query:
+        # 이름 접두어는 students의 이름 인덱스로 학생을 찾은 뒤 그 학생들의 제출물만 읽음
+        conditions.append("s.student_id IN (SELECT student_id FROM students WHERE name >= ? AND name < ?)")
+        params.extend(_prefix_range(student_query))
+    
+    if filters.get('date_from') or filters.get('date_to'):
+        # 한쪽 날짜만 지정해도 양쪽이 닫힌 범위로 조회해야 학번순 정렬에서도 제출 시간 인덱스를 사용
+        date_from = filters.get('date_from')
+        date_to = filters.get('date_to')
+        conditions.append("s.submission_time >= ? AND s.submission_time <= ?")
+        params.append(date_from.strftime('%Y-%m-%d 00:00:00') if date_from else '0000-01-01 00:00:00')
+        params.append(date_to.strftime('%Y-%m-%d 23:59:59') if date_to else '9999-12-31 23:59:59')
+    
+    eval_state_condition = EVALUATION_STATE_FILTERS.get(filters.get('eval_state'))
+    if eval_state_condition:
+        conditions.append(f"({eval_state_condition})")
+    
+    if filters.get('grade'):
+        # 등급 인덱스로 해당 등급의 제출물을 찾고, 조인된 평가 행도 같은 등급인지 확인
+        conditions.append(
+            "s.submission_id IN (SELECT submission_id FROM evaluations WHERE COALESCE(grade, auto_grade) = ?) "
+            "AND COALESCE(e.grade, e.auto_grade) = ?"
+        )
+        params.extend([filters['grade'], filters['grade']])
+    
+    return conditions, params
+
+def get_submissions_with_evaluations(limit=None, cursor=None, backward=False, filters=None, sort="최신순"):
+    """
+    제출물을 평가와 함께 조회합니다.
+    
+    filters(build_submission_filter 참고)와 sort(SUBMISSION_SORT_OPTIONS의 키)로 검색과 정렬을
+    쿼리 안에서 처리합니다. limit와 cursor(정렬 열 값들 + submission_id)를 주면 해당 위치
+    다음(backward=True이면 이전) 행부터 limit개만 인덱스를 따라 읽습니다(키셋 페이지네이션).
+    결과는 항상 sort 순서입니다.
+    """
+    db_cursor = get_connection().cursor()
+    
+    direction, sort_columns = SUBMISSION_SORT_OPTIONS[sort]
+    key_columns = list(sort_columns) + ["s.submission_id"]
+    
+    conditions, params = build_submission_filter(filters)
+    if cursor is not None:
+        # 정방향 DESC 정렬이면 커서보다 작은 키, ASC 정렬이면 큰 키가 다음 페이지
+        forward_op = '<' if direction == "DESC" else '>'
+        backward_op = '>' if forward_op == '<' else '<'
+        placeholders = ", ".join("?" for _ in key_columns)
+        conditions.append(
+            f"({', '.join(key_columns)}) {backward_op if backward else forward_op} ({placeholders})"
+        )
+        params.extend(cursor)
+    
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    order = direction
+    if backward:
+        order = "ASC" if direction == "DESC" else "DESC"
+    order_columns = key_columns
+    if filters and (filters.get('date_from') or filters.get('date_to')) and sort_columns[0] != "s.submission_time":
+        # 학번순 정렬은 idx_submissions_student_time 순서로 정렬 없이 읽을 수 있어 날짜 조건이 있어도
+        # 전체를 훑는 SCAN을 고르므로, 정렬 열에 단항 +를 붙여 제출 시간 인덱스로 범위를 좁힌 뒤 정렬
+        order_columns = [f"+{column}" for column in key_columns]
+    order_clause = ", ".join(f"{column} {order}" for column in order_columns)
+    
+    limit_clause = ""
+    if limit is not None:
+        limit_clause = "LIMIT ?"
+        params.append(limit)
+    
+    db_cursor.execute(f'''
         SELECT 
             s.submission_id,
             s.student_id, 
@@ -566,14 +697,175 @@ def get_submissions_with_evaluations():
         FROM submissions s
         JOIN students st ON s.student_id = st.student_id
         LEFT JOIN evaluations e ON s.submission_id = e.submission_id
-        ORDER BY s.submission_time DESC
-    ''')
+        {where_clause}
+        ORDER BY {order_clause}
+        {limit_clause}
+    ''', params)
     
-    results = cursor.fetchall()
-    conn.close()
+    results = db_cursor.fetchall()
+    if backward:
+        results.reverse()
     
     return results
 
+@cached_query
+def get_submissions_page(page_size, cursor=None, backward=False, filters=None, sort="최신순"):
+    """
+    제출물 한 페이지와 커서 방향으로 더 남은 행이 있는지 여부를 반환합니다.
+    
+    한 제출물에 평가가 여러 개면 행도 여러 개이므로, 페이지 경계에서 잘린 제출물은
+    다음 페이지로 넘겨 커서가 평가 행을 건너뛰지 않도록 합니다.
+    """
+    rows = get_submissions_with_evaluations(page_size + 1, cursor, backward, filters, sort)
+    has_more = len(rows) > page_size
+    
+    if has_more:
+        # 커서 방향 기준으로 정렬해 초과분을 잘라낸 뒤 다시 원래 순서로 되돌림
+        if backward:
+            rows.reverse()
+        overflow_id = rows[page_size][0]
+        page = rows[:page_size]
+        rows = [row for row in page if row[0] != overflow_id] or page
+        if backward:
+            rows.reverse()
+    
+    return rows, has_more
+
+def get_page_cursor(row, sort):
+    """조회 결과 행에서 정렬 기준에 맞는 키셋 커서를 만듭니다."""
+    _, sort_columns = SUBMISSION_SORT_OPTIONS[sort]
+    return tuple(row[SUBMISSION_SORT_COLUMN_INDEX[column]] for column in sort_columns) + (row[0],)
+
+def render_submission_filters(state_key):
+    """제출물 검색/정렬 입력란을 표시하고 (filters, sort)를 반환합니다."""
+    with st.expander("🔍 검색 및 정렬"):
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            student_query = st.text_input(
+                "학번 또는 이름",
+                placeholder="앞부분만 입력해도 검색됩니다",
+                key=f"{state_key}_student_query"
+            )
+            sort = st.selectbox("정렬", list(SUBMISSION_SORT_OPTIONS), key=f"{state_key}_sort")
+        
+        with col2:
+            date_from = st.date_input("제출일 시작", value=None, key=f"{state_key}_date_from")
+            date_to = st.date_input("제출일 종료", value=None, key=f"{state_key}_date_to")
+        
+        with col3:
+            eval_state = st.selectbox("평가 상태", list(EVALUATION_STATE_FILTERS), key=f"{state_key}_eval_state")
+            grade = st.selectbox("등급", ["전체", "A", "B", "C", "D", "F"], key=f"{state_key}_grade")
+    
+    filters = {
+        'student_query': student_query,
+        'date_from': date_from,
+        'date_to': date_to,
+        'eval_state': eval_state,
+        'grade': None if grade == "전체" else grade,
+    }
+    return filters, sort
+
+def is_filter_active(filters):
+    """기본값과 다른 검색 조건이 하나라도 있는지 확인합니다."""
+    if any(filters.get(key) for key in ('student_query', 'date_from', 'date_to', 'grade')):
+        return True
+    return filters.get('eval_state') not in (None, "전체")
+
+def load_submissions_page(state_key, filters=None, sort="최신순"):
+    """세션 상태에 저장된 커서 위치의 제출물 페이지를 조회합니다."""
+    cursor_key = f"{state_key}_cursor"
+    backward_key = f"{state_key}_backward"
+    query_key = f"{state_key}_query"
+    
+    # 검색 조건이나 정렬이 바뀌면 첫 페이지부터 다시 조회
+    query = (repr(filters), sort)
+    if st.session_state.get(query_key) != query:
+        st.session_state[query_key] = query
+        st.session_state[cursor_key] = None
+        st.session_state[backward_key] = False
+    
+    cursor = st.session_state.get(cursor_key)
+    backward = st.session_state.get(backward_key, False)
+    
+    rows, has_more = get_submissions_page(SUBMISSIONS_PAGE_SIZE, cursor, backward, filters, sort)
+    
+    # 첫 페이지에 도달했거나 커서 뒤의 제출물이 모두 삭제되었으면 첫 페이지로 이동
+    if cursor is not None and ((backward and not has_more) or not rows):
+        st.session_state[cursor_key] = None
+        st.session_state[backward_key] = False
+        cursor, backward = None, False
+        rows, has_more = get_submissions_page(SUBMISSIONS_PAGE_SIZE, filters=filters, sort=sort)
+    
+    if backward:
+        has_prev, has_next = has_more, True
+    else:
+        has_prev, has_next = cursor is not None, has_more
+    
+    return rows, has_prev, has_next
+
+def render_page_controls(state_key, rows, has_prev, has_next, sort="최신순"):
+    """이전/다음 페이지 이동 버튼을 표시합니다."""
+    col_prev, col_info, col_next = st.columns([1, 3, 1])
+    
+    with col_prev:
+        if st.button("◀ 이전", key=f"{state_key}_prev", disabled=not has_prev):
+            st.session_state[f"{state_key}_cursor"] = get_page_cursor(rows[0], sort)
+            st.session_state[f"{state_key}_backward"] = True
+            st.rerun()
+    
+    with col_info:
+        if rows:
+            st.caption(f"{len(rows)}건 표시 중")
+    
+    with col_next:
+        if st.button("다음 ▶", key=f"{state_key}_next", disabled=not has_next):
+            st.session_state[f"{state_key}_cursor"] = get_page_cursor(rows[-1], sort)
+            st.session_state[f"{state_key}_backward"] = False
+            st.rerun()
+
+@st.fragment(run_every=EVALUATION_POLL_SECONDS)
+def render_evaluation_job_progress(admin_id, queued_since):
+    """
+    queued_since 이후 등록한 자동 평가 작업의 진행 상황을 표시합니다.
+
+    이 영역만 주기적으로 다시 실행해 작업 상태를 조회하고, 끝난 작업 수가 바뀌면 목록에
+    결과가 보이도록 전체 화면을 다시 실행합니다.
+    """
+    counts = get_evaluation_job_counts(admin_id, queued_since)
+    total = sum(counts.values())
+    if total == 0:
+        return
+
+    finished = counts.get('done', 0) + counts.get('failed', 0)
+    active = total - finished
+    if active:
+        st.progress(finished / total, text=f"자동 평가 진행 중: {finished}/{total} (평가 중 {counts.get('running', 0)}건)")
+        if not counts.get('running'):
+            st.caption("평가 중인 작업이 없으면 평가 작업자(`python evaluation_worker.py`)가 실행 중인지 확인하세요.")
+        if st.button("⏹️ 대기 중인 평가 취소", key="cancel_evaluation_jobs"):
+            cancelled = cancel_evaluation_jobs(admin_id)
+            st.session_state.evaluation_jobs_cancelled = cancelled
+            st.rerun()
+    if "evaluation_jobs_cancelled" in st.session_state:
+        st.info(f"대기 중인 평가 작업 {st.session_state.pop('evaluation_jobs_cancelled')}건을 취소했습니다.")
+    elif counts.get('failed', 0):
+        st.warning(f"자동 평가 완료: {total}건 중 {counts.get('done', 0)}건 성공, {counts['failed']}건 실패")
+    else:
+        st.success(f"자동 평가 완료: {total}건 모두 성공")
+
+    failures = get_failed_evaluation_jobs(admin_id, queued_since)
+    if failures:
+        with st.expander(f"❌ 실패한 제출물 {len(failures)}건"):
+            for _, student_id, name, filename, error in failures:
+                st.write(f"**{name}** ({student_id}) 📄 {filename}: {error}")
+
+    # 새로 끝난 작업이 있으면 제출물 목록의 평가 결과도 갱신
+    last_seen = st.session_state.get("evaluation_jobs_finished")
+    st.session_state.evaluation_jobs_finished = (queued_since, finished)
+    if last_seen is not None and last_seen[0] == queued_since and last_seen[1] != finished:
+        st.rerun()
+
 def student_dashboard():
     """학생용 대시보드를 표시합니다."""
     st.header(f"환영합니다, {st.session_state.user_name}님! 👨‍🎓")
@@ -583,9 +875,11 @@ def student_dashboard():
     st.markdown("---")
     st.subheader("📤 과제 제출")
     
+    # RAR은 압축 해제 프로그램(unrar 등)이 설치된 경우에만 받음
+    submission_types = ['pdf', 'docx', 'doc', 'txt', 'zip'] + (['rar'] if rar_supported() else [])
     uploaded_file = st.file_uploader(
         "과제 파일을 선택하세요",
-        type=['pdf', 'docx', 'doc', 'txt', 'zip', 'rar'],
+        type=submission_types,
         help="PDF, Word 문서, 텍스트 파일, 압축 파일을 업로드할 수 있습니다."
     )
     
@@ -684,16 +978,16 @@ def admin_dashboard():
         # 제출 현황 대시보드
         st.subheader("📊 전체 제출 현황")
         
-        submissions_with_eval = get_submissions_with_evaluations()
+        stats = get_submission_stats()
         
-        if submissions_with_eval:
+        if stats['total_submissions']:
             # 통계 정보 표시
             col1, col2, col3, col4 = st.columns(4)
             
-            total_submissions = len(submissions_with_eval)
-            evaluated_count = len([s for s in submissions_with_eval if s[6] is not None])
-            unique_students = len(set([s[1] for s in submissions_with_eval]))
-            latest_submission = submissions_with_eval[0][4] if submissions_with_eval else "없음"
+            total_submissions = stats['total_submissions']
+            evaluated_count = stats['evaluated_submissions']
+            unique_students = stats['unique_students']
+            latest_submission = stats['latest_submission'] or "없음"
             
             with col1:
                 st.metric("총 제출 건수", total_submissions)
@@ -709,10 +1003,45 @@ def admin_dashboard():
             
             st.markdown("---")
             
+            # 제출물 내용 및 피드백 전문 검색
+            st.subheader("🔎 내용 검색")
+            col_search, col_reindex = st.columns([4, 1])
+            
+            with col_search:
+                search_text = st.text_input(
+                    "제출물 내용 또는 피드백 검색",
+                    placeholder="검색할 단어를 입력하세요",
+                    key="content_search"
+                )
+            
+            with col_reindex:
+                if st.button("🔄 색인 갱신", key="reindex_search", help="내용이 색인되지 않은 제출물을 색인하고, 추출에 실패한 파일은 다시 추출합니다."):
+                    with st.spinner("제출물 내용을 색인하는 중..."):
+                        indexed_count, queued_count = reindex_submission_contents()
+                    st.info(f"{indexed_count}건을 색인하고 {queued_count}건의 텍스트 추출을 다시 요청했습니다.")
+            
+            if search_text.strip():
+                search_results = search_submissions(search_text)
+                if search_results:
+                    st.write(f"검색 결과 {len(search_results)}건")
+                    for _, result_student_id, result_name, result_filename, result_time, result_snippet in search_results:
+                        st.markdown(f"**{result_name}** ({result_student_id}) · 📄 {result_filename} · {result_time}")
+                        st.caption(result_snippet)
+                else:
+                    st.info("검색 결과가 없습니다.")
+            
+            st.markdown("---")
+            
             # 상세 제출 목록 및 평가
             st.subheader("📝 제출물 평가 및 관리")
             
-            for submission_data in submissions_with_eval:
+            filters, sort = render_submission_filters("admin_submissions")
+            submissions_page, has_prev, has_next = load_submissions_page("admin_submissions", filters, sort)
+            
+            if not submissions_page and is_filter_active(filters):
+                st.info("검색 조건에 맞는 제출물이 없습니다.")
+            
+            for submission_data in submissions_page:
                 submission_id, student_id, name, filename, submit_time, file_path, grade, comments, eval_time, is_auto_evaluated, auto_grade, auto_comments, auto_eval_time = submission_data
                 
                 # 제출물 정보 표시
@@ -737,12 +1066,11 @@ def admin_dashboard():
                     
                     with col3:
                         if st.button("👁️ 파일보기", key=f"view_file_{submission_id}"):
-                            success, content = read_file_content(file_path)
-                            if success:
-                                st.session_state[f"show_student_file_{submission_id}"] = content
-                                st.session_state[f"show_student_filename_{submission_id}"] = filename
+                            error = open_file_preview(f"show_student_file_{submission_id}", file_path)
+                            if error:
+                                st.error(error)
                             else:
-                                st.error(content)
+                                st.session_state[f"show_student_filename_{submission_id}"] = filename
                     
                     with col4:
                         eval_button_text = "📝 평가하기"
@@ -755,14 +1083,16 @@ def admin_dashboard():
                     # 파일 내용 표시
                     if f"show_student_file_{submission_id}" in st.session_state:
                         with st.expander(f"📄 {st.session_state[f'show_student_filename_{submission_id}']} 내용", expanded=True):
+                            preview = st.session_state[f"show_student_file_{submission_id}"]
                             st.text_area(
                                 "파일 내용:",
-                                st.session_state[f"show_student_file_{submission_id}"],
+                                preview,
                                 height=400,
-                                key=f"student_content_{submission_id}"
+                                key=f"student_content_{submission_id}_{len(preview)}"
                             )
+                            render_load_more_button(f"show_student_file_{submission_id}", file_path)
                             if st.button("❌ 파일 닫기", key=f"close_file_{submission_id}"):
-                                del st.session_state[f"show_student_file_{submission_id}"]
+                                close_file_preview(f"show_student_file_{submission_id}")
                                 del st.session_state[f"show_student_filename_{submission_id}"]
                                 st.rerun()
                     
@@ -838,6 +1168,8 @@ def admin_dashboard():
                     
                     st.markdown("---")
             
+            render_page_controls("admin_submissions", submissions_page, has_prev, has_next, sort)
+            
         else:
             st.info("아직 제출된 과제가 없습니다.")
     
@@ -850,26 +1182,11 @@ def admin_dashboard():
         criteria_files = []
         answer_files = []
         
-        conn = sqlite3.connect('database.db')
-        cursor = conn.cursor()
-        
         # 평가 기준 파일 확인
-        cursor.execute('''
-            SELECT file_id, original_filename, upload_time FROM professor_files 
-            WHERE file_type = '평가기준' 
-            ORDER BY upload_time DESC LIMIT 1
-        ''')
-        criteria_file = cursor.fetchone()
+        criteria_file = get_latest_professor_file('평가기준')
         
         # 모범 답안 파일 확인
-        cursor.execute('''
-            SELECT file_id, original_filename, upload_time FROM professor_files 
-            WHERE file_type = '모범답안' 
-            ORDER BY upload_time DESC LIMIT 1
-        ''')
-        answer_file = cursor.fetchone()
-        
-        conn.close()
+        answer_file = get_latest_professor_file('모범답안')
         
         # 파일 상태 표시
         col1, col2 = st.columns(2)
@@ -890,16 +1207,53 @@ def admin_dashboard():
         
         st.markdown("---")
         
+        # 일괄 자동 평가
+        st.subheader("⚡ 일괄 자동 평가")
+
+        if criteria_file:
+            pending_count = len(get_pending_auto_evaluations(st.session_state.user_id, get_stale_before()))
+            st.write(f"자동 평가가 없거나 평가 기준/모범 답안이 바뀌기 전에 평가된 제출물: **{pending_count}건**")
+            st.caption("평가는 평가 작업자(`python evaluation_worker.py`)가 처리하므로 페이지를 닫아도 계속 진행됩니다.")
+
+            force_evaluation = st.checkbox(
+                "캐시된 평가 결과 무시 (강제 재평가)",
+                key="force_evaluation",
+                help="제출물, 평가 기준, 모범 답안이 바뀌지 않았으면 기본적으로 이전 평가 결과를 Bedrock 호출 없이 재사용합니다."
+            )
+
+            if st.button("🤖 미평가 전체 자동 평가", disabled=pending_count == 0, key="batch_eval_start"):
+                # 작업 등록 시간(queued_at)보다 늦지 않도록 등록 전에 기준 시간을 정함
+                jobs_since = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                success, message = auto_evaluate_pending(st.session_state.user_id, force_evaluation)
+                if success:
+                    st.session_state.evaluation_jobs_since = jobs_since
+                    st.success(message)
+                else:
+                    st.error(message)
+
+            if "evaluation_jobs_since" in st.session_state:
+                render_evaluation_job_progress(st.session_state.user_id, st.session_state.evaluation_jobs_since)
+        else:
+            st.info("평가 기준 파일을 업로드하면 일괄 자동 평가를 사용할 수 있습니다.")
+
+        st.markdown("---")
+        
         # 자동 평가할 제출물 목록
         st.subheader("📝 자동 평가 대상 과제")
         
-        submissions_with_eval = get_submissions_with_evaluations()
+        filters, sort = render_submission_filters("auto_eval_submissions")
+        submissions_page, has_prev, has_next = load_submissions_page("auto_eval_submissions", filters, sort)
         
-        if submissions_with_eval and criteria_file:
-            for submission_data in submissions_with_eval:
+        if submissions_page and criteria_file:
+            job_statuses = get_evaluation_job_statuses(
+                st.session_state.user_id, tuple(row[0] for row in submissions_page)
+            )
+            for submission_data in submissions_page:
                 submission_id, student_id, name, filename, submit_time, file_path = submission_data[:6]
                 grade, comments, eval_time = submission_data[6:9]
                 is_auto_evaluated, auto_grade, auto_comments, auto_eval_time = submission_data[9:13]
+                job_status, job_error = job_statuses.get(submission_id, (None, None))[:2]
+                stream_requested = False
                 
                 # 제출물 정보 표시
                 with st.container():
@@ -920,31 +1274,54 @@ def admin_dashboard():
                             st.write(f"교수 평가: {grade_color.get(grade, '⚪')} **{grade}**")
                     
                     with col3:
-                        if not is_auto_evaluated:
+                        if job_status == 'queued':
+                            st.write("⏳ 평가 대기 중")
+                            # 평가 작업자가 실행 중이지 않으면 대기 중인 작업을 취소해야 다시 평가할 수 있음
+                            if st.button("취소", key=f"cancel_eval_{submission_id}"):
+                                cancel_evaluation_jobs(st.session_state.user_id, [submission_id])
+                                st.rerun()
+                        elif job_status == 'running':
+                            st.write("⚙️ 평가 중")
+                        elif not is_auto_evaluated:
                             if st.button("🤖 자동 평가", key=f"auto_eval_{submission_id}"):
-                                with st.spinner("Bedrock으로 자동 평가 중..."):
-                                    success, message = auto_evaluate_submission(submission_id, st.session_state.user_id)
-                                if success:
-                                    st.success(message)
-                                    st.rerun()
-                                else:
-                                    st.error(message)
+                                stream_requested = True
                         else:
                             col_buttons = st.columns([1, 1])
                             with col_buttons[0]:
                                 if st.button("🔄 재평가", key=f"re_eval_{submission_id}"):
-                                    with st.spinner("Bedrock으로 자동 평가 중..."):
-                                        success, message = auto_evaluate_submission(submission_id, st.session_state.user_id)
-                                    if success:
-                                        st.success(message)
-                                        st.rerun()
-                                    else:
-                                        st.error(message)
+                                    stream_requested = True
                             with col_buttons[1]:
                                 if st.button("✏️ 수정", key=f"edit_eval_{submission_id}"):
                                     st.session_state[f"show_edit_evaluation_{submission_id}"] = True
                                     st.rerun()
                     
+                    if job_status == 'failed':
+                        st.caption(f"❌ 최근 자동 평가 실패: {job_error}")
+                    
+                    # 버튼을 누른 제출물은 평가 응답을 받는 대로 표시
+                    if stream_requested:
+                        with st.expander("🤖 자동 평가 피드백", expanded=True):
+                            feedback_area = st.empty()
+                            feedback_area.info("Bedrock으로 자동 평가 중...")
+                            streamed_parts = []
+                            
+                            def show_streamed_text(text):
+                                streamed_parts.append(text)
+                                partial_grade, partial_comments = parse_partial_evaluation("".join(streamed_parts))
+                                grade_color = {"A": "🟢", "B": "🔵", "C": "🟡", "D": "🟠", "F": "🔴"}
+                                header = f"자동 평가: {grade_color.get(partial_grade, '⚪')} **{partial_grade}**\n\n" if partial_grade else ""
+                                feedback_area.markdown(header + partial_comments)
+                            
+                            success, message = auto_evaluate_submission(
+                                submission_id, st.session_state.user_id,
+                                st.session_state.get("force_evaluation", False), show_streamed_text
+                            )
+                        if success:
+                            st.success(message)
+                            st.rerun()
+                        else:
+                            st.error(message)
+                    
                     # 자동 평가 코멘트 표시
                     if is_auto_evaluated and auto_comments:
                         with st.expander(f"🤖 자동 평가 피드백"):
@@ -1007,8 +1384,12 @@ def admin_dashboard():
                                     st.rerun()
                     
                     st.markdown("---")
+            
+            render_page_controls("auto_eval_submissions", submissions_page, has_prev, has_next, sort)
         elif not criteria_file:
             st.warning("⚠️ 자동 평가를 위해서는 평가 기준 파일이 필요합니다. '파일 업로드' 탭에서 업로드하세요.")
+        elif is_filter_active(filters):
+            st.info("검색 조건에 맞는 제출물이 없습니다.")
         else:
             st.info("아직 제출된 과제가 없습니다.")
         
@@ -1095,11 +1476,9 @@ def admin_dashboard():
                     
                     with col3:
                         if st.button("👁️ 내용보기", key=f"view_eval_{file_id}"):
-                            success, content = read_file_content(file_path)
-                            if success:
-                                st.session_state[f"show_content_{file_id}"] = content
-                            else:
-                                st.error(content)
+                            error = open_file_preview(f"show_content_{file_id}", file_path)
+                            if error:
+                                st.error(error)
                     
                     with col4:
                         if st.button("🗑️ 삭제", key=f"delete_prof_{file_id}"):
@@ -1113,14 +1492,16 @@ def admin_dashboard():
                     # 파일 내용 표시
                     if f"show_content_{file_id}" in st.session_state:
                         with st.expander(f"📄 {original_filename} 내용", expanded=True):
+                            preview = st.session_state[f"show_content_{file_id}"]
                             st.text_area(
                                 "파일 내용:",
-                                st.session_state[f"show_content_{file_id}"],
+                                preview,
                                 height=300,
-                                key=f"content_area_{file_id}"
+                                key=f"content_area_{file_id}_{len(preview)}"
                             )
+                            render_load_more_button(f"show_content_{file_id}", file_path)
                             if st.button("❌ 닫기", key=f"close_{file_id}"):
-                                del st.session_state[f"show_content_{file_id}"]
+                                close_file_preview(f"show_content_{file_id}")
                                 st.rerun()
                 
                 st.markdown("---")
@@ -1139,11 +1520,9 @@ def admin_dashboard():
                     
                     with col3:
                         if st.button("👁️ 내용보기", key=f"view_answer_{file_id}"):
-                            success, content = read_file_content(file_path)
-                            if success:
-                                st.session_state[f"show_content_{file_id}"] = content
-                            else:
-                                st.error(content)
+                            error = open_file_preview(f"show_content_{file_id}", file_path)
+                            if error:
+                                st.error(error)
                     
                     with col4:
                         if st.button("🗑️ 삭제", key=f"delete_prof_{file_id}"):
@@ -1157,14 +1536,16 @@ def admin_dashboard():
                     # 파일 내용 표시
                     if f"show_content_{file_id}" in st.session_state:
                         with st.expander(f"📄 {original_filename} 내용", expanded=True):
+                            preview = st.session_state[f"show_content_{file_id}"]
                             st.text_area(
                                 "파일 내용:",
-                                st.session_state[f"show_content_{file_id}"],
+                                preview,
                                 height=300,
-                                key=f"content_area_answer_{file_id}"
+                                key=f"content_area_answer_{file_id}_{len(preview)}"
                             )
+                            render_load_more_button(f"show_content_{file_id}", file_path)
                             if st.button("❌ 닫기", key=f"close_answer_{file_id}"):
-                                del st.session_state[f"show_content_{file_id}"]
+                                close_file_preview(f"show_content_{file_id}")
                                 st.rerun()
             
             if not evaluation_files and not answer_files:
@@ -0,0 +1,124 @@
+import os
+import glob
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+import database
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 백업 설정 (환경 변수로 변경 가능)
+BACKUP_DIR = os.environ.get('DATABASE_BACKUP_DIR', 'backups')
+BACKUP_RETENTION = int(os.environ.get('DATABASE_BACKUP_RETENTION', '7'))
+BACKUP_INTERVAL_HOURS = float(os.environ.get('DATABASE_BACKUP_INTERVAL_HOURS', '24'))
+BACKUP_PAGES_PER_STEP = 256     # 한 번에 복사할 페이지 수
+BACKUP_STEP_SLEEP = 0.005       # 단계 사이 대기 시간 (초)
+
+_scheduler_started = False
+_scheduler_lock = threading.Lock()
+
+
+def _list_backups():
+    """보관 중인 백업 파일을 오래된 순으로 반환합니다."""
+    pattern = os.path.join(BACKUP_DIR, 'database-*.db')
+    return sorted(glob.glob(pattern))
+
+
+def _prune_backups():
+    """보관 개수를 넘는 오래된 백업을 삭제합니다."""
+    backups = _list_backups()
+    for old_backup in backups[:max(len(backups) - BACKUP_RETENTION, 0)]:
+        os.remove(old_backup)
+        logger.info(f"오래된 백업 삭제: {old_backup}")
+
+
+def create_backup(label='manual'):
+    """
+    SQLite 온라인 백업 API로 데이터베이스를 백업
+
+    페이지 단위로 나누어 복사하므로 복사 중에도 다른 세션의 읽기/쓰기가 멈추지 않습니다.
+    복사본은 integrity_check를 통과한 경우에만 보관되며, 오래된 백업은 BACKUP_RETENTION 개수만
+    남기고 삭제됩니다.
+
+    Args:
+        label (str): 백업 파일 이름에 붙일 구분자 (예: manual, scheduled, pre-migration-v5)
+
+    Returns:
+        str: 생성된 백업 파일 경로
+    """
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    backup_path = os.path.join(BACKUP_DIR, f"database-{timestamp}-{label}.db")
+    temp_path = backup_path + '.tmp'
+
+    source = sqlite3.connect(database.DATABASE_PATH, timeout=database.BUSY_TIMEOUT_MS / 1000)
+    target = sqlite3.connect(temp_path)
+    try:
+        started = time.perf_counter()
+        # 읽기 트랜잭션을 유지해 WAL 스냅샷 하나를 복사합니다. 그렇지 않으면 다른 연결의
+        # 쓰기가 있을 때마다 백업이 처음부터 다시 시작되어 쓰기가 계속되면 끝나지 않습니다.
+        source.execute('BEGIN')
+        source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+        source.backup(target, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP)
+        source.rollback()
+
+        result = target.execute('PRAGMA integrity_check').fetchone()[0]
+        if result != 'ok':
+            raise sqlite3.DatabaseError(f"백업 무결성 검사 실패: {result}")
+        target.close()
+        os.replace(temp_path, backup_path)
+        logger.info(f"데이터베이스 백업 완료: {backup_path} ({time.perf_counter() - started:.2f}초)")
+    except Exception:
+        target.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        source.close()
+
+    _prune_backups()
+    return backup_path
+
+
+def _backup_loop(interval_seconds):
+    """주기적으로 백업을 생성합니다."""
+    while True:
+        time.sleep(interval_seconds)
+        try:
+            create_backup('scheduled')
+        except Exception as e:
+            logger.error(f"예약 백업 실패: {str(e)}")
+
+
+def start_backup_scheduler(interval_hours=BACKUP_INTERVAL_HOURS):
+    """
+    프로세스당 한 번 주기적 백업 스레드를 시작
+
+    Args:
+        interval_hours (float): 백업 간격 (시간). 0 이하이면 예약 백업을 사용하지 않습니다.
+
+    Returns:
+        bool: 이번 호출에서 스케줄러를 시작했는지 여부
+    """
+    global _scheduler_started
+    if interval_hours <= 0:
+        return False
+
+    with _scheduler_lock:
+        if _scheduler_started:
+            return False
+        _scheduler_started = True
+
+    thread = threading.Thread(
+        target=_backup_loop,
+        args=(interval_hours * 3600,),
+        name='database-backup',
+        daemon=True
+    )
+    thread.start()
+    logger.info(f"예약 백업 시작: {interval_hours}시간 간격, 최근 {BACKUP_RETENTION}개 보관")
+    return True
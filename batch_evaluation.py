@@ -0,0 +1,53 @@
+"""
+제출물 하나를 자동 평가하고 결과를 작업 결과 형식으로 정리
+
+평가 작업자(evaluation_worker.py)와 관리자 화면의 제출물별 평가가 함께 사용합니다. 여러
+제출물의 동시 평가는 평가 작업자가 EVALUATION_CONCURRENCY개까지 스레드로 나누어 처리하며,
+모든 스레드가 같은 Bedrock 클라이언트와 연결 풀을 공유합니다.
+"""
+import os
+import time
+import logging
+from bedrock_evaluator import MAX_POOL_CONNECTIONS
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 동시 평가 설정 (환경 변수로 변경 가능)
+EVALUATION_CONCURRENCY = int(os.environ.get('EVALUATION_CONCURRENCY', '8'))
+MAX_EVALUATION_CONCURRENCY = MAX_POOL_CONNECTIONS     # 클라이언트 연결 수보다 많이 호출하면 연결을 기다리게 됨
+
+
+def evaluate_one(evaluator, submission_id, file_path, criteria_path, model_answer_path, force=False, on_text=None):
+    """
+    제출물 하나를 평가
+
+    force가 True이면 캐시된 평가 결과를 무시하고 Bedrock으로 다시 평가합니다. on_text를
+    지정하면 응답을 스트리밍으로 받아 텍스트 조각마다 호출합니다.
+
+    Returns:
+        dict: 평가 결과 (submission_id, success, grade, comments, path, error, elapsed)
+    """
+    started = time.perf_counter()
+    try:
+        evaluation_result = evaluator.evaluate_submission(
+            file_path, criteria_path, model_answer_path, force=force, on_text=on_text
+        )
+        grade = evaluation_result.get('grade')
+        comments = evaluation_result.get('comments')
+        path = evaluation_result.get('path')
+    except Exception as e:
+        grade, comments, path = None, f"자동 평가 중 오류가 발생했습니다: {str(e)}", None
+
+    # evaluate_submission은 오류가 나면 등급 없이 오류 메시지를 코멘트로 반환
+    success = grade is not None
+    return {
+        'submission_id': submission_id,
+        'success': success,
+        'grade': grade,
+        'comments': comments if success else None,
+        'path': path if success else None,
+        'error': None if success else comments,
+        'elapsed': time.perf_counter() - started,
+    }
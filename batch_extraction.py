@@ -0,0 +1,151 @@
+"""
+여러 파일의 텍스트를 프로세스 풀로 병렬 추출
+
+PyPDF2 추출은 순수 파이썬 CPU 작업이라 스레드로는 한 코어만 사용합니다. 일괄 자동 평가,
+검색 색인, 추출기 버전 변경 후 재추출처럼 파일이 많을 때는 CPU 코어 수만큼 프로세스를
+나누어 추출합니다.
+
+사용법:
+    python batch_extraction.py 파일1.pdf 파일2.docx ...
+    python batch_extraction.py --in-process 파일1.pdf ...   (프로세스 없이 현재 프로세스에서 순서대로 추출)
+"""
+import os
+import sys
+import time
+import signal
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from text_extraction import extract_document
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 배치 추출 설정 (환경 변수로 변경 가능)
+EXTRACTION_WORKERS = int(os.environ.get('EXTRACTION_WORKERS', str(os.cpu_count() or 1)))
+EXTRACTION_TIMEOUT_SECONDS = float(os.environ.get('EXTRACTION_TIMEOUT_SECONDS', '120'))
+
+
+class ExtractionTimeout(BaseException):
+    """파일 하나의 추출 시간이 제한을 넘었을 때 작업 프로세스 안에서 발생합니다.
+
+    추출 함수의 `except Exception` 처리에 잡히지 않도록 BaseException을 상속합니다.
+    """
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+
+def _extract_one(file_path, timeout):
+    """
+    작업 프로세스에서 파일 하나를 추출하고 결과와 소요 시간을 반환
+
+    SIGALRM을 지원하는 환경에서는 timeout초가 지나면 추출을 중단하고 작업 프로세스를
+    다음 파일에 재사용합니다.
+    """
+    use_timer = bool(timeout) and hasattr(signal, 'setitimer')
+    if use_timer:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    started = time.perf_counter()
+    try:
+        success, content, page_count = extract_document(file_path)
+    except ExtractionTimeout:
+        success, content, page_count = False, f"추출 시간이 {timeout:g}초를 넘어 중단했습니다.", None
+    except Exception as e:
+        success, content, page_count = False, f"파일을 읽는 중 오류가 발생했습니다: {str(e)}", None
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    return _make_result(file_path, success, content, page_count, time.perf_counter() - started)
+
+
+def _make_result(file_path, success, content, page_count, elapsed):
+    """파일별 추출 결과 딕셔너리를 만듭니다."""
+    return {
+        'file_path': file_path,
+        'success': success,
+        'content': content if success else None,
+        'page_count': page_count,
+        'char_count': len(content) if success else None,
+        'error': None if success else content,
+        'elapsed': elapsed,
+    }
+
+
+def extract_batch(file_paths, max_workers=None, timeout=EXTRACTION_TIMEOUT_SECONDS, in_process=False):
+    """
+    여러 파일의 텍스트를 병렬로 추출
+
+    파일마다 별도의 작업으로 실행되므로 한 파일의 오류나 시간 초과가 다른 파일의 결과에
+    영향을 주지 않습니다. 작업 프로세스가 비정상 종료되면 완료되지 않은 파일만 실패로
+    보고합니다. 파일이 하나뿐이어도 작업 프로세스에서 추출하므로, 손상된 파일이 호출한
+    프로세스를 멈추게 하거나 시간 제한 없이 실행되지 않습니다.
+
+    Args:
+        file_paths (list): 추출할 파일 경로 목록
+        max_workers (int, optional): 작업 프로세스 수 (기본값: EXTRACTION_WORKERS)
+        timeout (float): 파일당 추출 시간 제한 (초, 0이면 제한 없음)
+        in_process (bool): True이면 프로세스를 만들지 않고 현재 프로세스에서 순서대로 추출
+            (명령줄 실행과 벤치마크용, 시간 제한이 적용되지 않음)
+
+    Returns:
+        list: file_paths 순서의 결과 딕셔너리 목록
+            (file_path, success, content, page_count, char_count, error, elapsed)
+    """
+    file_paths = list(file_paths)
+    if in_process:
+        return [_extract_one(file_path, None) for file_path in file_paths]
+    if not file_paths:
+        return []
+    max_workers = max(1, min(max_workers or EXTRACTION_WORKERS, len(file_paths)))
+
+    results = {}
+    started = time.perf_counter()
+    # 스레드가 실행 중인 앱 프로세스를 fork하지 않도록 spawn으로 작업 프로세스를 만듦
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = {
+            executor.submit(_extract_one, file_path, timeout): file_path
+            for file_path in dict.fromkeys(file_paths)
+        }
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                results[file_path] = future.result()
+            except BrokenProcessPool as e:
+                results[file_path] = _make_result(
+                    file_path, False, f"추출 프로세스가 비정상 종료되었습니다: {str(e)}", None, 0.0
+                )
+
+    elapsed = time.perf_counter() - started
+    failed = sum(1 for result in results.values() if not result['success'])
+    logger.info(f"배치 추출 완료: {len(results)}개 파일, 실패 {failed}개, 작업자 {max_workers}개, {elapsed:.2f}초")
+    return [results[file_path] for file_path in file_paths]
+
+
+def main(argv):
+    """명령줄로 받은 파일을 병렬 추출하고 파일별 결과와 소요 시간을 출력합니다."""
+    in_process = '--in-process' in argv
+    file_paths = [arg for arg in argv if arg != '--in-process']
+    if not file_paths:
+        print(__doc__)
+        return 1
+
+    started = time.perf_counter()
+    results = extract_batch(file_paths, in_process=in_process)
+    for result in results:
+        status = "✅" if result['success'] else "❌"
+        detail = f"{result['char_count']}자" if result['success'] else result['error']
+        print(f"{status} {result['file_path']} ({result['elapsed']:.2f}초) {detail}")
+    print(f"전체 {len(results)}개 파일, {time.perf_counter() - started:.2f}초")
+    return 0 if all(result['success'] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
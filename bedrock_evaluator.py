@@ -1,30 +1,239 @@
 import boto3
 import json
 import os
+import re
+import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from extracted_documents import get_document_text
+from evaluation_cache import make_cache_key, get_cached_evaluation, store_evaluation
+from token_budget import (
+    MAX_OUTPUT_TOKENS, SINGLE_PATH, estimate_tokens, plan_evaluation, split_into_chunks
+)
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Bedrock 연결 설정 (환경 변수로 변경 가능)
+DEFAULT_REGION = os.environ.get('BEDROCK_REGION', 'us-east-1')
+DEFAULT_MODEL_ID = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0')
+BEDROCK_BACKEND = os.environ.get('BEDROCK_BACKEND', 'bedrock')                   # 'fake'이면 AWS 대신 로컬 가짜 백엔드 사용
+MAX_POOL_CONNECTIONS = int(os.environ.get('BEDROCK_MAX_POOL_CONNECTIONS', '20'))  # 클라이언트당 HTTPS 연결 수
+MAX_ATTEMPTS = int(os.environ.get('BEDROCK_MAX_ATTEMPTS', '8'))                  # 첫 호출을 포함한 최대 시도 횟수
+PROMPT_CACHE_MODE = os.environ.get('BEDROCK_PROMPT_CACHE', 'auto')               # auto: 지원 모델만, on: 항상, off: 사용 안 함
+CONNECT_TIMEOUT = 10            # 연결 제한 시간 (초)
+READ_TIMEOUT = 120              # 응답 대기 제한 시간 (초)
+
+# 평가 프롬프트 버전: 프롬프트 내용이나 응답 형식을 바꾸면 올려서 캐시된 평가 결과를 무효화
+PROMPT_TEMPLATE_VERSION = 2
+
+# 모든 제출물에 공통인 평가 지침 (프롬프트 캐시 앞부분에 포함)
+EVALUATION_INSTRUCTIONS = """당신은 학생 과제를 평가하는 교육 전문가입니다. 주어진 평가 기준과 모범 답안을 바탕으로 학생의 제출물을 공정하게 평가해주세요.
+
+# 평가 지침
+1. 평가 기준에 따라 학생의 제출물을 객관적으로 평가해주세요.
+2. 학생의 제출물과 모범 답안을 비교하여 유사점과 차이점을 분석해주세요.
+3. 학생의 이해도, 창의성, 논리적 구성을 고려해주세요.
+4. 최종 평가는 A, B, C, D, F 중 하나의 등급으로 제시해주세요.
+5. 개선을 위한 구체적인 피드백을 제공해주세요.
+
+# 응답 형식
+다음 JSON 형식으로 응답해주세요:
+```json
+{
+    "grade": "등급(A/B/C/D/F)",
+    "comments": "상세한 피드백과 개선점"
+}
+```
+
+JSON 형식만 응답하고 다른 설명은 포함하지 마세요."""
+
+# Bedrock 프롬프트 캐시 유지 시간 (마지막 사용 후 5분)
+PROMPT_CACHE_TTL_SECONDS = 300
+
+# Bedrock 프롬프트 캐시(cache_control)를 지원하는 모델 ID 접두어. 지원하지 않는 모델에
+# cache_control을 보내면 요청이 거부되거나 아무 효과가 없으므로 auto 모드에서는 보내지 않음
+PROMPT_CACHE_MODEL_PREFIXES = (
+    'anthropic.claude-3-5-haiku-20241022',
+    'anthropic.claude-3-7-sonnet-20250219',
+    'anthropic.claude-sonnet-4',
+    'anthropic.claude-opus-4',
+    'anthropic.claude-haiku-4-5',
+)
+# 리전 간 추론 프로필 모델 ID의 지역 접두어 (예: us.anthropic.claude-sonnet-4-...)
+INFERENCE_PROFILE_PREFIXES = ('us.', 'eu.', 'apac.', 'jp.', 'au.', 'global.')
+
+# 제출물 뒤에 붙는 요청 문장
+EVALUATION_REQUEST = "위 학생 제출물을 평가 기준에 따라 평가하고 JSON 형식으로만 응답해주세요."
+
+# 분할 평가 설정: 입력 토큰 예산을 넘는 제출물은 부분별로 평가한 뒤 결과를 종합
+CHUNK_EVALUATION_CONCURRENCY = int(os.environ.get('EVALUATION_CHUNK_CONCURRENCY', '4'))  # 제출물 하나의 부분을 동시에 평가할 수
+CHUNK_EVALUATION_REQUEST = (
+    "위는 분량이 많아 나누어 보낸 학생 제출물의 일부입니다. 이 부분만 평가 기준에 따라 평가하고 "
+    "JSON 형식으로만 응답해주세요. comments에는 이 부분의 잘된 점과 부족한 점을 평가 기준 항목별로 적고, "
+    "다른 부분에 있을 수 있는 내용이 없다는 이유로 감점하지 마세요."
+)
+REDUCE_EVALUATION_REQUEST = (
+    "위는 한 학생 제출물을 {count}개 부분으로 나누어 평가한 결과입니다. 부분별 평가를 종합해 "
+    "제출물 전체에 대한 최종 등급과 피드백을 JSON 형식으로만 응답해주세요. 여러 부분에서 반복된 지적은 한 번만 적어주세요."
+)
+
+_GRADE_PATTERN = re.compile(r'"grade"\s*:\s*"([A-F])"')
+_JSON_ESCAPES = {'n': '\n', 't': '\t', 'r': '', '"': '"', '\\': '\\', '/': '/'}
+
+_clients = {}
+_evaluators = {}
+_factory_lock = threading.RLock()
+
+
+def get_bedrock_client(region_name=DEFAULT_REGION):
+    """
+    리전별로 프로세스 전체에서 공유하는 bedrock-runtime 클라이언트를 반환
+
+    클라이언트는 스레드에 안전하므로 한 번 만든 클라이언트의 자격 증명, 엔드포인트,
+    TLS 연결 풀을 모든 평가에서 재사용합니다. 스로틀링 등 일시적 오류는 botocore의
+    adaptive 재시도 모드(지터가 적용된 지수 백오프와 클라이언트 측 전송률 제한)로
+    자동 재시도합니다. BEDROCK_BACKEND가 'fake'이면 AWS를 호출하지 않는 가짜 백엔드
+    (fake_bedrock.FakeBedrockClient)를 반환합니다. 가짜 백엔드 모듈은 이때만 가져옵니다.
+
+    Args:
+        region_name (str): AWS 리전 이름
+
+    Returns:
+        botocore.client.BaseClient: bedrock-runtime 클라이언트
+    """
+    with _factory_lock:
+        client = _clients.get(region_name)
+        if client is None and BEDROCK_BACKEND == 'fake':
+            from fake_bedrock import FakeBedrockClient
+            client = FakeBedrockClient(max_attempts=MAX_ATTEMPTS)
+            _clients[region_name] = client
+            logger.info(f"가짜 Bedrock 백엔드 사용: 첫 토큰 지연 중앙값 {client.latency_ms:.0f}ms")
+        elif client is None:
+            config = Config(
+                region_name=region_name,
+                max_pool_connections=MAX_POOL_CONNECTIONS,
+                tcp_keepalive=True,
+                connect_timeout=CONNECT_TIMEOUT,
+                read_timeout=READ_TIMEOUT,
+                retries={'mode': 'adaptive', 'total_max_attempts': MAX_ATTEMPTS}
+            )
+            # 기본 세션을 여러 스레드가 동시에 초기화하지 않도록 전용 세션에서 생성
+            client = boto3.session.Session().client(service_name='bedrock-runtime', config=config)
+            _clients[region_name] = client
+            logger.info(f"Bedrock 클라이언트 생성: {region_name} (연결 {MAX_POOL_CONNECTIONS}개, 최대 {MAX_ATTEMPTS}회 시도)")
+        return client
+
+
+def get_evaluator(region_name=DEFAULT_REGION, model_id=DEFAULT_MODEL_ID):
+    """
+    리전과 모델별로 프로세스 전체에서 공유하는 BedrockEvaluator를 반환
+
+    Args:
+        region_name (str): AWS 리전 이름
+        model_id (str): Bedrock 모델 ID
+
+    Returns:
+        BedrockEvaluator: 공유 평가기
+    """
+    key = (region_name, model_id)
+    with _factory_lock:
+        evaluator = _evaluators.get(key)
+        if evaluator is None:
+            evaluator = BedrockEvaluator(region_name, model_id)
+            _evaluators[key] = evaluator
+        return evaluator
+
+
+def supports_prompt_cache(model_id):
+    """모델이 Bedrock 프롬프트 캐시를 지원하는지 확인합니다 (추론 프로필 지역 접두어는 무시)."""
+    for prefix in INFERENCE_PROFILE_PREFIXES:
+        if model_id.startswith(prefix):
+            model_id = model_id[len(prefix):]
+            break
+    return model_id.startswith(PROMPT_CACHE_MODEL_PREFIXES)
+
+
+def prompt_cache_enabled(model_id, mode=PROMPT_CACHE_MODE):
+    """
+    평가 요청에 cache_control을 지정할지 결정
+
+    Args:
+        model_id (str): Bedrock 모델 ID
+        mode (str): 'auto'(지원 모델만), 'on'(목록에 없는 새 모델에도 사용), 'off'
+
+    Returns:
+        bool: 프롬프트 캐시 사용 여부
+    """
+    if mode == 'on':
+        return True
+    if mode == 'off':
+        return False
+    return supports_prompt_cache(model_id)
+
+
+def parse_partial_evaluation(text):
+    """
+    스트리밍으로 받는 중인 JSON 응답에서 지금까지 받은 등급과 피드백을 추출
+
+    응답이 아직 끝나지 않아 JSON으로 파싱할 수 없을 때 화면에 미리 보여주기 위한 것으로,
+    최종 결과는 응답이 끝난 뒤 _parse_evaluation_response로 검증합니다.
+
+    Args:
+        text (str): 지금까지 받은 응답 텍스트
+
+    Returns:
+        tuple: (등급 또는 None, 지금까지 받은 피드백 문자열)
+    """
+    grade_match = _GRADE_PATTERN.search(text)
+    grade = grade_match.group(1) if grade_match else None
+
+    key = text.find('"comments"')
+    colon = text.find(':', key) if key >= 0 else -1
+    quote = text.find('"', colon) if colon >= 0 else -1
+    if quote < 0:
+        return grade, ""
+
+    comments = []
+    i = quote + 1
+    while i < len(text):
+        char = text[i]
+        if char == '\\':
+            if i + 1 >= len(text):
+                break
+            comments.append(_JSON_ESCAPES.get(text[i + 1], text[i + 1]))
+            i += 2
+            continue
+        if char == '"':
+            break
+        comments.append(char)
+        i += 1
+    return grade, "".join(comments)
+
+
 class BedrockEvaluator:
     """AWS Bedrock을 사용하여 학생 과제를 자동으로 평가하는 클래스"""
     
-    def __init__(self, region_name="us-east-1", model_id="anthropic.claude-3-sonnet-20240229-v1:0"):
+    def __init__(self, region_name=DEFAULT_REGION, model_id=DEFAULT_MODEL_ID, client=None):
         """
         BedrockEvaluator 초기화
         
         Args:
             region_name (str): AWS 리전 이름
             model_id (str): Bedrock 모델 ID
+            client (optional): 사용할 bedrock-runtime 클라이언트 (기본값: 리전별 공유 클라이언트).
+                invoke_model과 invoke_model_with_response_stream을 제공하는 객체면 됩니다.
         """
-        self.bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime',
-            region_name=region_name
-        )
+        self.bedrock_runtime = client or get_bedrock_client(region_name)
         self.model_id = model_id
-        logger.info(f"BedrockEvaluator initialized with model: {model_id}")
+        # 가짜 백엔드의 결과는 실제 모델의 결과로 캐시되지 않도록 캐시를 읽지도 쓰지도 않음
+        self.use_cache = not getattr(self.bedrock_runtime, 'is_fake', False)
+        self.prompt_cache = prompt_cache_enabled(model_id)
+        logger.info(f"BedrockEvaluator initialized with model: {model_id} (prompt cache: {self.prompt_cache})")
     
     def read_file_content(self, file_path):
         """
@@ -34,54 +243,42 @@ class BedrockEvaluator:
             file_path (str): 파일 경로
             
         Returns:
-            str: 파일 내용 또는 오류 메시지
-        """
-        try:
-            file_extension = os.path.splitext(file_path)[1].lower()
-            
-            # 텍스트 파일
-            if file_extension == '.txt':
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    return file.read()
-            
-            # PDF 파일
-            elif file_extension == '.pdf':
-                import PyPDF2
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    content = ""
-                    for page_num in range(len(pdf_reader.pages)):
-                        page = pdf_reader.pages[page_num]
-                        content += page.extract_text() + "\n"
-                    return content
-            
-            # Word 문서
-            elif file_extension in ['.docx', '.doc']:
-                from docx import Document
-                doc = Document(file_path)
-                content = ""
-                for paragraph in doc.paragraphs:
-                    content += paragraph.text + "\n"
-                return content
+            str: 파일 내용
             
-            else:
-                return f"지원하지 않는 파일 형식입니다: {file_extension}"
-                
-        except Exception as e:
-            logger.error(f"파일 읽기 오류: {str(e)}")
-            return f"파일 읽기 오류: {str(e)}"
+        Raises:
+            ValueError: 텍스트를 추출하지 못한 경우 (오류 메시지를 평가하거나 캐시하지 않도록)
+        """
+        # 업로드 시 추출된 텍스트를 사용하고, 아직 추출되지 않은 파일만 시간 제한을 두고 추출해 저장
+        success, content = get_document_text(file_path, extract_if_missing=True)
+        if not success:
+            logger.error(f"파일 읽기 오류: {file_path} - {content}")
+            raise ValueError(f"파일을 읽을 수 없습니다: {content}")
+        return content
     
-    def evaluate_submission(self, student_submission_path, evaluation_criteria_path, model_answer_path=None):
+    def evaluate_submission(self, student_submission_path, evaluation_criteria_path, model_answer_path=None, force=False, on_text=None):
         """
         학생 과제를 평가 기준과 모범 답안을 기반으로 평가
         
+        제출물, 평가 기준, 모범 답안 텍스트와 프롬프트 버전, 모델이 모두 같은 평가 결과가
+        캐시에 있으면 Bedrock을 호출하지 않고 캐시된 결과를 반환합니다. 가짜 백엔드를 사용하면
+        캐시를 사용하지 않습니다.
+        
+        입력이 토큰 예산(token_budget.EVALUATION_INPUT_TOKEN_BUDGET) 안에 들어가면 한 번에
+        평가하고, 넘으면 제출물을 문단 단위로 나누어 부분별로 동시에 평가한 뒤 하나의 등급과
+        피드백으로 종합합니다. 어느 방식으로 평가했는지는 결과의 path에 기록됩니다.
+        
+        on_text를 지정하면 응답을 스트리밍으로 받아 텍스트 조각이 도착할 때마다 호출합니다
+        (분할 평가는 마지막 종합 평가만 스트리밍). 캐시된 결과를 사용하면 호출하지 않습니다.
+        
         Args:
             student_submission_path (str): 학생 제출물 파일 경로
             evaluation_criteria_path (str): 평가 기준 파일 경로
             model_answer_path (str, optional): 모범 답안 파일 경로
+            force (bool): True이면 캐시를 무시하고 다시 평가 (새 결과로 캐시를 갱신)
+            on_text (callable, optional): 스트리밍으로 받은 텍스트 조각을 받을 함수
             
         Returns:
-            dict: 평가 결과 (grade, comments)
+            dict: 평가 결과 (grade, comments, path)
         """
         try:
             # 파일 내용 읽기
@@ -92,18 +289,28 @@ class BedrockEvaluator:
             if model_answer_path:
                 model_answer_content = self.read_file_content(model_answer_path)
             
-            # 프롬프트 구성
-            prompt = self._create_evaluation_prompt(
-                student_content, 
-                criteria_content, 
-                model_answer_content
+            cache_key = make_cache_key(
+                self.model_id, PROMPT_TEMPLATE_VERSION,
+                student_content, criteria_content, model_answer_content
             )
+            if self.use_cache and not force:
+                cached_result = get_cached_evaluation(cache_key)
+                if cached_result is not None:
+                    logger.info(f"캐시된 평가 결과 사용: {student_submission_path}")
+                    return cached_result
             
-            # Bedrock API 호출
-            response = self._invoke_bedrock_model(prompt)
+            # 프롬프트 구성 (평가 기준과 모범 답안은 캐시 가능한 공통 앞부분, 제출물만 매번 달라짐)
+            system = self._create_prompt_prefix(criteria_content, model_answer_content)
             
-            # 응답 파싱
-            evaluation_result = self._parse_evaluation_response(response)
+            # 토큰 예산에 따라 평가 방식 결정
+            path, chunk_tokens = plan_evaluation(estimate_tokens(system[0]['text']), estimate_tokens(student_content))
+            if path == SINGLE_PATH:
+                evaluation_result = self._evaluate_single(system, student_content, on_text)
+            else:
+                evaluation_result = self._evaluate_map_reduce(system, student_content, chunk_tokens, on_text)
+            evaluation_result['path'] = path
+            if self.use_cache:
+                store_evaluation(cache_key, self.model_id, PROMPT_TEMPLATE_VERSION, evaluation_result)
             
             return evaluation_result
             
@@ -114,93 +321,226 @@ class BedrockEvaluator:
                 "comments": f"자동 평가 중 오류가 발생했습니다: {str(e)}"
             }
     
-    def _create_evaluation_prompt(self, student_content, criteria_content, model_answer_content=""):
+    def _evaluate_single(self, system, student_content, on_text=None):
+        """
+        제출물 전체를 한 번의 호출로 평가
+        
+        Args:
+            system (list): system 텍스트 블록 (캐시 가능한 공통 앞부분)
+            student_content (str): 학생 제출물 내용
+            on_text (callable, optional): 스트리밍으로 받은 텍스트 조각을 받을 함수
+            
+        Returns:
+            dict: 평가 결과 (grade, comments)
+        """
+        response = self._invoke_bedrock_model(system, self._create_messages(student_content), on_text)
+        return self._parse_evaluation_response(response)
+    
+    def _evaluate_map_reduce(self, system, student_content, chunk_tokens, on_text=None):
         """
-        평가를 위한 프롬프트 생성
+        제출물을 부분으로 나누어 동시에 평가한 뒤 결과를 종합
+        
+        모든 부분 평가와 종합 평가가 같은 system 블록을 사용하므로 평가 기준과 모범 답안은
+        Bedrock 프롬프트 캐시에서 읽습니다. 한 부분이라도 평가에 실패하면 전체를 실패로
+        처리합니다(작업 큐에서 다시 시도).
         
         Args:
+            system (list): system 텍스트 블록 (캐시 가능한 공통 앞부분)
             student_content (str): 학생 제출물 내용
+            chunk_tokens (int): 부분당 최대 추정 토큰 수
+            on_text (callable, optional): 종합 평가 응답을 스트리밍으로 받을 함수
+            
+        Returns:
+            dict: 평가 결과 (grade, comments)
+        """
+        chunks = split_into_chunks(student_content, chunk_tokens)
+        logger.info(f"분할 평가: {len(chunks)}개 부분 (부분당 최대 약 {chunk_tokens}토큰)")
+        
+        def evaluate_chunk(index):
+            messages = self._create_chunk_messages(chunks[index], index + 1, len(chunks))
+            return self._parse_evaluation_response(self._invoke_bedrock_model(system, messages))
+        
+        max_workers = max(1, min(CHUNK_EVALUATION_CONCURRENCY, len(chunks)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='chunk-evaluation') as executor:
+            chunk_results = list(executor.map(evaluate_chunk, range(len(chunks))))
+        
+        for index, chunk_result in enumerate(chunk_results, start=1):
+            if chunk_result.get('grade') is None:
+                return {
+                    "grade": None,
+                    "comments": f"제출물 {index}번째 부분 평가 실패: {chunk_result.get('comments')}"
+                }
+        
+        response = self._invoke_bedrock_model(system, self._create_reduce_messages(chunk_results), on_text)
+        return self._parse_evaluation_response(response)
+    
+    def _create_prompt_prefix(self, criteria_content, model_answer_content=""):
+        """
+        평가 프롬프트의 공통 앞부분(system 블록) 생성
+        
+        평가 지침, 응답 형식, 평가 기준, 모범 답안은 같은 평가 기준으로 채점하는 모든 제출물에서
+        바이트 단위로 동일하므로, 모델이 프롬프트 캐시를 지원하면(prompt_cache_enabled) 마지막
+        블록에 cache_control을 지정해 Bedrock 프롬프트 캐시를 재사용합니다. 제출물마다 달라지는
+        값(시간, 경로 등)을 넣으면 캐시가 적중하지 않습니다.
+        
+        Args:
             criteria_content (str): 평가 기준 내용
             model_answer_content (str): 모범 답안 내용
             
         Returns:
-            str: 평가 프롬프트
+            list: system 텍스트 블록 목록
         """
-        prompt = f"""
-        당신은 학생 과제를 평가하는 교육 전문가입니다. 주어진 평가 기준과 모범 답안을 바탕으로 학생의 제출물을 공정하게 평가해주세요.
+        prefix = EVALUATION_INSTRUCTIONS + f"\n\n# 평가 기준\n{criteria_content}"
+        if model_answer_content:
+            prefix += f"\n\n# 모범 답안\n{model_answer_content}"
         
-        # 평가 기준
-        {criteria_content}
+        block = {"type": "text", "text": prefix}
+        if self.prompt_cache:
+            block["cache_control"] = {"type": "ephemeral"}
+        return [block]
+    
+    def _create_messages(self, student_content):
+        """
+        제출물마다 달라지는 사용자 메시지 생성
         
-        # 학생 제출물
-        {student_content}
+        Args:
+            student_content (str): 학생 제출물 내용
+            
+        Returns:
+            list: Bedrock messages 목록
+        """
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": f"# 학생 제출물\n{student_content}\n\n{EVALUATION_REQUEST}"}
+                ]
+            }
+        ]
+    
+    def _create_chunk_messages(self, chunk_content, index, count):
         """
+        분할 평가에서 제출물 한 부분을 평가하는 사용자 메시지 생성
         
-        if model_answer_content:
-            prompt += f"""
-            # 모범 답안
-            {model_answer_content}
-            """
-        
-        prompt += """
-        # 평가 지침
-        1. 평가 기준에 따라 학생의 제출물을 객관적으로 평가해주세요.
-        2. 학생의 제출물과 모범 답안을 비교하여 유사점과 차이점을 분석해주세요.
-        3. 학생의 이해도, 창의성, 논리적 구성을 고려해주세요.
-        4. 최종 평가는 A, B, C, D, F 중 하나의 등급으로 제시해주세요.
-        5. 개선을 위한 구체적인 피드백을 제공해주세요.
-        
-        # 응답 형식
-        다음 JSON 형식으로 응답해주세요:
-        ```json
-        {
-            "grade": "등급(A/B/C/D/F)",
-            "comments": "상세한 피드백과 개선점"
-        }
-        ```
+        Args:
+            chunk_content (str): 제출물 부분 내용
+            index (int): 부분 번호 (1부터)
+            count (int): 전체 부분 수
+            
+        Returns:
+            list: Bedrock messages 목록
+        """
+        text = f"# 학생 제출물 ({count}개 부분 중 {index}번째 부분)\n{chunk_content}\n\n{CHUNK_EVALUATION_REQUEST}"
+        return [{"role": "user", "content": [{"type": "text", "text": text}]}]
+    
+    def _create_reduce_messages(self, chunk_results):
+        """
+        부분별 평가 결과를 종합하는 사용자 메시지 생성
         
-        JSON 형식만 응답하고 다른 설명은 포함하지 마세요.
+        Args:
+            chunk_results (list): 부분별 평가 결과 (grade, comments) 목록
+            
+        Returns:
+            list: Bedrock messages 목록
+        """
+        sections = [
+            f"## {index}번째 부분 (등급: {chunk_result['grade']})\n{chunk_result['comments']}"
+            for index, chunk_result in enumerate(chunk_results, start=1)
+        ]
+        text = "# 부분별 평가 결과\n\n" + "\n\n".join(sections) + "\n\n" + REDUCE_EVALUATION_REQUEST.format(count=len(chunk_results))
+        return [{"role": "user", "content": [{"type": "text", "text": text}]}]
+    
+    def _create_request_body(self, system, messages):
         """
+        Anthropic Claude 모델용 요청 본문(JSON 문자열) 생성
+        
+        system이 messages보다 먼저 직렬화되므로 같은 평가 기준의 요청 본문은 제출물 앞까지
+        바이트 단위로 동일합니다.
         
-        return prompt
+        Args:
+            system (list): system 텍스트 블록 (캐시 가능한 공통 앞부분)
+            messages (list): 사용자 메시지 목록
+            
+        Returns:
+            str: 요청 본문
+        """
+        request_body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": MAX_OUTPUT_TOKENS,
+            "system": system,
+            "messages": messages
+        }
+        return json.dumps(request_body)
     
-    def _invoke_bedrock_model(self, prompt):
+    def _invoke_bedrock_model(self, system, messages, on_text=None):
         """
         Bedrock 모델 호출
         
         Args:
-            prompt (str): 모델에 전달할 프롬프트
+            system (list): system 텍스트 블록 (캐시 가능한 공통 앞부분)
+            messages (list): 사용자 메시지 목록
+            on_text (callable, optional): 지정하면 응답을 스트리밍으로 받아 텍스트 조각마다 호출
             
         Returns:
             str: 모델 응답
         """
         try:
-            # Anthropic Claude 모델용 요청 본문
-            request_body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 1000,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            }
+            body = self._create_request_body(system, messages)
+            if on_text is None:
+                # Bedrock 모델 호출
+                response = self.bedrock_runtime.invoke_model(modelId=self.model_id, body=body)
+                
+                # 응답 파싱
+                response_body = json.loads(response.get('body').read())
+                usage = response_body.get('usage', {})
+                text = response_body['content'][0]['text']
+            else:
+                text, usage = self._stream_bedrock_model(body, on_text)
             
-            # Bedrock 모델 호출
-            response = self.bedrock_runtime.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body)
+            logger.info(
+                f"Bedrock 토큰 사용량: 입력 {usage.get('input_tokens')}, "
+                f"캐시 기록 {usage.get('cache_creation_input_tokens', 0)}, "
+                f"캐시 읽기 {usage.get('cache_read_input_tokens', 0)}, 출력 {usage.get('output_tokens')}"
             )
-            
-            # 응답 파싱
-            response_body = json.loads(response.get('body').read())
-            return response_body['content'][0]['text']
+            return text
             
         except ClientError as e:
             logger.error(f"Bedrock API 호출 오류: {str(e)}")
             raise Exception(f"Bedrock API 호출 오류: {str(e)}")
     
+    def _stream_bedrock_model(self, body, on_text):
+        """
+        invoke_model_with_response_stream으로 모델을 호출하고 텍스트 조각을 on_text로 전달
+        
+        Args:
+            body (str): 요청 본문
+            on_text (callable): 텍스트 조각을 받을 함수
+            
+        Returns:
+            tuple: (전체 응답 텍스트, 토큰 사용량)
+        """
+        started = time.perf_counter()
+        response = self.bedrock_runtime.invoke_model_with_response_stream(modelId=self.model_id, body=body)
+        
+        parts = []
+        usage = {}
+        for event in response.get('body'):
+            chunk = event.get('chunk')
+            if not chunk:
+                continue
+            data = json.loads(chunk['bytes'])
+            if data['type'] == 'message_start':
+                usage.update(data['message'].get('usage', {}))
+            elif data['type'] == 'content_block_delta' and data['delta'].get('type') == 'text_delta':
+                if not parts:
+                    logger.info(f"Bedrock 첫 응답까지 {time.perf_counter() - started:.2f}초")
+                parts.append(data['delta']['text'])
+                on_text(data['delta']['text'])
+            elif data['type'] == 'message_delta':
+                usage.update(data.get('usage', {}))
+        
+        return "".join(parts), usage
+    
     def _parse_evaluation_response(self, response):
         """
         모델 응답에서 평가 결과 추출
@@ -0,0 +1,140 @@
+"""
+DOCX 텍스트 추출 벤치마크
+
+python-docx로 Document 전체를 불러와 doc.paragraphs를 읽는 기존 방식과, document.xml을
+iterparse로 스트리밍하는 text_extraction.read_docx_content를 같은 대용량 문서에서
+비교합니다. 방식마다 별도 프로세스에서 실행해 소요 시간과 최대 메모리(RSS) 증가량을
+측정합니다. 메모리는 /proc/self/statm을 읽으므로 Linux에서만 측정됩니다.
+
+사용법:
+    python benchmark_docx_extraction.py [문단 수]
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+import subprocess
+
+DEFAULT_PARAGRAPHS = 20000
+TABLE_EVERY = 100           # 문단 몇 개마다 표를 하나 넣을지
+REPEAT = 3                  # 방식별 반복 실행 횟수 (가장 빠른 시간, 가장 큰 메모리 증가량 사용)
+
+
+def _create_sample_docx(path, paragraph_count):
+    """머리글, 문단, 표가 섞인 샘플 문서를 만듭니다."""
+    from docx import Document
+
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "벤치마크 문서 머리글"
+    for i in range(paragraph_count):
+        doc.add_paragraph(f"{i}번째 문단입니다. 학생 보고서의 본문 내용을 흉내 낸 문장이 이어집니다. " * 3)
+        if i % TABLE_EVERY == 0:
+            table = doc.add_table(rows=3, cols=4)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = f"표 {i} 셀"
+    doc.save(path)
+
+
+def _current_rss_kib():
+    """현재 프로세스의 RSS(KiB)를 반환합니다. /proc이 없는 환경에서는 None을 반환합니다."""
+    try:
+        with open('/proc/self/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+    except OSError:
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+class _PeakMemorySampler:
+    """추출하는 동안 RSS를 주기적으로 측정해 시작 시점 대비 최대 증가량을 기록합니다."""
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.baseline = _current_rss_kib()
+        self.peak = self.baseline
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _current_rss_kib())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        if self.baseline is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.baseline is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, _current_rss_kib())
+
+    @property
+    def delta_kib(self):
+        return self.peak - self.baseline if self.baseline is not None else -1
+
+
+def _measure(method, path):
+    """자식 프로세스에서 한 가지 방식을 실행하고 결과를 출력합니다."""
+    if method == 'python-docx':
+        from docx import Document
+
+        def extract():
+            doc = Document(path)
+            return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+    else:
+        from text_extraction import read_docx_content
+
+        def extract():
+            return read_docx_content(path)[1]
+
+    with _PeakMemorySampler() as sampler:
+        started = time.perf_counter()
+        content = extract()
+        elapsed = time.perf_counter() - started
+
+    print(f"{elapsed:.4f} {sampler.delta_kib} {len(content)}")
+
+
+def _run(method, path):
+    """방식별로 새 프로세스를 띄워 측정하고 (시간, 메모리 증가량, 글자 수)를 반환합니다."""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--measure', method, path],
+        check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    ).stdout.split()
+    return float(output[0]), int(output[1]), int(output[2])
+
+
+def main(argv):
+    """샘플 문서를 만들고 두 방식의 시간과 메모리를 비교해 출력합니다."""
+    if argv[:1] == ['--measure']:
+        _measure(argv[1], argv[2])
+        return 0
+
+    paragraph_count = int(argv[0]) if argv else DEFAULT_PARAGRAPHS
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'benchmark.docx')
+        _create_sample_docx(path, paragraph_count)
+        print(f"샘플 문서: 문단 {paragraph_count}개, 표 {paragraph_count // TABLE_EVERY + 1}개, "
+              f"{os.path.getsize(path) / 1024:.0f}KB")
+
+        results = {}
+        for method in ['python-docx', 'streaming']:
+            runs = [_run(method, path) for _ in range(REPEAT)]
+            results[method] = (min(run[0] for run in runs), max(run[1] for run in runs), runs[0][2])
+            elapsed, rss_delta, char_count = results[method]
+            memory = f"{rss_delta / 1024:.1f}MB" if rss_delta >= 0 else "측정 불가"
+            print(f"{method:12s} 시간 {elapsed:.3f}초  메모리 증가 {memory}  추출 {char_count}자")
+
+    speedup = results['python-docx'][0] / results['streaming'][0]
+    print(f"스트리밍 추출이 {speedup:.1f}배 빠릅니다. (python-docx 방식은 표와 머리글을 포함하지 않습니다)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,128 @@
+"""
+평가 프롬프트 캐시 앞부분 검사
+
+같은 평가 기준과 모범 답안으로 여러 제출물을 평가할 때 Bedrock 요청 본문이 학생
+제출물 앞까지 바이트 단위로 동일한지 확인합니다. 분할 평가의 부분 평가와 종합 평가 요청도
+같은 앞부분을 사용해야 합니다. 앞부분이 한 바이트라도 다르면 Bedrock
+프롬프트 캐시가 적중하지 않습니다. 설정된 모델(BEDROCK_MODEL_ID)이 프롬프트 캐시를
+지원하는지도 표시합니다. Bedrock을 호출하지 않으므로 AWS 자격 증명 없이 실행할 수 있으며,
+문제가 있으면 실패(종료 코드 1)합니다.
+
+사용법:
+    python check_prompt_prefix.py
+"""
+import sys
+from bedrock_evaluator import (
+    DEFAULT_MODEL_ID, PROMPT_CACHE_MODE, BedrockEvaluator, prompt_cache_enabled, supports_prompt_cache
+)
+
+# 프롬프트 캐시를 지원하는 모델에서 cache_control이 붙는지 확인할 때 사용할 모델
+CACHE_CAPABLE_MODEL_ID = 'anthropic.claude-3-7-sonnet-20250219-v1:0'
+
+SAMPLE_CRITERIA = "1. 문제 정의가 명확한가 (30점)\n2. 풀이 과정이 논리적인가 (40점)\n3. 결론이 타당한가 (30점)\n" * 20
+SAMPLE_MODEL_ANSWER = "모범 답안: 문제를 정의하고 단계별로 풀이한 뒤 결론을 제시합니다.\n" * 20
+SAMPLE_SUBMISSIONS = [
+    "첫 번째 학생의 보고서입니다. 문제를 정의하고 풀이했습니다.",
+    "두 번째 학생은 {\"grade\": \"A\"} 같은 JSON과 \"따옴표\", 줄바꿈\n\n을 포함합니다.",
+    "",
+    "세 번째 학생의 긴 보고서입니다. " * 500,
+]
+
+
+def _request_prefix(evaluator, student_content, criteria_content, model_answer_content, messages=None):
+    """요청 본문에서 학생 제출물 직전까지의 바이트를 반환합니다."""
+    system = evaluator._create_prompt_prefix(criteria_content, model_answer_content)
+    messages = messages or evaluator._create_messages(student_content)
+    body = evaluator._create_request_body(system, messages).encode('utf-8')
+    variable_start = body.index(b'"messages"')
+    return body[:variable_start], system
+
+
+def check_prefixes(criteria_content, model_answer_content, model_id=DEFAULT_MODEL_ID):
+    """
+    제출물만 다른 요청들의 앞부분을 비교해 문제 목록을 반환
+
+    Args:
+        model_id (str): 검사할 Bedrock 모델 ID (cache_control 지정 여부가 모델에 따라 다름)
+
+    Returns:
+        tuple: (문제 설명 문자열 목록, 요청 앞부분 바이트 수)
+    """
+    problems = []
+    # 작업자 스레드마다 평가기를 새로 만들어도 같은 앞부분이 나와야 함
+    evaluators = [BedrockEvaluator(model_id=model_id, client=object()), BedrockEvaluator(model_id=model_id, client=object())]
+    expected_cache_control = {"type": "ephemeral"} if prompt_cache_enabled(model_id) else None
+
+    prefixes = []
+    for i, student_content in enumerate(SAMPLE_SUBMISSIONS):
+        prefix, system = _request_prefix(
+            evaluators[i % len(evaluators)], student_content, criteria_content, model_answer_content
+        )
+        prefixes.append(prefix)
+
+        if system[-1].get('cache_control') != expected_cache_control:
+            if expected_cache_control:
+                problems.append("공통 앞부분의 마지막 블록에 cache_control이 없습니다.")
+            else:
+                problems.append("프롬프트 캐시를 사용하지 않는 모델인데 cache_control이 지정되었습니다.")
+        if any('cache_control' in block for block in system[:-1]):
+            problems.append("공통 앞부분의 마지막 블록이 아닌 곳에 cache_control이 있습니다.")
+        if student_content and any(student_content in block['text'] for block in system):
+            problems.append(f"제출물 {i + 1}의 내용이 공통 앞부분에 포함되었습니다.")
+
+    for i, prefix in enumerate(prefixes[1:], start=2):
+        if prefix != prefixes[0]:
+            mismatch = next(
+                (pos for pos, (a, b) in enumerate(zip(prefix, prefixes[0])) if a != b),
+                min(len(prefix), len(prefixes[0]))
+            )
+            problems.append(f"제출물 {i}의 요청 앞부분이 {mismatch}번째 바이트부터 다릅니다.")
+
+    # 분할 평가의 부분 평가와 종합 평가도 같은 앞부분을 재사용해야 함
+    split_messages = [
+        ("부분 평가", evaluators[0]._create_chunk_messages(SAMPLE_SUBMISSIONS[0], 1, 2)),
+        ("종합 평가", evaluators[1]._create_reduce_messages([{"grade": "B", "comments": "잘 정리했습니다."}] * 2)),
+    ]
+    for label, messages in split_messages:
+        prefix, _ = _request_prefix(evaluators[0], "", criteria_content, model_answer_content, messages)
+        if prefix != prefixes[0]:
+            problems.append(f"분할 평가의 {label} 요청 앞부분이 다릅니다.")
+
+    # 평가 기준이 바뀌면 앞부분도 달라져야 함 (다른 평가 기준의 캐시를 재사용하지 않음)
+    changed_prefix, _ = _request_prefix(evaluators[0], SAMPLE_SUBMISSIONS[0], criteria_content + "추가", model_answer_content)
+    if changed_prefix == prefixes[0]:
+        problems.append("평가 기준이 바뀌었는데 요청 앞부분이 같습니다.")
+
+    return problems, len(prefixes[0])
+
+
+def main():
+    """설정된 모델과 캐시 지원 모델로 모범 답안이 있는 경우와 없는 경우의 요청 앞부분을 검사합니다."""
+    failed = False
+    if prompt_cache_enabled(DEFAULT_MODEL_ID):
+        print(f"✅ 설정된 모델 {DEFAULT_MODEL_ID}에서 프롬프트 캐시를 사용합니다.")
+    elif supports_prompt_cache(DEFAULT_MODEL_ID):
+        print(f"⚠️ 설정된 모델 {DEFAULT_MODEL_ID}은 프롬프트 캐시를 지원하지만 BEDROCK_PROMPT_CACHE={PROMPT_CACHE_MODE}로 꺼져 있습니다.")
+    else:
+        print(f"⚠️ 설정된 모델 {DEFAULT_MODEL_ID}은 프롬프트 캐시를 지원하지 않아 cache_control 없이 요청합니다. "
+              f"캐시를 사용하려면 BEDROCK_MODEL_ID를 지원 모델(예: {CACHE_CAPABLE_MODEL_ID})로 바꾸세요.")
+
+    model_ids = [DEFAULT_MODEL_ID]
+    if CACHE_CAPABLE_MODEL_ID != DEFAULT_MODEL_ID and PROMPT_CACHE_MODE != 'off':
+        model_ids.append(CACHE_CAPABLE_MODEL_ID)
+    for model_id in model_ids:
+        for label, model_answer_content in [("모범 답안 있음", SAMPLE_MODEL_ANSWER), ("모범 답안 없음", "")]:
+            label = f"{model_id}, {label}"
+            problems, prefix_bytes = check_prefixes(SAMPLE_CRITERIA, model_answer_content, model_id)
+            if problems:
+                failed = True
+                for problem in problems:
+                    print(f"❌ [{label}] {problem}")
+            else:
+                print(f"✅ [{label}] 제출물 {len(SAMPLE_SUBMISSIONS)}개의 요청 앞부분 {prefix_bytes} bytes가 동일합니다.")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+대시보드 조회 쿼리의 실행 계획 검사
+
+임시 데이터베이스에 마이그레이션과 샘플 데이터를 적용한 뒤 app.py의 조회 함수를 실제로
+호출하고, 실행된 SELECT 문마다 EXPLAIN QUERY PLAN을 확인합니다. 테이블을 처음부터 읽는
+SCAN(인덱스 순서로 읽는 SCAN 포함)이나 정렬용 임시 B-tree가 있으면 실패(종료 코드 1)합니다.
+다음 경우만 예외로 허용합니다.
+
+- 필터 없는 제출물 목록의 키셋 페이지: 정렬 순서의 인덱스를 따라 LIMIT개만 읽는 SCAN
+- 검색 조건이 있는 목록: 모든 테이블을 인덱스 SEARCH로 좁힌 뒤의 임시 B-tree 정렬
+- 일괄 자동 평가 대상 조회: 대상이 전체 제출물이므로 제출 순서 인덱스로 읽는 SCAN
+
+사용법:
+    python check_query_plans.py
+"""
+import os
+import sys
+import random
+import itertools
+import tempfile
+from datetime import date, datetime, timedelta
+
+import database
+
+# 샘플 데이터 규모 (여러 학기 분량)
+STUDENT_COUNT = 200
+SUBMISSION_COUNT = 3000
+
+
+def _seed_sample_data(conn):
+    """실행 계획 검사용 샘플 데이터를 삽입합니다."""
+    rng = random.Random(0)
+    base_time = datetime(2025, 3, 1)
+
+    students = [
+        (f"2025{i:04d}", 'x', f"학생{i}", f"student{i}@email.com")
+        for i in range(STUDENT_COUNT)
+    ]
+    submissions = []
+    for i in range(SUBMISSION_COUNT):
+        student_id = students[rng.randrange(STUDENT_COUNT)][0]
+        submit_time = base_time + timedelta(minutes=rng.randrange(60 * 24 * 365))
+        submissions.append((
+            student_id,
+            f"storage/{student_id}_report{i}.pdf",
+            f"report{i}.pdf",
+            submit_time.strftime('%Y-%m-%d %H:%M:%S')
+        ))
+
+    with conn:
+        conn.executemany('INSERT OR IGNORE INTO students VALUES (?, ?, ?, ?)', students)
+        conn.executemany('''
+            INSERT INTO submissions (student_id, file_path, original_filename, submission_time)
+            VALUES (?, ?, ?, ?)
+        ''', submissions)
+        conn.execute('''
+            INSERT INTO evaluations (submission_id, admin_id, grade, comments, evaluation_time)
+            SELECT submission_id, 'admin1', 'B', '샘플 평가', submission_time
+            FROM submissions WHERE submission_id % 3 = 0
+        ''')
+        conn.execute('''
+            INSERT INTO evaluations (submission_id, admin_id, evaluation_time, is_auto_evaluated, auto_grade, auto_comments)
+            SELECT submission_id, 'admin1', submission_time, 1, 'C', '샘플 자동 평가'
+            FROM submissions WHERE submission_id % 3 = 1
+        ''')
+        for file_type in ['평가기준', '모범답안']:
+            conn.executemany('''
+                INSERT INTO professor_files (admin_id, file_type, file_path, original_filename, upload_time)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [
+                ('admin1', file_type, f"storage/professor_files/{file_type}_{i}.pdf",
+                 f"{file_type}_{i}.pdf", f"2025-0{i + 1}-01 09:00:00")
+                for i in range(5)
+            ])
+
+    return students[0][0]
+
+
+def _run_pages(app, filters=None):
+    """정렬 방식마다 첫 페이지와 그 커서의 다음/이전 페이지를 조회합니다."""
+    for sort in app.SUBMISSION_SORT_OPTIONS:
+        first_page, _ = app.get_submissions_page(app.SUBMISSIONS_PAGE_SIZE, filters=filters, sort=sort)
+        if not first_page:
+            continue
+        page_cursor = app.get_page_cursor(first_page[-1], sort)
+        app.get_submissions_page(app.SUBMISSIONS_PAGE_SIZE, page_cursor, filters=filters, sort=sort)
+        app.get_submissions_page(app.SUBMISSIONS_PAGE_SIZE, page_cursor, backward=True, filters=filters, sort=sort)
+
+
+def _run_page_queries(app, student_id):
+    """필터 없는 제출물 목록의 키셋 페이지를 조회합니다."""
+    _run_pages(app)
+
+
+def _run_dashboard_queries(app, student_id):
+    """학생/관리자 대시보드가 한 번 렌더링될 때 호출하는 조회 함수를 실행합니다."""
+    app.get_student_submissions(student_id)
+    app.get_submission_stats()
+    app.get_latest_professor_file('평가기준')
+    app.get_latest_professor_file('모범답안')
+    app.get_professor_files('admin1')
+    app.get_evaluation(3, 'admin1')
+    app.get_evaluation_job_statuses('admin1', tuple(range(1, app.SUBMISSIONS_PAGE_SIZE + 1)))
+    app.get_evaluation_job_counts('admin1', '2025-05-01 09:00:00')
+    app.get_failed_evaluation_jobs('admin1', '2025-05-01 09:00:00')
+    app.get_document_text('storage/professor_files/평가기준_0.pdf')
+    app.search_submissions('샘플 평가')
+
+
+def _run_filtered_queries(app, student_id):
+    """build_submission_filter가 만드는 모든 검색 조건 조합으로 제출물 목록을 조회합니다."""
+    student_queries = [None, student_id, student_id[:6], '학생1']
+    date_ranges = [(None, None), (date(2025, 5, 1), None), (None, date(2025, 5, 31)), (date(2025, 5, 1), date(2025, 5, 31))]
+    grades = [None, 'B']
+    for student_query, (date_from, date_to), eval_state, grade in itertools.product(
+        student_queries, date_ranges, app.EVALUATION_STATE_FILTERS, grades
+    ):
+        filters = {
+            'student_query': student_query,
+            'date_from': date_from,
+            'date_to': date_to,
+            'eval_state': eval_state,
+            'grade': grade,
+        }
+        if app.is_filter_active(filters):
+            _run_pages(app, filters)
+
+
+def _run_batch_queries(app, student_id):
+    """일괄 자동 평가 대상을 조회합니다."""
+    app.get_pending_auto_evaluations('admin1', '2025-05-01 09:00:00')
+
+
+def find_plan_problems(conn, statements, allow_keyset_scan=False, allow_temp_sort=False, allow_full_scan=False):
+    """
+    쿼리 목록의 실행 계획에서 문제를 찾음
+
+    SCAN은 인덱스 순서로 읽더라도 조건에 맞는 행을 찾을 때까지 테이블 전체를 읽을 수 있으므로
+    기본적으로 문제로 봅니다. FTS5 가상 테이블의 MATCH 검색(VIRTUAL TABLE INDEX)은 제외합니다.
+
+    Args:
+        conn (sqlite3.Connection): 실행 계획을 확인할 연결
+        statements (list): 값이 채워진 SELECT 문 목록
+        allow_keyset_scan (bool): 임시 정렬 없이 인덱스 순서로 LIMIT개만 읽는 SCAN을 허용할지 여부
+        allow_temp_sort (bool): 모든 테이블을 인덱스 SEARCH로 좁힌 결과의 임시 B-tree 정렬을 허용할지 여부
+        allow_full_scan (bool): 인덱스 순서로 읽는 SCAN을 허용할지 여부 (전체가 대상인 쿼리)
+
+    Returns:
+        list: (쿼리, 문제가 된 실행 계획 항목) 목록
+    """
+    problems = []
+    for sql in statements:
+        details = [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql)]
+        scans = [
+            detail for detail in details
+            if detail.startswith('SCAN ') and 'VIRTUAL TABLE INDEX' not in detail
+        ]
+        temp_sorts = [detail for detail in details if detail.startswith('USE TEMP B-TREE')]
+
+        for detail in scans:
+            ordered_scan = ' USING ' in detail and 'INDEX' in detail
+            keyset_scan = allow_keyset_scan and ordered_scan and not temp_sorts and 'LIMIT' in sql
+            if not (keyset_scan or (allow_full_scan and ordered_scan)):
+                problems.append((sql, detail))
+        if not (allow_temp_sort and not scans):
+            problems.extend((sql, detail) for detail in temp_sorts)
+    return problems
+
+
+def main():
+    """임시 데이터베이스에서 대시보드 쿼리의 실행 계획을 검사합니다."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database.close_all_connections()
+        database.DATABASE_PATH = os.path.join(temp_dir, 'query_plan_check.db')
+
+        from migrations import run_migrations
+        run_migrations()
+
+        conn = database.get_connection()
+        student_id = _seed_sample_data(conn)
+
+        import app
+
+        # (조회 함수, find_plan_problems에 넘길 허용 규칙)
+        query_groups = [
+            (_run_dashboard_queries, {}),
+            (_run_page_queries, {'allow_keyset_scan': True}),
+            (_run_filtered_queries, {'allow_temp_sort': True}),
+            (_run_batch_queries, {'allow_full_scan': True}),
+        ]
+        statements = []
+        problems = []
+        conn.set_trace_callback(
+            lambda sql: statements.append(sql) if sql.lstrip().upper().startswith('SELECT') else None
+        )
+        try:
+            for run_queries, rules in query_groups:
+                start = len(statements)
+                run_queries(app, student_id)
+                problems += find_plan_problems(conn, statements[start:], **rules)
+        finally:
+            conn.set_trace_callback(None)
+        database.close_all_connections()
+
+    print(f"검사한 쿼리: {len(statements)}개")
+    if problems:
+        for sql, detail in problems:
+            print(f"\n❌ {detail}\n{' '.join(sql.split())}")
+        return 1
+
+    print("✅ 모든 대시보드 쿼리가 인덱스를 사용합니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
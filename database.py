@@ -0,0 +1,228 @@
+import sqlite3
+import os
+import copy
+import time
+import queue
+import threading
+import weakref
+import functools
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 데이터베이스 파일 경로 (환경 변수로 변경 가능)
+DATABASE_PATH = os.environ.get('DATABASE_PATH', 'database.db')
+
+# 연결 설정
+BUSY_TIMEOUT_MS = 5000          # 잠금 대기 시간 (밀리초)
+CACHE_SIZE_KIB = 16384          # 연결당 페이지 캐시 크기 (KiB)
+MAX_IDLE_CONNECTIONS = 16       # 풀에 보관할 최대 유휴 연결 수
+QUERY_CACHE_MAX_ENTRIES = 512   # 조회 결과 캐시 최대 항목 수
+EXTERNAL_CHANGE_CHECK_SECONDS = float(os.environ.get('EXTERNAL_CHANGE_CHECK_SECONDS', '1'))  # 다른 프로세스의 커밋을 확인하는 최소 간격 (초)
+
+_idle_connections = queue.LifoQueue(maxsize=MAX_IDLE_CONNECTIONS)
+_local = threading.local()
+
+# 조회 결과 캐시: 쓰기가 커밋될 때마다 데이터 버전이 올라가고 이전 버전 결과는 무효가 됩니다.
+_data_version = 0
+_query_cache = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+# 다른 프로세스(평가 작업자 등)의 커밋 감지용 연결과 마지막으로 확인한 PRAGMA data_version
+_watch_connection = None
+_watch_version = None
+_watch_checked_at = None
+_watch_lock = threading.Lock()
+
+
+class _ConnectionLease:
+    """스레드에 대여된 연결. 스레드가 종료되면 연결이 풀로 반환됩니다."""
+
+    def __init__(self, conn, path):
+        self.conn = conn
+        self.path = path
+        weakref.finalize(self, _release_connection, conn, path)
+
+
+def _configure_connection(conn):
+    """새 연결에 PRAGMA 설정을 한 번만 적용합니다."""
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KIB}')
+    conn.execute('PRAGMA temp_store=MEMORY')
+
+
+def _open_connection(path):
+    """새 SQLite 연결을 생성하고 설정합니다."""
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False
+    )
+    _configure_connection(conn)
+    logger.debug(f"새 데이터베이스 연결 생성: {path}")
+    return conn
+
+
+def _release_connection(conn, path):
+    """연결을 유휴 풀로 반환합니다. 풀이 가득 찼거나 경로가 바뀌었으면 닫습니다."""
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        if path == DATABASE_PATH:
+            _idle_connections.put_nowait((conn, path))
+            return
+    except (queue.Full, sqlite3.Error):
+        pass
+    conn.close()
+
+
+def get_connection():
+    """
+    현재 스레드에 할당된 데이터베이스 연결을 반환
+
+    스레드마다 하나의 연결을 대여하며, 같은 스레드 안에서는 항상 같은 연결을 재사용합니다.
+    스레드가 종료되면 연결은 닫히지 않고 풀로 돌아가 다음 스레드가 재사용합니다.
+
+    Returns:
+        sqlite3.Connection: 설정이 적용된 연결
+    """
+    lease = getattr(_local, 'lease', None)
+    if lease is not None and lease.path == DATABASE_PATH:
+        return lease.conn
+
+    conn = None
+    while conn is None:
+        try:
+            idle_conn, idle_path = _idle_connections.get_nowait()
+        except queue.Empty:
+            conn = _open_connection(DATABASE_PATH)
+            break
+        if idle_path == DATABASE_PATH:
+            conn = idle_conn
+        else:
+            idle_conn.close()
+
+    _local.lease = _ConnectionLease(conn, DATABASE_PATH)
+    return conn
+
+
+@contextmanager
+def transaction():
+    """
+    쓰기 트랜잭션 컨텍스트
+
+    블록이 정상 종료되면 커밋하고, 예외가 발생하면 롤백합니다.
+
+    Yields:
+        sqlite3.Cursor: 현재 스레드 연결의 커서
+    """
+    conn = get_connection()
+    with conn:
+        yield conn.cursor()
+    invalidate_query_cache()
+
+
+def get_data_version():
+    """현재 데이터 버전을 반환합니다. 쓰기 트랜잭션이 커밋될 때마다 증가합니다."""
+    return _data_version
+
+
+def invalidate_query_cache():
+    """데이터 버전을 올려 캐시된 조회 결과를 모두 무효화합니다."""
+    global _data_version
+    with _query_cache_lock:
+        _data_version += 1
+        _query_cache.clear()
+
+
+def _check_external_changes():
+    """
+    다른 연결이 커밋했으면 조회 캐시를 무효화합니다.
+
+    transaction()을 거치지 않은 쓰기(작업자 프로세스 등)는 데이터 버전을 올리지 못하므로,
+    전용 연결의 PRAGMA data_version이 바뀌었는지 확인합니다. 이 프로세스의 커밋도 변경으로
+    감지되어 한 번 더 무효화될 수 있지만 결과는 항상 최신으로 유지됩니다.
+
+    캐시 조회마다 확인하지 않고 EXTERNAL_CHANGE_CHECK_SECONDS에 한 번만 확인하므로, 한 번의
+    화면 렌더링에서 여러 조회를 해도 PRAGMA는 한 번만 실행됩니다. 다른 프로세스의 커밋은 최대
+    이 간격만큼 늦게 반영되고, 이 프로세스의 커밋은 transaction()에서 바로 무효화됩니다.
+    """
+    global _watch_connection, _watch_version, _watch_checked_at
+    with _watch_lock:
+        now = time.monotonic()
+        if _watch_connection is None or _watch_connection[1] != DATABASE_PATH:
+            if _watch_connection is not None:
+                _watch_connection[0].close()
+            _watch_connection = (_open_connection(DATABASE_PATH), DATABASE_PATH)
+            _watch_version = None
+        elif _watch_checked_at is not None and now - _watch_checked_at < EXTERNAL_CHANGE_CHECK_SECONDS:
+            return
+        _watch_checked_at = now
+        version = _watch_connection[0].execute('PRAGMA data_version').fetchone()[0]
+        changed = _watch_version is not None and version != _watch_version
+        _watch_version = version
+
+    if changed:
+        invalidate_query_cache()
+
+
+def cached_query(func):
+    """
+    조회 함수 결과를 함수 이름과 인자, 데이터 버전 기준으로 캐시하는 데코레이터
+
+    같은 인자로 다시 호출하면 데이터가 바뀌지 않은 한 SQLite에 접근하지 않고 캐시된 결과의
+    복사본을 반환합니다. transaction()으로 쓰기가 커밋되거나 다른 프로세스가 데이터베이스에
+    커밋하면 자동으로 무효화됩니다.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (DATABASE_PATH, func.__qualname__, repr(args), repr(sorted(kwargs.items())))
+        _check_external_changes()
+
+        with _query_cache_lock:
+            entry = _query_cache.get(key)
+            if entry is not None and entry[0] == _data_version:
+                _query_cache.move_to_end(key)
+                return copy.deepcopy(entry[1])
+            version = _data_version
+
+        result = func(*args, **kwargs)
+
+        with _query_cache_lock:
+            # 조회 중에 쓰기가 커밋되었으면 오래된 결과이므로 저장하지 않음
+            if version == _data_version:
+                _query_cache[key] = (version, result)
+                _query_cache.move_to_end(key)
+                while len(_query_cache) > QUERY_CACHE_MAX_ENTRIES:
+                    _query_cache.popitem(last=False)
+
+        return copy.deepcopy(result)
+
+    return wrapper
+
+
+def close_all_connections():
+    """현재 스레드의 연결, 풀의 유휴 연결, 변경 감지용 연결을 모두 닫습니다."""
+    global _watch_connection
+    lease = getattr(_local, 'lease', None)
+    if lease is not None:
+        _local.lease = None
+        lease.conn.close()
+
+    while True:
+        try:
+            conn, _ = _idle_connections.get_nowait()
+        except queue.Empty:
+            break
+        conn.close()
+
+    with _watch_lock:
+        if _watch_connection is not None:
+            _watch_connection[0].close()
+            _watch_connection = None
@@ -0,0 +1,106 @@
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from database import get_connection, transaction
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 캐시 설정 (환경 변수로 변경 가능)
+EVALUATION_CACHE_TTL_DAYS = int(os.environ.get('EVALUATION_CACHE_TTL_DAYS', '90'))   # 이 기간 동안 사용하지 않은 결과는 삭제
+
+
+def text_sha256(text):
+    """텍스트의 SHA-256 해시를 반환합니다. 텍스트가 없으면 빈 문자열로 계산합니다."""
+    return hashlib.sha256((text or "").encode('utf-8')).hexdigest()
+
+
+def make_cache_key(model_id, prompt_version, student_content, criteria_content, model_answer_content=""):
+    """
+    평가 입력에 대한 캐시 키를 생성
+
+    제출물, 평가 기준, 모범 답안 텍스트의 해시와 프롬프트 버전, 모델 ID가 모두 같을 때만
+    같은 키가 됩니다.
+
+    Returns:
+        str: 16진수 캐시 키
+    """
+    parts = [
+        model_id,
+        prompt_version,
+        text_sha256(student_content),
+        text_sha256(criteria_content),
+        text_sha256(model_answer_content),
+    ]
+    return hashlib.sha256(json.dumps(parts).encode('utf-8')).hexdigest()
+
+
+def get_cached_evaluation(cache_key):
+    """
+    캐시된 평가 결과를 조회하고 마지막 사용 시간을 갱신
+
+    Args:
+        cache_key (str): make_cache_key로 만든 키
+
+    Returns:
+        dict: 평가 결과 (grade, comments, path) 또는 None
+    """
+    try:
+        cursor = get_connection().cursor()
+        cursor.execute('SELECT grade, comments, evaluation_path FROM evaluation_cache WHERE cache_key = ?', (cache_key,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+
+        with transaction() as cursor:
+            cursor.execute(
+                'UPDATE evaluation_cache SET last_used_at = ? WHERE cache_key = ?',
+                (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), cache_key)
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"평가 결과 캐시 조회 실패: {str(e)}")
+        return None
+    return {"grade": row[0], "comments": row[1], "path": row[2]}
+
+
+def store_evaluation(cache_key, model_id, prompt_version, result):
+    """
+    평가 결과를 캐시에 저장하고 오래 사용하지 않은 항목을 삭제
+
+    등급이 없는 결과(평가 실패)는 저장하지 않습니다.
+
+    Args:
+        cache_key (str): make_cache_key로 만든 키
+        model_id (str): 평가에 사용한 모델 ID
+        prompt_version (int): 평가 프롬프트 버전
+        result (dict): 평가 결과 (grade, comments, path)
+    """
+    if not result.get('grade'):
+        return
+
+    now = datetime.now()
+    used_at = now.strftime('%Y-%m-%d %H:%M:%S')
+    expired_before = (now - timedelta(days=EVALUATION_CACHE_TTL_DAYS)).strftime('%Y-%m-%d %H:%M:%S')
+    try:
+        with transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO evaluation_cache
+                (cache_key, model_id, prompt_version, grade, comments, evaluation_path, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    grade = excluded.grade,
+                    comments = excluded.comments,
+                    evaluation_path = excluded.evaluation_path,
+                    created_at = excluded.created_at,
+                    last_used_at = excluded.last_used_at
+            ''', (
+                cache_key, model_id, prompt_version, result['grade'], result.get('comments'),
+                result.get('path'), used_at, used_at
+            ))
+            cursor.execute('DELETE FROM evaluation_cache WHERE last_used_at < ?', (expired_before,))
+    except sqlite3.Error as e:
+        logger.warning(f"평가 결과 캐시 저장 실패: {str(e)}")
@@ -0,0 +1,382 @@
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from database import get_connection, transaction, cached_query
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 평가 작업 설정 (환경 변수로 변경 가능)
+EVALUATION_LEASE_SECONDS = int(os.environ.get('EVALUATION_LEASE_SECONDS', '300'))        # 작업자가 작업을 점유하는 시간
+EVALUATION_JOB_MAX_ATTEMPTS = int(os.environ.get('EVALUATION_JOB_MAX_ATTEMPTS', '3'))    # 임대가 만료된 작업을 다시 시도할 최대 횟수
+
+LEASE_EXPIRED_MESSAGE = "평가 작업자가 응답하지 않아 작업을 중단했습니다."
+INTERRUPTED_MESSAGE = "평가 도중 화면을 벗어나 평가를 중단했습니다."
+CANCELLED_MESSAGE = "관리자가 평가 작업을 취소했습니다."
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _lease_expiry():
+    return (datetime.now() + timedelta(seconds=EVALUATION_LEASE_SECONDS)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def enqueue_evaluations(admin_id, submission_ids, force=False):
+    """
+    자동 평가 작업을 등록
+
+    이미 대기 중이거나 진행 중인 같은 제출물의 작업이 있으면 새로 등록하지 않습니다.
+    실제 평가는 evaluation_worker.py 작업자 프로세스가 처리합니다.
+
+    Args:
+        admin_id (str): 평가를 요청한 관리자 ID
+        submission_ids (list): 제출물 ID 목록
+        force (bool): True이면 캐시된 평가 결과를 무시하고 다시 평가
+
+    Returns:
+        int: 새로 등록된 작업 수
+    """
+    queued_at = _now()
+    with transaction() as cursor:
+        cursor.executemany('''
+            INSERT OR IGNORE INTO evaluation_jobs (submission_id, admin_id, status, queued_at, force)
+            VALUES (?, ?, 'queued', ?, ?)
+        ''', [(submission_id, admin_id, queued_at, int(force)) for submission_id in submission_ids])
+        return cursor.rowcount
+
+
+def start_evaluation_job(admin_id, submission_id, worker_id, force=False):
+    """
+    평가 작업을 대기 상태를 거치지 않고 바로 점유한 상태로 등록
+
+    관리자 화면에서 한 제출물을 직접 평가하며 결과를 스트리밍할 때 사용합니다. 작업자
+    프로세스가 가져가지 않도록 worker_id가 임대한 상태로 등록합니다. 평가가 중단되면
+    fail_evaluation_jobs로 실패 처리하며, 앱 프로세스가 종료되어 실패 처리하지 못한 작업은
+    임대가 만료된 뒤 작업자가 다시 처리하거나 cancel_evaluation_jobs로 취소합니다.
+
+    Args:
+        admin_id (str): 평가를 요청한 관리자 ID
+        submission_id (int): 제출물 ID
+        worker_id (str): 작업을 점유할 식별자
+        force (bool): True이면 캐시된 평가 결과를 무시하고 다시 평가
+
+    Returns:
+        int: 작업 ID 또는 None (이미 대기 중이거나 진행 중인 작업이 있는 경우)
+    """
+    now = _now()
+    with transaction() as cursor:
+        cursor.execute('''
+            INSERT OR IGNORE INTO evaluation_jobs
+            (submission_id, admin_id, status, attempts, lease_owner, lease_expires_at, queued_at, started_at, force)
+            VALUES (?, ?, 'running', 1, ?, ?, ?, ?, ?)
+        ''', (submission_id, admin_id, worker_id, _lease_expiry(), now, now, int(force)))
+        return cursor.lastrowid if cursor.rowcount == 1 else None
+
+
+def delete_evaluation_jobs(cursor, submission_id):
+    """제출물 삭제 트랜잭션 안에서 평가 작업을 함께 삭제합니다."""
+    cursor.execute('DELETE FROM evaluation_jobs WHERE submission_id = ?', (submission_id,))
+
+
+def claim_evaluation_jobs(worker_id, limit):
+    """
+    대기 중인 작업과 임대 시간이 지난 작업을 점유
+
+    임대 시간이 지난 작업은 작업자가 중단된 것으로 보고 다시 시도하며, 이미
+    EVALUATION_JOB_MAX_ATTEMPTS번 시도한 작업은 실패로 처리합니다. 한 트랜잭션에서
+    상태를 바꾸므로 여러 작업자 프로세스가 같은 작업을 가져가지 않습니다.
+
+    Args:
+        worker_id (str): 작업자 식별자
+        limit (int): 가져올 최대 작업 수
+
+    Returns:
+        list: (job_id, submission_id, admin_id, file_path, attempts, force) 목록
+    """
+    now = _now()
+    with transaction() as cursor:
+        cursor.execute('''
+            UPDATE evaluation_jobs
+            SET status = 'failed', error = ?, lease_owner = NULL, lease_expires_at = NULL, finished_at = ?
+            WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?
+        ''', (LEASE_EXPIRED_MESSAGE, now, now, EVALUATION_JOB_MAX_ATTEMPTS))
+        cursor.execute('''
+            UPDATE evaluation_jobs
+            SET status = 'running', attempts = attempts + 1, lease_owner = ?, lease_expires_at = ?, started_at = ?
+            WHERE job_id IN (
+                SELECT job_id FROM evaluation_jobs WHERE status = 'queued'
+                UNION ALL
+                SELECT job_id FROM evaluation_jobs WHERE status = 'running' AND lease_expires_at < ?
+                ORDER BY job_id
+                LIMIT ?
+            )
+            RETURNING job_id
+        ''', (worker_id, _lease_expiry(), now, now, limit))
+        job_ids = [row[0] for row in cursor.fetchall()]
+        if not job_ids:
+            return []
+
+        placeholders = ', '.join('?' * len(job_ids))
+        cursor.execute(f'''
+            SELECT j.job_id, j.submission_id, j.admin_id, s.file_path, j.attempts, j.force
+            FROM evaluation_jobs j
+            LEFT JOIN submissions s ON j.submission_id = s.submission_id
+            WHERE j.job_id IN ({placeholders})
+            ORDER BY j.job_id
+        ''', job_ids)
+        return cursor.fetchall()
+
+
+def renew_evaluation_leases(worker_id, job_ids):
+    """작업자가 진행 중인 작업의 임대 시간을 연장합니다."""
+    if not job_ids:
+        return
+    with transaction() as cursor:
+        cursor.executemany('''
+            UPDATE evaluation_jobs SET lease_expires_at = ?
+            WHERE job_id = ? AND lease_owner = ? AND status = 'running'
+        ''', [(_lease_expiry(), job_id, worker_id) for job_id in job_ids])
+
+
+@contextmanager
+def renewing_lease(worker_id, job_id):
+    """
+    블록이 실행되는 동안 작업의 임대 시간을 주기적으로 연장하는 컨텍스트
+
+    관리자 화면에서 직접 평가하는 작업은 작업자 루프 밖에서 실행되므로, 분할 평가처럼
+    EVALUATION_LEASE_SECONDS보다 오래 걸리면 임대가 만료되어 작업자가 다시 가져가 중복
+    평가하게 됩니다. 작업자와 같은 간격(임대 시간의 1/3)으로 별도 스레드에서 임대를 연장합니다.
+
+    Args:
+        worker_id (str): 작업을 점유한 식별자
+        job_id (int): 작업 ID
+    """
+    stop = threading.Event()
+
+    def renew():
+        while not stop.wait(EVALUATION_LEASE_SECONDS / 3):
+            try:
+                renew_evaluation_leases(worker_id, [job_id])
+            except Exception as e:
+                logger.warning(f"평가 작업 임대 연장 실패: 작업 {job_id} - {str(e)}")
+
+    thread = threading.Thread(target=renew, name='evaluation-lease', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def release_evaluation_jobs(worker_id):
+    """작업자가 종료될 때 끝내지 못한 작업을 다시 대기 상태로 돌려놓습니다."""
+    with transaction() as cursor:
+        cursor.execute('''
+            UPDATE evaluation_jobs
+            SET status = 'queued', attempts = MAX(attempts - 1, 0), lease_owner = NULL, lease_expires_at = NULL
+            WHERE lease_owner = ? AND status = 'running'
+        ''', (worker_id,))
+        return cursor.rowcount
+
+
+def fail_evaluation_jobs(worker_id, error):
+    """
+    worker_id가 점유한 채 끝내지 못한 작업을 실패로 처리
+
+    관리자 화면에서 직접 평가하다 중단된 작업에 사용합니다. 대기열로 돌려놓으면 평가 작업자가
+    실행 중이지 않을 때 작업이 대기 상태로 남아 같은 제출물을 다시 평가할 수 없습니다.
+
+    Returns:
+        int: 실패 처리된 작업 수
+    """
+    with transaction() as cursor:
+        cursor.execute('''
+            UPDATE evaluation_jobs
+            SET status = 'failed', error = ?, lease_owner = NULL, lease_expires_at = NULL, finished_at = ?
+            WHERE lease_owner = ? AND status = 'running'
+        ''', (error, _now(), worker_id))
+        return cursor.rowcount
+
+
+def cancel_evaluation_jobs(admin_id, submission_ids=None):
+    """
+    관리자의 대기 중인 작업과 임대가 만료된 작업을 취소
+
+    평가 작업자가 실행 중이지 않으면 등록한 작업이 처리되지 않고 남아 같은 제출물을 다시
+    평가할 수 없으므로, 관리자 화면에서 취소할 수 있게 합니다. 작업자가 평가 중인 작업
+    (임대가 유효한 작업)은 취소하지 않습니다.
+
+    Args:
+        admin_id (str): 관리자 ID
+        submission_ids (list): 취소할 제출물 ID 목록 (None이면 관리자의 모든 작업)
+
+    Returns:
+        int: 취소된 작업 수
+    """
+    now = _now()
+    condition, params = '', []
+    if submission_ids is not None:
+        if not submission_ids:
+            return 0
+        condition = f"AND submission_id IN ({', '.join('?' * len(submission_ids))})"
+        params = list(submission_ids)
+    with transaction() as cursor:
+        cursor.execute(f'''
+            UPDATE evaluation_jobs
+            SET status = 'failed', error = ?, lease_owner = NULL, lease_expires_at = NULL, finished_at = ?
+            WHERE admin_id = ? {condition}
+            AND (status = 'queued' OR (status = 'running' AND lease_expires_at < ?))
+        ''', (CANCELLED_MESSAGE, now, admin_id, *params, now))
+        return cursor.rowcount
+
+
+def complete_evaluation_jobs(worker_id, results):
+    """
+    평가 결과를 evaluations 테이블에 저장하고 작업을 완료 처리
+
+    결과 여러 건을 한 트랜잭션에서 executemany로 한꺼번에 저장합니다. 임대 시간이 지나 다른
+    작업자가 가져간 작업의 결과는 저장하지 않으며, 기존 교수 평가(grade, comments)는 유지됩니다.
+
+    Args:
+        worker_id (str): 작업자 식별자
+        results (list): job_id, admin_id가 추가된 batch_evaluation.evaluate_one 결과 목록
+
+    Returns:
+        int: 저장된 결과 수
+    """
+    if not results:
+        return 0
+
+    finished_at = _now()
+    with transaction() as cursor:
+        # 아직 이 작업자가 점유한 작업만 골라냄 (쓰기 잠금을 먼저 잡으므로 확인 후 다른 작업자가 가져갈 수 없음)
+        placeholders = ', '.join('?' * len(results))
+        cursor.execute(f'''
+            UPDATE evaluation_jobs SET finished_at = ?
+            WHERE lease_owner = ? AND status = 'running' AND job_id IN ({placeholders})
+            RETURNING job_id
+        ''', (finished_at, worker_id, *(result['job_id'] for result in results)))
+        owned_job_ids = {row[0] for row in cursor.fetchall()}
+        owned = [result for result in results if result['job_id'] in owned_job_ids]
+
+        cursor.executemany('''
+            UPDATE evaluation_jobs
+            SET status = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL
+            WHERE job_id = ?
+        ''', [('done' if result['success'] else 'failed', result['error'], result['job_id']) for result in owned])
+
+        saved = [result for result in owned if result['success']]
+        cursor.executemany('''
+            INSERT INTO evaluations
+            (submission_id, admin_id, grade, comments, evaluation_time,
+            is_auto_evaluated, auto_grade, auto_comments, auto_evaluation_time, auto_evaluation_path)
+            VALUES (?, ?, NULL, NULL, ?, 1, ?, ?, ?, ?)
+            ON CONFLICT (submission_id, admin_id) DO UPDATE SET
+                is_auto_evaluated = 1,
+                auto_grade = excluded.auto_grade,
+                auto_comments = excluded.auto_comments,
+                auto_evaluation_time = excluded.auto_evaluation_time,
+                auto_evaluation_path = excluded.auto_evaluation_path
+        ''', [
+            (
+                result['submission_id'],
+                result['admin_id'],
+                finished_at,
+                result['grade'],
+                result['comments'],
+                finished_at,
+                result.get('path')
+            )
+            for result in saved
+        ])
+    return len(saved)
+
+
+def get_reference_file_paths():
+    """
+    평가에 사용할 최신 평가 기준과 모범 답안 파일 경로를 조회
+
+    Returns:
+        tuple: (평가 기준 경로 또는 None, 모범 답안 경로 또는 None)
+    """
+    cursor = get_connection().cursor()
+    paths = []
+    for file_type in ['평가기준', '모범답안']:
+        cursor.execute('''
+            SELECT file_path FROM professor_files
+            WHERE file_type = ?
+            ORDER BY upload_time DESC LIMIT 1
+        ''', (file_type,))
+        row = cursor.fetchone()
+        paths.append(row[0] if row else None)
+    return tuple(paths)
+
+
+@cached_query
+def get_evaluation_job_statuses(admin_id, submission_ids):
+    """
+    제출물별 가장 최근 평가 작업의 상태를 조회
+
+    Args:
+        admin_id (str): 관리자 ID
+        submission_ids (tuple): 제출물 ID 목록
+
+    Returns:
+        dict: submission_id -> (status, error, queued_at, finished_at)
+    """
+    if not submission_ids:
+        return {}
+
+    cursor = get_connection().cursor()
+    placeholders = ', '.join('?' * len(submission_ids))
+    cursor.execute(f'''
+        SELECT submission_id, status, error, queued_at, finished_at
+        FROM evaluation_jobs
+        WHERE admin_id = ? AND submission_id IN ({placeholders})
+        ORDER BY submission_id, job_id
+    ''', (admin_id, *submission_ids))
+    # 같은 제출물은 job_id 순서이므로 마지막 작업이 남음
+    return {row[0]: row[1:] for row in cursor.fetchall()}
+
+
+@cached_query
+def get_evaluation_job_counts(admin_id, queued_since):
+    """
+    queued_since 이후 등록된 관리자의 평가 작업 수를 상태별로 조회
+
+    Returns:
+        dict: status -> 작업 수
+    """
+    cursor = get_connection().cursor()
+    cursor.execute('''
+        SELECT status, COUNT(*) FROM evaluation_jobs
+        WHERE admin_id = ? AND queued_at >= ?
+        GROUP BY status
+    ''', (admin_id, queued_since))
+    return dict(cursor.fetchall())
+
+
+@cached_query
+def get_failed_evaluation_jobs(admin_id, queued_since):
+    """
+    queued_since 이후 실패한 관리자의 평가 작업을 조회
+
+    Returns:
+        list: (submission_id, student_id, name, original_filename, error) 목록
+    """
+    cursor = get_connection().cursor()
+    cursor.execute('''
+        SELECT j.submission_id, s.student_id, st.name, s.original_filename, j.error
+        FROM evaluation_jobs j
+        JOIN submissions s ON j.submission_id = s.submission_id
+        JOIN students st ON s.student_id = st.student_id
+        WHERE j.admin_id = ? AND j.status = 'failed' AND j.queued_at >= ?
+        ORDER BY j.queued_at, j.job_id
+    ''', (admin_id, queued_since))
+    return cursor.fetchall()
@@ -0,0 +1,141 @@
+"""
+자동 평가 작업자
+
+evaluation_jobs 테이블에서 작업을 임대로 점유해 Bedrock으로 평가하고 결과를 evaluations
+테이블에 저장합니다. Streamlit 앱은 작업을 등록하고 상태만 조회하므로, 브라우저 연결이
+끊기거나 앱이 재시작되어도 평가는 계속됩니다. 여러 작업자 프로세스를 동시에 실행할 수
+있으며, 중단된 작업자의 작업은 임대 시간이 지나면 다른 작업자가 다시 처리합니다.
+
+사용법:
+    python evaluation_worker.py [--once]
+
+    --once  대기 중인 작업을 모두 처리하면 종료합니다.
+"""
+import os
+import sys
+import time
+import signal
+import socket
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from bedrock_evaluator import PROMPT_CACHE_TTL_SECONDS, get_evaluator
+from batch_evaluation import EVALUATION_CONCURRENCY, MAX_EVALUATION_CONCURRENCY, evaluate_one
+from migrations import run_migrations
+from evaluation_jobs import (
+    EVALUATION_LEASE_SECONDS, claim_evaluation_jobs, renew_evaluation_leases,
+    release_evaluation_jobs, complete_evaluation_jobs, get_reference_file_paths
+)
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = float(os.environ.get('EVALUATION_POLL_INTERVAL_SECONDS', '2'))
+
+
+def _run_job(evaluator, job, criteria_path, model_answer_path):
+    """작업 하나를 평가하고 작업 정보가 포함된 결과를 반환합니다."""
+    job_id, submission_id, admin_id, file_path, _, force = job
+    if file_path is None:
+        result = {'submission_id': submission_id, 'success': False, 'grade': None, 'comments': None,
+                  'error': "제출물을 찾을 수 없습니다.", 'elapsed': 0.0}
+    elif criteria_path is None:
+        result = {'submission_id': submission_id, 'success': False, 'grade': None, 'comments': None,
+                  'error': "평가 기준 파일을 찾을 수 없습니다.", 'elapsed': 0.0}
+    else:
+        result = evaluate_one(evaluator, submission_id, file_path, criteria_path, model_answer_path, bool(force))
+    result.update(job_id=job_id, admin_id=admin_id)
+    return result
+
+
+def run_worker(concurrency=EVALUATION_CONCURRENCY, once=False, on_result=None):
+    """
+    평가 작업을 계속 가져와 처리
+
+    진행 중인 작업이 concurrency개보다 적으면 그만큼 새 작업을 점유하고, 끝난 작업의 결과를
+    저장합니다. 진행 중인 작업의 임대는 만료되기 전에 주기적으로 연장합니다. 모델이 프롬프트
+    캐시를 사용하고 평가 기준의 캐시가 비어 있으면 첫 작업이 끝날 때까지 다른 작업을 시작하지
+    않습니다.
+
+    Args:
+        concurrency (int): 동시에 평가할 최대 작업 수
+        once (bool): True이면 대기 중인 작업이 없을 때 종료
+        on_result (callable, optional): 결과를 저장한 작업마다 결과 딕셔너리로 호출 (부하 테스트 등)
+
+    Returns:
+        int: 처리한 작업 수
+    """
+    concurrency = max(1, min(concurrency, MAX_EVALUATION_CONCURRENCY))
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    evaluator = get_evaluator()
+    running = {}
+    processed = 0
+    warmed_paths, warmed_at = None, 0.0   # 마지막으로 프롬프트 캐시를 채운 (평가 기준, 모범 답안) 경로
+    last_renewal = time.monotonic()
+    logger.info(f"평가 작업자 시작: {worker_id} (동시 평가 {concurrency}개)")
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='evaluation-worker')
+    try:
+        while True:
+            if len(running) < concurrency:
+                reference_paths = get_reference_file_paths()
+                limit = concurrency - len(running)
+                # 평가 기준이 바뀌었거나 프롬프트 캐시가 만료되었으면 한 건을 먼저 평가해 캐시를
+                # 채운 뒤 동시에 평가 (동시에 보낸 첫 요청들은 서로의 캐시를 읽지 못함)
+                cache_cold = reference_paths != warmed_paths or time.monotonic() - warmed_at > PROMPT_CACHE_TTL_SECONDS
+                if evaluator.prompt_cache and cache_cold:
+                    limit = 0 if running else 1
+                jobs = claim_evaluation_jobs(worker_id, limit) if limit else []
+                for job in jobs:
+                    future = executor.submit(_run_job, evaluator, job, *reference_paths)
+                    running[future] = (job[0], reference_paths)
+
+            if not running:
+                if once:
+                    break
+                time.sleep(POLL_INTERVAL_SECONDS)
+                continue
+
+            done, _ = wait(running, timeout=POLL_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+            if done:
+                results = [future.result() for future in done]
+                for future, result in zip(done, results):
+                    _, job_reference_paths = running.pop(future)
+                    if result['success']:
+                        warmed_paths, warmed_at = job_reference_paths, time.monotonic()
+                complete_evaluation_jobs(worker_id, results)
+                processed += len(results)
+                for result in results:
+                    if not result['success']:
+                        logger.warning(f"자동 평가 실패: 작업 {result['job_id']} - {result['error']}")
+                    if on_result:
+                        on_result(result)
+
+            if running and time.monotonic() - last_renewal >= EVALUATION_LEASE_SECONDS / 3:
+                renew_evaluation_leases(worker_id, [job_id for job_id, _ in running.values()])
+                last_renewal = time.monotonic()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        released = release_evaluation_jobs(worker_id)
+        logger.info(f"평가 작업자 종료: {worker_id} (처리 {processed}건, 대기열로 반환 {released}건)")
+
+    return processed
+
+
+def _handle_sigterm(signum, frame):
+    raise KeyboardInterrupt()
+
+
+def main(argv):
+    """마이그레이션을 확인하고 평가 작업자를 실행합니다."""
+    run_migrations()
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+    try:
+        run_worker(once='--once' in argv)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
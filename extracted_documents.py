@@ -0,0 +1,254 @@
+import queue
+import logging
+import threading
+from datetime import datetime
+from database import get_connection, transaction, cached_query
+from text_extraction import EXTRACTOR_VERSION
+from batch_extraction import extract_batch
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+EXTRACTION_PENDING_MESSAGE = "파일 텍스트를 추출하는 중입니다. 잠시 후 다시 시도해주세요."
+EXTRACTION_BATCH_SIZE = 64      # 작업자가 한 번에 꺼내 병렬 추출할 최대 파일 수
+
+_extraction_queue = queue.Queue()
+_worker_started = False
+_worker_lock = threading.Lock()
+
+
+def enqueue_extraction(file_path):
+    """
+    업로드된 파일의 텍스트 추출 작업을 등록
+
+    추출 결과 행을 대기 상태로 만들고 백그라운드 작업자에게 전달합니다. 실제 추출은
+    작업자 스레드에서 실행되므로 호출한 요청은 파일 파싱을 기다리지 않습니다.
+
+    Args:
+        file_path (str): 추출할 파일 경로
+    """
+    queued_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    with transaction() as cursor:
+        cursor.execute('''
+            INSERT INTO extracted_documents (file_path, status, queued_at)
+            VALUES (?, 'pending', ?)
+            ON CONFLICT (file_path) DO UPDATE SET
+                status = 'pending',
+                content = NULL,
+                page_count = NULL,
+                char_count = NULL,
+                error = NULL,
+                queued_at = excluded.queued_at,
+                extracted_at = NULL
+        ''', (file_path, queued_at))
+    _extraction_queue.put(file_path)
+
+
+def delete_extracted_document(cursor, file_path):
+    """파일 삭제 트랜잭션 안에서 추출 결과를 함께 삭제합니다."""
+    cursor.execute('DELETE FROM extracted_documents WHERE file_path = ?', (file_path,))
+
+
+def _store_extractions(results):
+    """
+    추출 결과를 저장하고, 제출물 파일이면 검색 색인 내용도 갱신합니다.
+
+    추출 중에 같은 경로로 파일이 다시 업로드되어 대기 상태로 돌아갔으면 이전 파일의
+    결과이므로 저장하지 않습니다.
+    """
+    extracted_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    with transaction() as cursor:
+        for result in results:
+            cursor.execute('''
+                UPDATE extracted_documents
+                SET status = ?, content = ?, page_count = ?, char_count = ?,
+                    error = ?, extractor_version = ?, extracted_at = ?
+                WHERE file_path = ? AND status = 'running'
+            ''', (
+                'done' if result['success'] else 'failed',
+                result['content'],
+                result['page_count'],
+                result['char_count'],
+                result['error'],
+                EXTRACTOR_VERSION,
+                extracted_at,
+                result['file_path']
+            ))
+            if result['success'] and cursor.rowcount == 1:
+                cursor.execute('''
+                    UPDATE submission_search SET content = ?
+                    WHERE rowid IN (SELECT submission_id FROM submissions WHERE file_path = ?)
+                ''', (result['content'], result['file_path']))
+
+
+def process_extractions(file_paths):
+    """
+    대기 중인 추출 작업을 실행
+
+    파일이 하나여도 프로세스 풀에서 파일당 시간 제한을 두고 추출하고, 여러 파일이면 병렬로
+    추출합니다.
+
+    Args:
+        file_paths (list): 추출할 파일 경로 목록
+
+    Returns:
+        list: 실행한 작업의 결과 딕셔너리 목록 (이미 처리되었거나 삭제된 작업은 제외)
+    """
+    # 대기 상태인 작업만 실행 상태로 바꿔 같은 파일을 두 번 추출하지 않음
+    claimed = []
+    with transaction() as cursor:
+        for file_path in dict.fromkeys(file_paths):
+            cursor.execute('''
+                UPDATE extracted_documents SET status = 'running'
+                WHERE file_path = ? AND status = 'pending'
+            ''', (file_path,))
+            if cursor.rowcount == 1:
+                claimed.append(file_path)
+    if not claimed:
+        return []
+
+    results = extract_batch(claimed)
+    _store_extractions(results)
+    for result in results:
+        if not result['success']:
+            logger.warning(f"텍스트 추출 실패: {result['file_path']} - {result['error']}")
+    return results
+
+
+def _worker_loop():
+    """추출 작업 큐를 순서대로 처리합니다."""
+    while True:
+        # 대기 중인 작업을 모아 한 번에 병렬 추출 (업로드 한 건이면 바로 추출)
+        file_paths = [_extraction_queue.get()]
+        while len(file_paths) < EXTRACTION_BATCH_SIZE:
+            try:
+                file_paths.append(_extraction_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        try:
+            process_extractions(file_paths)
+        except Exception as e:
+            logger.error(f"텍스트 추출 작업 오류: {len(file_paths)}개 파일 - {str(e)}")
+        finally:
+            for _ in file_paths:
+                _extraction_queue.task_done()
+
+
+def _requeue_outstanding():
+    """
+    이전 프로세스에서 끝나지 않은 작업, 추출 결과가 없는 파일, 이전 버전 추출기로 추출한
+    파일을 다시 대기열에 넣습니다.
+    """
+    queued_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    with transaction() as cursor:
+        cursor.execute("UPDATE extracted_documents SET status = 'pending' WHERE status = 'running'")
+        cursor.execute('''
+            UPDATE extracted_documents SET status = 'pending', queued_at = ?
+            WHERE status IN ('done', 'failed')
+              AND (extractor_version IS NULL OR extractor_version < ?)
+        ''', (queued_at, EXTRACTOR_VERSION))
+        for table in ['submissions', 'professor_files']:
+            cursor.execute(f'''
+                INSERT OR IGNORE INTO extracted_documents (file_path, status, queued_at)
+                SELECT file_path, 'pending', ? FROM {table}
+            ''', (queued_at,))
+
+    cursor = get_connection().cursor()
+    cursor.execute('''
+        SELECT file_path FROM extracted_documents
+        WHERE status = 'pending'
+        ORDER BY queued_at
+    ''')
+    outstanding = [row[0] for row in cursor.fetchall()]
+    for file_path in outstanding:
+        _extraction_queue.put(file_path)
+    return len(outstanding)
+
+
+def start_extraction_worker():
+    """
+    프로세스당 한 번 텍스트 추출 작업자 스레드를 시작
+
+    Returns:
+        bool: 이번 호출에서 작업자를 시작했는지 여부
+    """
+    global _worker_started
+    with _worker_lock:
+        if _worker_started:
+            return False
+        _worker_started = True
+
+    outstanding = _requeue_outstanding()
+    thread = threading.Thread(target=_worker_loop, name='text-extraction', daemon=True)
+    thread.start()
+    logger.info(f"텍스트 추출 작업자 시작: 대기 중인 작업 {outstanding}건")
+    return True
+
+
+@cached_query
+def get_extracted_document(file_path):
+    """
+    파일의 추출 결과를 조회
+
+    Args:
+        file_path (str): 파일 경로
+
+    Returns:
+        tuple: (status, content, page_count, char_count, error, extracted_at) 또는 None
+    """
+    cursor = get_connection().cursor()
+    cursor.execute('''
+        SELECT status, content, page_count, char_count, error, extracted_at
+        FROM extracted_documents
+        WHERE file_path = ?
+    ''', (file_path,))
+    return cursor.fetchone()
+
+
+def _extract_now(file_path):
+    """
+    추출 작업자를 기다리지 않고 파일 하나를 바로 추출
+
+    백그라운드 작업자와 같이 process_extractions로 프로세스 풀에서 시간 제한을 두고 추출하고
+    결과를 저장하므로, 같은 파일을 다시 추출하지 않습니다. 다른 스레드가 이미 추출 중이면
+    결과를 저장하지 않고 같은 방식으로 추출만 합니다.
+    """
+    queued_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    with transaction() as cursor:
+        cursor.execute('''
+            INSERT OR IGNORE INTO extracted_documents (file_path, status, queued_at)
+            VALUES (?, 'pending', ?)
+        ''', (file_path, queued_at))
+
+    results = process_extractions([file_path]) or extract_batch([file_path])
+    result = results[0]
+    return (True, result['content']) if result['success'] else (False, result['error'])
+
+
+def get_document_text(file_path, extract_if_missing=False):
+    """
+    미리 추출된 파일 텍스트를 반환
+
+    Args:
+        file_path (str): 파일 경로
+        extract_if_missing (bool): 아직 추출되지 않았으면 직접 추출할지 여부 (프로세스 풀에서
+            EXTRACTION_TIMEOUT_SECONDS 제한으로 추출하고 결과를 저장). False이면 대기 중 안내
+            메시지를 반환합니다.
+
+    Returns:
+        tuple: (성공 여부, 파일 내용 또는 오류 메시지)
+    """
+    document = get_extracted_document(file_path)
+    if document is not None:
+        status, content, _, _, error, _ = document
+        # 추출기 버전이 바뀌어 다시 추출하는 동안에는 이전 결과를 그대로 사용
+        if status == 'done' or content is not None:
+            return True, content
+        if status == 'failed':
+            return False, error
+
+    if extract_if_missing:
+        return _extract_now(file_path)
+    return False, EXTRACTION_PENDING_MESSAGE
@@ -0,0 +1,151 @@
+import os
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 캐시 설정 (환경 변수로 변경 가능)
+CACHE_DIR = os.environ.get('EXTRACTION_CACHE_DIR', os.path.join('cache', 'extracted_text'))
+CACHE_MAX_BYTES = int(os.environ.get('EXTRACTION_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_evict_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _file_sha256(abs_path, mtime_ns, size):
+    """파일 내용의 SHA-256을 계산합니다. (경로, 수정시간, 크기)가 같으면 다시 읽지 않습니다."""
+    digest = hashlib.sha256()
+    with open(abs_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_sha256(file_path):
+    """
+    파일 내용의 SHA-256 해시를 반환
+
+    Args:
+        file_path (str): 파일 경로
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    stat = os.stat(file_path)
+    return _file_sha256(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _cache_path(content_hash, extractor_version):
+    """해시와 추출기 버전에 해당하는 캐시 파일 경로를 반환합니다."""
+    return os.path.join(CACHE_DIR, content_hash[:2], f"{content_hash}-v{extractor_version}.txt")
+
+
+def get_cached_text(content_hash, extractor_version):
+    """
+    캐시된 추출 텍스트를 조회
+
+    Args:
+        content_hash (str): 파일 내용 해시
+        extractor_version (int): 추출기 버전
+
+    Returns:
+        str: 캐시된 텍스트 (없으면 None)
+    """
+    path = _cache_path(content_hash, extractor_version)
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            text = file.read()
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+
+    # 최근 사용 시간 갱신 (LRU 삭제 기준)
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return text
+
+
+def store_text(content_hash, extractor_version, text):
+    """
+    추출 텍스트를 캐시에 저장하고 용량을 넘으면 오래 사용하지 않은 항목부터 삭제
+
+    Args:
+        content_hash (str): 파일 내용 해시
+        extractor_version (int): 추출기 버전
+        text (str): 추출된 텍스트
+    """
+    path = _cache_path(content_hash, extractor_version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        file.write(text)
+    os.replace(temp_path, path)
+    _evict_if_needed()
+
+
+def _evict_if_needed():
+    """캐시 용량이 CACHE_MAX_BYTES를 넘으면 마지막 사용 시간이 오래된 파일부터 삭제합니다."""
+    with _evict_lock:
+        entries = []
+        total_size = 0
+        for root, _, files in os.walk(CACHE_DIR):
+            for name in files:
+                if not name.endswith('.txt'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        if total_size <= CACHE_MAX_BYTES:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+            except FileNotFoundError:
+                pass
+        logger.info(f"추출 텍스트 캐시 정리 완료: {total_size} bytes")
+
+
+def cached_extract(file_path, extract, extractor_version):
+    """
+    파일 내용 해시 기준으로 캐시를 확인하고, 없으면 추출 후 저장
+
+    Args:
+        file_path (str): 파일 경로
+        extract (callable): file_path를 받아 (성공 여부, 텍스트 또는 오류 메시지)를 반환하는 함수
+        extractor_version (int): 추출기 버전 (추출 로직이 바뀌면 올려서 기존 캐시를 무효화)
+
+    Returns:
+        tuple: (성공 여부, 텍스트 또는 오류 메시지)
+    """
+    try:
+        content_hash = file_sha256(file_path)
+    except OSError:
+        return extract(file_path)
+
+    text = get_cached_text(content_hash, extractor_version)
+    if text is not None:
+        return True, text
+
+    success, content = extract(file_path)
+    if success:
+        try:
+            store_text(content_hash, extractor_version, content)
+        except OSError as e:
+            logger.warning(f"추출 텍스트 캐시 저장 실패: {str(e)}")
+    return success, content
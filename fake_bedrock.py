@@ -0,0 +1,217 @@
+"""
+로컬 가짜 Bedrock 백엔드
+
+AWS 없이 자동 평가 파이프라인을 시험하고 부하를 측정하기 위한 bedrock-runtime 호환
+클라이언트입니다. BedrockEvaluator가 사용하는 invoke_model과
+invoke_model_with_response_stream을 같은 요청/응답 형식으로 제공하며, BEDROCK_BACKEND=fake로
+실행하면 get_bedrock_client가 이 클라이언트를 반환하므로 앱, 평가 작업자, 일괄 평가가 코드
+변경 없이 사용합니다.
+
+응답 지연은 첫 토큰까지의 지연(로그 정규 분포)과 초당 출력 토큰 수로 흉내 내고, 스로틀링,
+잘못된 JSON 응답, 토큰 사용량(프롬프트 캐시 기록/읽기 포함)을 설정값에 따라 만들어 냅니다.
+스로틀링은 botocore처럼 지수 백오프로 재시도하고, 최대 시도 횟수를 넘으면 ThrottlingException을
+발생시킵니다.
+"""
+import io
+import os
+import json
+import math
+import time
+import random
+import hashlib
+import threading
+from collections import Counter
+from botocore.exceptions import ClientError
+from token_budget import estimate_tokens
+
+# 가짜 백엔드 설정 (환경 변수로 변경 가능)
+FAKE_LATENCY_MS = float(os.environ.get('FAKE_BEDROCK_LATENCY_MS', '1500'))           # 첫 토큰까지 지연 중앙값 (밀리초)
+FAKE_LATENCY_SIGMA = float(os.environ.get('FAKE_BEDROCK_LATENCY_SIGMA', '0.4'))      # 지연 분포(로그 정규)의 폭, 클수록 꼬리가 김
+FAKE_TOKENS_PER_SECOND = float(os.environ.get('FAKE_BEDROCK_TOKENS_PER_SECOND', '80'))  # 출력 토큰 생성 속도
+FAKE_THROTTLE_RATE = float(os.environ.get('FAKE_BEDROCK_THROTTLE_RATE', '0'))        # 호출 시도가 스로틀링될 확률
+FAKE_MAX_IN_FLIGHT = int(os.environ.get('FAKE_BEDROCK_MAX_IN_FLIGHT', '0'))          # 동시 호출 한도 (넘으면 스로틀링, 0이면 제한 없음)
+FAKE_MALFORMED_RATE = float(os.environ.get('FAKE_BEDROCK_MALFORMED_RATE', '0'))      # 잘못된 JSON을 응답할 확률
+FAKE_BACKOFF_SCALE = float(os.environ.get('FAKE_BEDROCK_BACKOFF_SCALE', '1'))        # 재시도 대기 시간 배율 (0이면 대기하지 않음)
+FAKE_SEED = os.environ.get('FAKE_BEDROCK_SEED')                                      # 난수 시드 (지정하면 결과 재현 가능)
+
+RETRY_MAX_BACKOFF = 20          # botocore 재시도 대기 시간 상한 (초)
+PROMPT_CACHE_TTL_SECONDS = 300  # 프롬프트 캐시 유지 시간
+STREAM_CHUNK_CHARS = 8          # 스트리밍 응답 조각 하나의 글자 수
+GRADES = ['A', 'B', 'B', 'C', 'C', 'C', 'D', 'F']
+
+
+class FakeBedrockClient:
+    """invoke_model, invoke_model_with_response_stream을 흉내 내는 가짜 bedrock-runtime 클라이언트"""
+
+    # BedrockEvaluator는 이 클라이언트의 응답을 평가 결과 캐시에 저장하지 않음
+    is_fake = True
+
+    def __init__(self, latency_ms=FAKE_LATENCY_MS, latency_sigma=FAKE_LATENCY_SIGMA,
+                 tokens_per_second=FAKE_TOKENS_PER_SECOND, throttle_rate=FAKE_THROTTLE_RATE,
+                 max_in_flight=FAKE_MAX_IN_FLIGHT, malformed_rate=FAKE_MALFORMED_RATE,
+                 max_attempts=8, backoff_scale=FAKE_BACKOFF_SCALE, seed=FAKE_SEED):
+        """
+        FakeBedrockClient 초기화
+
+        Args:
+            latency_ms (float): 첫 토큰까지 지연 중앙값 (밀리초)
+            latency_sigma (float): 지연 분포(로그 정규)의 폭
+            tokens_per_second (float): 출력 토큰 생성 속도
+            throttle_rate (float): 호출 시도가 스로틀링될 확률
+            max_in_flight (int): 동시 호출 한도 (0이면 제한 없음)
+            malformed_rate (float): 잘못된 JSON을 응답할 확률
+            max_attempts (int): 스로틀링 시 첫 호출을 포함한 최대 시도 횟수
+            backoff_scale (float): 재시도 대기 시간 배율
+            seed (optional): 난수 시드
+        """
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.throttle_rate = throttle_rate
+        self.max_in_flight = max_in_flight
+        self.malformed_rate = malformed_rate
+        self.max_attempts = max_attempts
+        self.backoff_scale = backoff_scale
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._prompt_cache = {}
+        # 부하 테스트에서 확인할 누적 통계
+        self.stats = Counter()
+
+    def invoke_model(self, modelId, body, **kwargs):
+        """응답 전체를 한 번에 반환합니다."""
+        reply, usage, first_token_delay = self._start_call(body)
+        try:
+            time.sleep(first_token_delay + usage['output_tokens'] / self.tokens_per_second)
+        finally:
+            self._finish_call()
+
+        response_body = {
+            "type": "message",
+            "role": "assistant",
+            "model": modelId,
+            "content": [{"type": "text", "text": reply}],
+            "stop_reason": "end_turn",
+            "usage": usage,
+        }
+        return {'body': io.BytesIO(json.dumps(response_body).encode('utf-8')), 'contentType': 'application/json'}
+
+    def invoke_model_with_response_stream(self, modelId, body, **kwargs):
+        """응답을 Bedrock 스트리밍 이벤트 형식으로 조금씩 반환합니다."""
+        reply, usage, first_token_delay = self._start_call(body)
+        return {'body': self._stream_events(reply, usage, first_token_delay), 'contentType': 'application/json'}
+
+    def _stream_events(self, reply, usage, first_token_delay):
+        """스트리밍 이벤트를 생성하는 제너레이터 (끝까지 읽거나 닫을 때 호출이 끝난 것으로 처리)"""
+        def event(data):
+            return {'chunk': {'bytes': json.dumps(data).encode('utf-8')}}
+
+        try:
+            time.sleep(first_token_delay)
+            yield event({
+                "type": "message_start",
+                "message": {"role": "assistant", "usage": dict(usage, output_tokens=1)}
+            })
+            yield event({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+            for start in range(0, len(reply), STREAM_CHUNK_CHARS):
+                piece = reply[start:start + STREAM_CHUNK_CHARS]
+                time.sleep(estimate_tokens(piece) / self.tokens_per_second)
+                yield event({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": piece}})
+            yield event({"type": "content_block_stop", "index": 0})
+            yield event({
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn"},
+                "usage": {"output_tokens": usage['output_tokens']}
+            })
+            yield event({"type": "message_stop"})
+        finally:
+            self._finish_call()
+
+    def _start_call(self, body):
+        """
+        스로틀링을 흉내 내며 호출을 시작하고 응답 내용을 정함
+
+        Returns:
+            tuple: (응답 텍스트, 토큰 사용량, 첫 토큰까지 지연 초)
+
+        Raises:
+            ClientError: 최대 시도 횟수까지 스로틀링된 경우 (ThrottlingException)
+        """
+        request = json.loads(body)
+        for attempt in range(1, self.max_attempts + 1):
+            with self._lock:
+                throttled = (
+                    (self.max_in_flight and self._in_flight >= self.max_in_flight)
+                    or self._random.random() < self.throttle_rate
+                )
+                if throttled:
+                    self.stats['throttled_attempts'] += 1
+                else:
+                    self._in_flight += 1
+                    self.stats['requests'] += 1
+                    backoff = 0
+                    break
+                backoff = self._random.random() * min(RETRY_MAX_BACKOFF, 2 ** attempt) * self.backoff_scale
+            if attempt == self.max_attempts:
+                self.stats['throttled_requests'] += 1
+                raise ClientError(
+                    {'Error': {'Code': 'ThrottlingException', 'Message': 'Too many requests, please wait before trying again.'}},
+                    'InvokeModel'
+                )
+            time.sleep(backoff)
+
+        with self._lock:
+            usage = self._usage(request)
+            reply = self._reply(request)
+            usage['output_tokens'] = estimate_tokens(reply)
+            for name, tokens in usage.items():
+                self.stats[name] += tokens
+            first_token_delay = self._random.lognormvariate(math.log(self.latency_ms / 1000), self.latency_sigma)
+        return reply, usage, first_token_delay
+
+    def _finish_call(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _usage(self, request):
+        """요청의 입력 토큰 사용량을 계산합니다. cache_control이 있는 system 블록은 프롬프트 캐시를 흉내 냅니다."""
+        usage = {"input_tokens": 0, "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
+        now = time.monotonic()
+        for block in request.get('system', []):
+            tokens = estimate_tokens(block['text'])
+            if not block.get('cache_control'):
+                usage['input_tokens'] += tokens
+                continue
+            key = hashlib.sha256(block['text'].encode('utf-8')).hexdigest()
+            if self._prompt_cache.get(key, 0) > now:
+                usage['cache_read_input_tokens'] += tokens
+            else:
+                usage['cache_creation_input_tokens'] += tokens
+            self._prompt_cache[key] = now + PROMPT_CACHE_TTL_SECONDS
+
+        for message in request.get('messages', []):
+            for block in message['content']:
+                usage['input_tokens'] += estimate_tokens(block.get('text', ''))
+        return usage
+
+    def _reply(self, request):
+        """평가 결과 JSON 또는 (malformed_rate 확률로) 잘못된 응답을 만듭니다."""
+        submission_tokens = sum(
+            estimate_tokens(block.get('text', '')) for message in request.get('messages', []) for block in message['content']
+        )
+        reply = json.dumps({
+            "grade": self._random.choice(GRADES),
+            "comments": f"가짜 백엔드의 평가 결과입니다. 제출물 약 {submission_tokens}토큰을 평가 기준에 따라 검토했습니다. "
+                        "논리적 구성은 적절하지만 결론의 근거를 보강하면 좋겠습니다."
+        }, ensure_ascii=False)
+
+        if self._random.random() >= self.malformed_rate:
+            return reply
+        self.stats['malformed_replies'] += 1
+        return self._random.choice([
+            reply[:len(reply) // 2],                                    # 출력 한도에 걸려 잘린 JSON
+            "평가 결과를 JSON으로 작성하지 못했습니다.",                  # JSON이 없는 설명문
+            reply.replace('"grade": "', '"grade": "E', 1),              # 유효하지 않은 등급
+        ])
@@ -0,0 +1,204 @@
+"""
+자동 평가 부하 테스트
+
+가짜 Bedrock 백엔드(fake_bedrock.py)로 채점 파이프라인을 실행해 동시 평가 수별 처리량
+(제출물/초), 지연 시간 p50/p95/p99, 오류율을 측정합니다. 임시 데이터베이스와 샘플 제출물을
+만들어 사용하므로 AWS 자격 증명이나 기존 데이터 없이 실행할 수 있습니다. 가짜 백엔드의 지연,
+스로틀링, 동시 호출 한도, 잘못된 JSON 비율은 FAKE_BEDROCK_* 환경 변수로 조절합니다.
+
+    batch        제출물마다 평가 작업을 등록하고 evaluation_worker.run_worker(once=True)로 처리 (평가 작업자와 같은 경로)
+    interactive  제출물마다 app.auto_evaluate_submission을 스레드에서 호출 (스트리밍, 첫 응답 시간 포함)
+
+사용법:
+    python load_test_evaluation.py [batch|interactive] [제출물 수] [동시 평가 수 목록]
+    FAKE_BEDROCK_MAX_IN_FLIGHT=10 FAKE_BEDROCK_THROTTLE_RATE=0.02 python load_test_evaluation.py batch 100 4,8,16
+"""
+import os
+import sys
+import math
+import time
+import shutil
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MODE = 'batch'
+DEFAULT_SUBMISSIONS = 40
+DEFAULT_CONCURRENCY_LEVELS = [1, 4, 8, 16]
+ADMIN_ID = 'load-test'
+SAMPLE_PARAGRAPH = "학생 보고서 본문입니다. 문제를 정의하고 풀이 과정을 단계별로 설명한 뒤 결론을 제시합니다.\n\n"
+
+
+def _percentile(values, percent):
+    """가장 가까운 순위(nearest-rank) 방식의 백분위수를 반환합니다."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def _classify_error(error):
+    """평가 오류 메시지를 원인별로 분류합니다."""
+    if 'ThrottlingException' in error:
+        return '스로틀링'
+    if '결과를 처리하는 중' in error:
+        return '잘못된 응답'
+    return '기타'
+
+
+def _create_sample_data(temp_dir, submission_count):
+    """학생, 제출물, 평가 기준을 임시 데이터베이스에 만들고 제출물 ID 목록을 반환합니다."""
+    from database import transaction
+
+    criteria_path = os.path.join(temp_dir, 'criteria.txt')
+    with open(criteria_path, 'w', encoding='utf-8') as criteria_file:
+        criteria_file.write("1. 문제 정의가 명확한가 (30점)\n2. 풀이 과정이 논리적인가 (40점)\n3. 결론이 타당한가 (30점)\n")
+
+    now = time.strftime('%Y-%m-%d %H:%M:%S')
+    submission_ids = []
+    with transaction() as cursor:
+        cursor.execute(
+            'INSERT INTO professor_files (admin_id, file_type, file_path, original_filename, upload_time) VALUES (?, ?, ?, ?, ?)',
+            (ADMIN_ID, '평가기준', criteria_path, 'criteria.txt', now)
+        )
+        for i in range(submission_count):
+            student_id = f"load{i:05d}"
+            path = os.path.join(temp_dir, f"{student_id}.txt")
+            with open(path, 'w', encoding='utf-8') as submission_file:
+                # 제출물 길이를 다양하게 (문단 5~60개)
+                submission_file.write(f"{i}번 학생\n\n" + SAMPLE_PARAGRAPH * (5 + i * 7 % 56))
+            cursor.execute(
+                'INSERT INTO students (student_id, password, name, email) VALUES (?, ?, ?, ?)',
+                (student_id, '-', f"부하테스트{i}", f"{student_id}@example.com")
+            )
+            cursor.execute(
+                'INSERT INTO submissions (student_id, file_path, original_filename, submission_time) VALUES (?, ?, ?, ?)',
+                (student_id, path, f"{student_id}.txt", now)
+            )
+            submission_ids.append((cursor.lastrowid, path))
+    return criteria_path, submission_ids
+
+
+def _run_batch(submissions, criteria_path, concurrency):
+    """
+    일괄 평가 경로로 평가하고 (지연 시간 목록, 오류 목록, 첫 응답 시간 목록)을 반환합니다.
+
+    '미평가 전체 자동 평가' 버튼처럼 작업을 등록한 뒤 평가 작업자 루프를 대기열이 빌 때까지
+    실행하므로, 작업 점유, 임대 연장, 결과 일괄 저장까지 포함해 측정합니다.
+    """
+    from evaluation_jobs import enqueue_evaluations
+    from evaluation_worker import run_worker
+
+    latencies, errors = [], []
+
+    def record(result):
+        latencies.append(result['elapsed'])
+        if not result['success']:
+            errors.append(result['error'])
+
+    enqueue_evaluations(ADMIN_ID, [submission_id for submission_id, _ in submissions], force=True)
+    run_worker(concurrency, once=True, on_result=record)
+    return latencies, errors, []
+
+
+def _run_interactive(submissions, criteria_path, concurrency):
+    """관리자 화면의 제출물별 평가 경로로 평가하고 (지연 시간 목록, 오류 목록, 첫 응답 시간 목록)을 반환합니다."""
+    from app import auto_evaluate_submission
+
+    lock = threading.Lock()
+    latencies, errors, first_text_times = [], [], []
+
+    def evaluate(submission_id):
+        started = time.perf_counter()
+        first_text = []
+
+        def on_text(text):
+            if not first_text:
+                first_text.append(time.perf_counter() - started)
+
+        success, message = auto_evaluate_submission(submission_id, ADMIN_ID, True, on_text)
+        with lock:
+            latencies.append(time.perf_counter() - started)
+            first_text_times.extend(first_text)
+            if not success:
+                errors.append(message)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='load-test') as executor:
+        list(executor.map(evaluate, [submission_id for submission_id, _ in submissions]))
+    return latencies, errors, first_text_times
+
+
+def main(argv):
+    """임시 데이터로 동시 평가 수별 부하 테스트를 실행하고 결과를 출력합니다."""
+    mode = argv[0] if argv else DEFAULT_MODE
+    if mode not in ('batch', 'interactive'):
+        print(__doc__)
+        return 1
+    submission_count = int(argv[1]) if len(argv) > 1 else DEFAULT_SUBMISSIONS
+    levels = [int(level) for level in argv[2].split(',')] if len(argv) > 2 else DEFAULT_CONCURRENCY_LEVELS
+
+    # 저장소 모듈은 설정을 가져올 때 읽으므로 환경 변수를 먼저 지정
+    temp_dir = tempfile.mkdtemp(prefix='load_test_')
+    os.environ['DATABASE_PATH'] = os.path.join(temp_dir, 'load_test.db')
+    os.environ['EXTRACTION_CACHE_DIR'] = os.path.join(temp_dir, 'cache')
+    os.environ['BEDROCK_BACKEND'] = 'fake'
+    try:
+        from migrations import run_migrations
+        from bedrock_evaluator import get_bedrock_client
+        from evaluation_worker import MAX_EVALUATION_CONCURRENCY
+
+        from extracted_documents import enqueue_extraction, process_extractions
+
+        run_migrations()
+        criteria_path, submissions = _create_sample_data(temp_dir, submission_count)
+        # 업로드할 때처럼 텍스트를 미리 추출해 두어 첫 동시 평가 수에 추출 시간이 섞이지 않게 함
+        file_paths = [criteria_path] + [path for _, path in submissions]
+        for file_path in file_paths:
+            enqueue_extraction(file_path)
+        process_extractions(file_paths)
+        fake_client = get_bedrock_client()
+        run = _run_batch if mode == 'batch' else _run_interactive
+        print(
+            f"부하 테스트: {mode}, 제출물 {submission_count}건, 가짜 백엔드 "
+            f"(첫 토큰 지연 중앙값 {fake_client.latency_ms:.0f}ms, 스로틀링 확률 {fake_client.throttle_rate:.0%}, "
+            f"동시 호출 한도 {fake_client.max_in_flight or '없음'}, 잘못된 응답 {fake_client.malformed_rate:.0%})"
+        )
+        # 평가마다 남는 INFO/오류 로그 대신 요약만 출력
+        logging.disable(logging.ERROR)
+        for concurrency in levels:
+            if mode == 'batch' and concurrency > MAX_EVALUATION_CONCURRENCY:
+                print(f"동시 평가 {concurrency}: 평가 작업자는 최대 {MAX_EVALUATION_CONCURRENCY}개까지 동시 평가하므로 건너뜁니다.")
+                continue
+
+            throttled_before = fake_client.stats['throttled_attempts']
+            started = time.perf_counter()
+            latencies, errors, first_text_times = run(submissions, criteria_path, concurrency)
+            elapsed = time.perf_counter() - started
+
+            error_counts = {}
+            for error in errors:
+                reason = _classify_error(error)
+                error_counts[reason] = error_counts.get(reason, 0) + 1
+            error_summary = ", ".join(f"{reason} {count}건" for reason, count in error_counts.items())
+            line = (
+                f"동시 평가 {concurrency:3d}: {len(latencies) / elapsed:6.2f}건/초  "
+                f"지연 p50 {_percentile(latencies, 50):.2f}초 p95 {_percentile(latencies, 95):.2f}초 "
+                f"p99 {_percentile(latencies, 99):.2f}초  "
+                f"오류율 {len(errors) / len(latencies):.1%}{f' ({error_summary})' if errors else ''}  "
+                f"스로틀링 재시도 {fake_client.stats['throttled_attempts'] - throttled_before}회"
+            )
+            if first_text_times:
+                line += f"  첫 응답 p50 {_percentile(first_text_times, 50):.2f}초 p95 {_percentile(first_text_times, 95):.2f}초"
+            print(line)
+
+        print(
+            f"토큰 사용량: 입력 {fake_client.stats['input_tokens']}, 캐시 기록 {fake_client.stats['cache_creation_input_tokens']}, "
+            f"캐시 읽기 {fake_client.stats['cache_read_input_tokens']}, 출력 {fake_client.stats['output_tokens']}"
+        )
+    finally:
+        logging.disable(logging.NOTSET)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,628 @@
+import hashlib
+import logging
+from datetime import datetime
+from database import get_connection, invalidate_query_cache
+from backup import create_backup
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def _column_names(cursor, table):
+    """테이블의 열 이름 목록을 반환합니다."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [col[1] for col in cursor.fetchall()]
+
+
+def _migration_001_base_tables(cursor):
+    """기본 테이블 생성"""
+    # students 테이블 생성
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS students (
+            student_id TEXT PRIMARY KEY,
+            password TEXT NOT NULL,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL
+        )
+    ''')
+
+    # professors 테이블 생성
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS professors (
+            admin_id TEXT PRIMARY KEY,
+            password TEXT NOT NULL,
+            name TEXT NOT NULL
+        )
+    ''')
+
+    # submissions 테이블 생성
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS submissions (
+            submission_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            original_filename TEXT NOT NULL,
+            submission_time DATETIME NOT NULL,
+            FOREIGN KEY (student_id) REFERENCES students (student_id)
+        )
+    ''')
+
+    # professor_files 테이블 생성 (평가기준, 모범답안 등)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS professor_files (
+            file_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            admin_id TEXT NOT NULL,
+            file_type TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            original_filename TEXT NOT NULL,
+            upload_time DATETIME NOT NULL,
+            FOREIGN KEY (admin_id) REFERENCES professors (admin_id)
+        )
+    ''')
+
+    # evaluations 테이블 생성 (학생 과제 평가, 버전 1.0 스키마)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS evaluations (
+            evaluation_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            submission_id INTEGER NOT NULL,
+            admin_id TEXT NOT NULL,
+            grade TEXT CHECK(grade IN ('A', 'B', 'C', 'D', 'F')),
+            comments TEXT,
+            evaluation_time DATETIME NOT NULL,
+            FOREIGN KEY (submission_id) REFERENCES submissions (submission_id),
+            FOREIGN KEY (admin_id) REFERENCES professors (admin_id),
+            UNIQUE(submission_id, admin_id)
+        )
+    ''')
+
+
+def _migration_002_auto_evaluation_columns(cursor):
+    """evaluations 테이블에 자동 평가 열 추가"""
+    column_names = _column_names(cursor, 'evaluations')
+
+    if 'is_auto_evaluated' not in column_names:
+        cursor.execute("ALTER TABLE evaluations ADD COLUMN is_auto_evaluated BOOLEAN DEFAULT 0")
+
+    if 'auto_grade' not in column_names:
+        cursor.execute("ALTER TABLE evaluations ADD COLUMN auto_grade TEXT CHECK(auto_grade IN ('A', 'B', 'C', 'D', 'F', NULL))")
+
+    if 'auto_comments' not in column_names:
+        cursor.execute("ALTER TABLE evaluations ADD COLUMN auto_comments TEXT")
+
+    if 'auto_evaluation_time' not in column_names:
+        cursor.execute("ALTER TABLE evaluations ADD COLUMN auto_evaluation_time DATETIME")
+
+
+def _migration_003_initial_accounts(cursor):
+    """초기 학생/교수 계정 삽입"""
+    cursor.execute('SELECT COUNT(*) FROM students')
+    if cursor.fetchone()[0] > 0:
+        return
+
+    # 비밀번호 '1234'를 해싱
+    hashed_password = hashlib.sha256('1234'.encode()).hexdigest()
+
+    # 학생 초기 데이터 삽입
+    students_data = [
+        ('20251111', hashed_password, '이국민', 'leegukmin@email.com'),
+        ('20252222', hashed_password, '김대학', 'kimdaehak@email.com'),
+        ('20253333', hashed_password, '최학생', 'choihaksaeng@email.com')
+    ]
+    cursor.executemany('INSERT INTO students VALUES (?, ?, ?, ?)', students_data)
+
+    # 교수 초기 데이터 삽입
+    professors_data = [
+        ('admin1', hashed_password, '이교수'),
+        ('admin2', hashed_password, '김교수'),
+        ('admin3', hashed_password, '최교수')
+    ]
+    cursor.executemany('INSERT OR IGNORE INTO professors VALUES (?, ?, ?)', professors_data)
+
+
+def _migration_004_dashboard_indexes(cursor):
+    """제출물/평가 조회용 인덱스 추가"""
+    # 전체 제출 목록: submission_time 순으로 정렬 없이 스캔
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_submissions_time
+        ON submissions (submission_time)
+    ''')
+
+    # 학생별 제출 내역: 학번 검색 + 시간 정렬, 목록에 필요한 열까지 포함 (커버링 인덱스)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_submissions_student_time
+        ON submissions (student_id, submission_time, original_filename, file_path)
+    ''')
+
+    # 최신 평가기준/모범답안 조회 (커버링 인덱스)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_professor_files_type_time
+        ON professor_files (file_type, upload_time, original_filename, file_path)
+    ''')
+
+    # 교수별 업로드 파일 목록
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_professor_files_admin_time
+        ON professor_files (admin_id, upload_time)
+    ''')
+
+    # evaluations.submission_id 조회는 UNIQUE(submission_id, admin_id) 자동 인덱스의
+    # 선두 열로 처리되므로 별도 인덱스를 만들지 않습니다.
+
+
+def _migration_005_submission_filter_indexes(cursor):
+    """제출물 검색/정렬용 인덱스 추가"""
+    # 이름 접두어 검색
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_students_name
+        ON students (name)
+    ''')
+
+    # 학번순 정렬: (student_id, submission_id) 순서로 정렬 없이 스캔
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_submissions_student
+        ON submissions (student_id)
+    ''')
+
+    # 등급 필터: 교수 평가가 없으면 AI 평가 등급을 기준으로 검색
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_evaluations_effective_grade
+        ON evaluations (COALESCE(grade, auto_grade))
+    ''')
+
+
+def _migration_006_submission_stats(cursor):
+    """대시보드 통계 요약 테이블과 갱신 트리거 추가"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS submission_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_submissions INTEGER NOT NULL,
+            unique_students INTEGER NOT NULL,
+            evaluated_submissions INTEGER NOT NULL
+        )
+    ''')
+
+    # 기존 데이터로 초기값 계산
+    cursor.execute('''
+        INSERT OR REPLACE INTO submission_stats (id, total_submissions, unique_students, evaluated_submissions)
+        SELECT
+            1,
+            (SELECT COUNT(*) FROM submissions),
+            (SELECT COUNT(DISTINCT student_id) FROM submissions),
+            (SELECT COUNT(DISTINCT e.submission_id)
+             FROM evaluations e
+             JOIN submissions s ON e.submission_id = s.submission_id
+             WHERE e.grade IS NOT NULL)
+    ''')
+
+    # 제출: 총 건수와 (해당 학생의 첫 제출이면) 학생 수 증가
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_submission_stats_insert
+        AFTER INSERT ON submissions
+        BEGIN
+            UPDATE submission_stats
+            SET total_submissions = total_submissions + 1,
+                unique_students = unique_students + NOT EXISTS (
+                    SELECT 1 FROM submissions
+                    WHERE student_id = NEW.student_id AND submission_id <> NEW.submission_id
+                )
+            WHERE id = 1;
+        END
+    ''')
+
+    # 삭제: 총 건수와 (해당 학생의 마지막 제출이었으면) 학생 수 감소
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_submission_stats_delete
+        AFTER DELETE ON submissions
+        BEGIN
+            UPDATE submission_stats
+            SET total_submissions = total_submissions - 1,
+                unique_students = unique_students - NOT EXISTS (
+                    SELECT 1 FROM submissions WHERE student_id = OLD.student_id
+                )
+            WHERE id = 1;
+        END
+    ''')
+
+    # 교수 평가(grade)가 처음 생긴 제출물이면 평가 완료 수 증가
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_evaluation_stats_insert
+        AFTER INSERT ON evaluations
+        WHEN NEW.grade IS NOT NULL
+        BEGIN
+            UPDATE submission_stats
+            SET evaluated_submissions = evaluated_submissions + NOT EXISTS (
+                SELECT 1 FROM evaluations
+                WHERE submission_id = NEW.submission_id
+                  AND grade IS NOT NULL
+                  AND evaluation_id <> NEW.evaluation_id
+            )
+            WHERE id = 1;
+        END
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_evaluation_stats_update
+        AFTER UPDATE OF grade ON evaluations
+        WHEN (OLD.grade IS NULL) <> (NEW.grade IS NULL)
+        BEGIN
+            UPDATE submission_stats
+            SET evaluated_submissions = evaluated_submissions
+                + (CASE WHEN NEW.grade IS NOT NULL THEN 1 ELSE -1 END) * NOT EXISTS (
+                    SELECT 1 FROM evaluations
+                    WHERE submission_id = NEW.submission_id
+                      AND grade IS NOT NULL
+                      AND evaluation_id <> NEW.evaluation_id
+                )
+            WHERE id = 1;
+        END
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_evaluation_stats_delete
+        AFTER DELETE ON evaluations
+        WHEN OLD.grade IS NOT NULL
+        BEGIN
+            UPDATE submission_stats
+            SET evaluated_submissions = evaluated_submissions - NOT EXISTS (
+                SELECT 1 FROM evaluations
+                WHERE submission_id = OLD.submission_id AND grade IS NOT NULL
+            )
+            WHERE id = 1;
+        END
+    ''')
+
+
+def _migration_007_submission_search(cursor):
+    """제출물 내용/피드백 전문 검색(FTS5) 색인 추가"""
+    # rowid = submission_id. 한국어 조사 때문에 검색 시 접두어 질의(단어*)를 사용합니다.
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS submission_search USING fts5(
+            content,
+            comments,
+            auto_comments,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    ''')
+
+    # 기존 제출물의 피드백 색인 (제출물 내용은 앱에서 파일을 읽어 채움)
+    cursor.execute('''
+        INSERT INTO submission_search (rowid, content, comments, auto_comments)
+        SELECT
+            s.submission_id,
+            '',
+            COALESCE((SELECT group_concat(e.comments, ' ') FROM evaluations e
+                      WHERE e.submission_id = s.submission_id), ''),
+            COALESCE((SELECT group_concat(e.auto_comments, ' ') FROM evaluations e
+                      WHERE e.submission_id = s.submission_id), '')
+        FROM submissions s
+        WHERE s.submission_id NOT IN (SELECT rowid FROM submission_search)
+    ''')
+
+    # 제출/삭제 시 색인 행 추가/삭제
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_submission_search_insert
+        AFTER INSERT ON submissions
+        BEGIN
+            INSERT INTO submission_search (rowid, content, comments, auto_comments)
+            VALUES (NEW.submission_id, '', '', '');
+        END
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_submission_search_delete
+        AFTER DELETE ON submissions
+        BEGIN
+            DELETE FROM submission_search WHERE rowid = OLD.submission_id;
+        END
+    ''')
+
+    # 평가 코멘트가 바뀌면 해당 제출물의 피드백 색인 갱신
+    for event in ['INSERT', 'UPDATE OF comments, auto_comments']:
+        trigger_name = 'trg_evaluation_search_' + event.split()[0].lower()
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {trigger_name}
+            AFTER {event} ON evaluations
+            BEGIN
+                UPDATE submission_search
+                SET comments = COALESCE((SELECT group_concat(comments, ' ') FROM evaluations
+                                         WHERE submission_id = NEW.submission_id), ''),
+                    auto_comments = COALESCE((SELECT group_concat(auto_comments, ' ') FROM evaluations
+                                              WHERE submission_id = NEW.submission_id), '')
+                WHERE rowid = NEW.submission_id;
+            END
+        ''')
+
+
+def _migration_008_extracted_documents(cursor):
+    """업로드 파일 텍스트 추출 결과 테이블"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS extracted_documents (
+            file_path TEXT PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'pending'
+                CHECK(status IN ('pending', 'running', 'done', 'failed')),
+            content TEXT,
+            page_count INTEGER,
+            char_count INTEGER,
+            error TEXT,
+            queued_at DATETIME NOT NULL,
+            extracted_at DATETIME
+        )
+    ''')
+
+    # 추출 작업자가 대기 중인 작업을 찾고, 추출 결과를 제출물 검색 색인에 반영할 때 사용
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_extracted_documents_status
+        ON extracted_documents(status, queued_at)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_submissions_file_path
+        ON submissions(file_path)
+    ''')
+
+    # 기존 파일은 추출 대기 상태로 등록 (앱 시작 시 추출 작업자가 처리)
+    queued_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for table in ['submissions', 'professor_files']:
+        cursor.execute(f'''
+            INSERT OR IGNORE INTO extracted_documents (file_path, status, queued_at)
+            SELECT file_path, 'pending', ? FROM {table}
+        ''', (queued_at,))
+
+
+def _migration_009_extractor_version(cursor):
+    """추출 결과에 추출기 버전 열 추가"""
+    if 'extractor_version' not in _column_names(cursor, 'extracted_documents'):
+        cursor.execute('ALTER TABLE extracted_documents ADD COLUMN extractor_version INTEGER')
+
+
+def _migration_010_evaluation_jobs(cursor):
+    """자동 평가 작업 큐 테이블"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS evaluation_jobs (
+            job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            submission_id INTEGER NOT NULL,
+            admin_id TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued'
+                CHECK(status IN ('queued', 'running', 'done', 'failed')),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            lease_owner TEXT,
+            lease_expires_at DATETIME,
+            error TEXT,
+            queued_at DATETIME NOT NULL,
+            started_at DATETIME,
+            finished_at DATETIME,
+            FOREIGN KEY (submission_id) REFERENCES submissions (submission_id),
+            FOREIGN KEY (admin_id) REFERENCES professors (admin_id)
+        )
+    ''')
+
+    # 작업자가 대기 중인 작업과 임대 시간이 지난 작업을 찾을 때 사용
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_evaluation_jobs_status
+        ON evaluation_jobs(status, queued_at)
+    ''')
+    # 화면에서 제출물별 최근 작업 상태와 관리자별 진행 상황을 조회할 때 사용
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_evaluation_jobs_admin_submission
+        ON evaluation_jobs(admin_id, submission_id, job_id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_evaluation_jobs_admin_status
+        ON evaluation_jobs(admin_id, status, queued_at)
+    ''')
+    # 같은 제출물을 같은 관리자가 중복으로 대기시키지 않도록 진행 중인 작업은 하나만 허용
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_evaluation_jobs_active
+        ON evaluation_jobs(submission_id, admin_id)
+        WHERE status IN ('queued', 'running')
+    ''')
+
+
+def _migration_011_evaluation_cache(cursor):
+    """자동 평가 결과 캐시 테이블과 평가 작업의 강제 재평가 열"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS evaluation_cache (
+            cache_key TEXT PRIMARY KEY,
+            model_id TEXT NOT NULL,
+            prompt_version INTEGER NOT NULL,
+            grade TEXT NOT NULL,
+            comments TEXT,
+            created_at DATETIME NOT NULL,
+            last_used_at DATETIME NOT NULL
+        )
+    ''')
+    # 오래 사용하지 않은 캐시 항목을 정리할 때 사용
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_evaluation_cache_last_used
+        ON evaluation_cache(last_used_at)
+    ''')
+
+    if 'force' not in _column_names(cursor, 'evaluation_jobs'):
+        cursor.execute('ALTER TABLE evaluation_jobs ADD COLUMN force INTEGER NOT NULL DEFAULT 0')
+
+
+def _migration_012_evaluation_path(cursor):
+    """자동 평가 방식(한 번에 평가/분할 평가) 기록 열"""
+    if 'auto_evaluation_path' not in _column_names(cursor, 'evaluations'):
+        cursor.execute('ALTER TABLE evaluations ADD COLUMN auto_evaluation_path TEXT')
+    if 'evaluation_path' not in _column_names(cursor, 'evaluation_cache'):
+        cursor.execute('ALTER TABLE evaluation_cache ADD COLUMN evaluation_path TEXT')
+
+
+def _migration_013_evaluation_state_filters(cursor):
+    """평가 상태 필터용 제출물 평가 여부 열, 트리거, 인덱스"""
+    # 평가(교수 평가 또는 자동 평가)가 하나도 없는 제출물은 evaluations에 행이 없으므로
+    # 인덱스로 찾을 수 있도록 제출물에 평가 여부를 저장
+    if 'is_evaluated' not in _column_names(cursor, 'submissions'):
+        cursor.execute('ALTER TABLE submissions ADD COLUMN is_evaluated INTEGER NOT NULL DEFAULT 0')
+    cursor.execute('''
+        UPDATE submissions
+        SET is_evaluated = EXISTS (
+            SELECT 1 FROM evaluations e
+            WHERE e.submission_id = submissions.submission_id
+              AND (e.grade IS NOT NULL OR e.is_auto_evaluated = 1)
+        )
+    ''')
+
+    # 평가가 저장/수정/삭제되면 해당 제출물의 평가 여부 갱신
+    for event, row in [('INSERT', 'NEW'), ('UPDATE OF grade, is_auto_evaluated', 'NEW'), ('DELETE', 'OLD')]:
+        trigger_name = 'trg_submission_evaluated_' + event.split()[0].lower()
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {trigger_name}
+            AFTER {event} ON evaluations
+            BEGIN
+                UPDATE submissions
+                SET is_evaluated = EXISTS (
+                    SELECT 1 FROM evaluations
+                    WHERE submission_id = {row}.submission_id
+                      AND (grade IS NOT NULL OR is_auto_evaluated = 1)
+                )
+                WHERE submission_id = {row}.submission_id;
+            END
+        ''')
+
+    # 미평가 필터: 평가 여부로 찾고 제출 시간 순서로 정렬 없이 읽음
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_submissions_evaluated_time
+        ON submissions (is_evaluated, submission_time)
+    ''')
+
+    # AI 평가만(grade IS NULL, is_auto_evaluated = 1)과 교수 평가 완료(grade IN (...)) 필터
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_evaluations_state
+        ON evaluations (grade, is_auto_evaluated)
+    ''')
+
+
+def _migration_014_evaluation_search_delete(cursor):
+    """평가 삭제 시 피드백 검색 색인 갱신 트리거"""
+    # 평가가 삭제되면 남은 평가의 코멘트로 색인을 다시 채움 (남은 평가가 없으면 빈 문자열)
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_evaluation_search_delete
+        AFTER DELETE ON evaluations
+        BEGIN
+            UPDATE submission_search
+            SET comments = COALESCE((SELECT group_concat(comments, ' ') FROM evaluations
+                                     WHERE submission_id = OLD.submission_id), ''),
+                auto_comments = COALESCE((SELECT group_concat(auto_comments, ' ') FROM evaluations
+                                          WHERE submission_id = OLD.submission_id), '')
+            WHERE rowid = OLD.submission_id;
+        END
+    ''')
+
+    # 트리거가 없던 동안 삭제된 평가의 코멘트가 남아 있을 수 있으므로 피드백 색인을 다시 채움
+    cursor.execute('''
+        UPDATE submission_search
+        SET comments = COALESCE((SELECT group_concat(e.comments, ' ') FROM evaluations e
+                                 WHERE e.submission_id = submission_search.rowid), ''),
+            auto_comments = COALESCE((SELECT group_concat(e.auto_comments, ' ') FROM evaluations e
+                                      WHERE e.submission_id = submission_search.rowid), '')
+    ''')
+
+
+def _migration_015_drop_redundant_submission_index(cursor):
+    """idx_submissions_student_time과 겹치는 학번 인덱스 삭제"""
+    # idx_submissions_student(student_id)는 idx_submissions_student_time의 선두 열과 같아
+    # 학번 검색과 학번순 정렬을 모두 대신할 수 있으므로 쓰기 비용만 늘림
+    cursor.execute('DROP INDEX IF EXISTS idx_submissions_student')
+
+
+# 순서가 있는 마이그레이션 목록: (버전, 함수)
+# 새 열이나 인덱스는 기존 항목을 수정하지 말고 다음 번호로 추가합니다.
+MIGRATIONS = [
+    (1, _migration_001_base_tables),
+    (2, _migration_002_auto_evaluation_columns),
+    (3, _migration_003_initial_accounts),
+    (4, _migration_004_dashboard_indexes),
+    (5, _migration_005_submission_filter_indexes),
+    (6, _migration_006_submission_stats),
+    (7, _migration_007_submission_search),
+    (8, _migration_008_extracted_documents),
+    (9, _migration_009_extractor_version),
+    (10, _migration_010_evaluation_jobs),
+    (11, _migration_011_evaluation_cache),
+    (12, _migration_012_evaluation_path),
+    (13, _migration_013_evaluation_state_filters),
+    (14, _migration_014_evaluation_search_delete),
+    (15, _migration_015_drop_redundant_submission_index),
+]
+
+
+def get_schema_version(conn=None):
+    """
+    현재 데이터베이스의 스키마 버전을 반환
+
+    Args:
+        conn (sqlite3.Connection, optional): 사용할 연결
+
+    Returns:
+        int: 적용된 마지막 마이그레이션 버전 (없으면 0)
+    """
+    conn = conn or get_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at DATETIME NOT NULL
+        )
+    ''')
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+
+def _has_existing_data(conn):
+    """schema_version 외에 기존 테이블이 있는 데이터베이스인지 확인합니다."""
+    row = conn.execute('''
+        SELECT COUNT(*) FROM sqlite_master
+        WHERE type = 'table' AND name NOT IN ('schema_version', 'sqlite_sequence')
+    ''').fetchone()
+    return row[0] > 0
+
+
+def run_migrations(backup=True):
+    """
+    적용되지 않은 마이그레이션을 버전 순서대로 실행
+
+    각 마이그레이션은 BEGIN IMMEDIATE 트랜잭션 안에서 실행되므로, 여러 프로세스가
+    동시에 실행해도 같은 마이그레이션이 두 번 적용되지 않습니다.
+
+    Args:
+        backup (bool): 기존 데이터베이스에 적용할 마이그레이션이 있으면 먼저 백업할지 여부
+
+    Returns:
+        int: 마이그레이션 후 스키마 버전
+    """
+    conn = get_connection()
+    current_version = get_schema_version(conn)
+
+    pending = [version for version, _ in MIGRATIONS if version > current_version]
+    if backup and pending and _has_existing_data(conn):
+        backup_path = create_backup(f"pre-migration-v{pending[-1]}")
+        logger.info(f"마이그레이션 전 백업 생성: {backup_path}")
+
+    for version, migration in MIGRATIONS:
+        if version <= current_version:
+            continue
+
+        description = (migration.__doc__ or migration.__name__).strip()
+        cursor = conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            # 잠금을 얻은 뒤 다른 프로세스가 먼저 적용했는지 다시 확인
+            cursor.execute('SELECT 1 FROM schema_version WHERE version = ?', (version,))
+            if cursor.fetchone() is None:
+                logger.info(f"마이그레이션 {version:03d} 적용 중: {description}")
+                migration(cursor)
+                cursor.execute(
+                    'INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)',
+                    (version, description, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"마이그레이션 {version:03d} 실패: {description}")
+            raise
+        current_version = version
+        invalidate_query_cache()
+
+    return current_version
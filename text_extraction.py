@@ -0,0 +1,811 @@
+import io
+import os
+import re
+import zlib
+import codecs
+import struct
+import logging
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from functools import lru_cache
+import PyPDF2
+from extraction_cache import cached_extract
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 추출 로직이 바뀌면 올려서 이전 버전으로 캐시된 텍스트를 무효화합니다.
+EXTRACTOR_VERSION = 4
+
+SNIFF_BYTES = 8192                      # 형식 판별에 읽는 파일 앞부분 크기
+TEXT_CHUNK_SIZE = 64 * 1024             # 텍스트 파일을 읽는 단위
+TEXT_ENCODINGS = ['utf-8', 'cp949']     # BOM이 없는 텍스트 파일의 인코딩 후보 (우선순위 순)
+
+UNSUPPORTED_FORMAT_MESSAGE = "지원하지 않는 파일 형식입니다. (PDF, Word, PowerPoint, 한글, TXT 파일만 미리보기 가능)"
+
+OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+ZIP_SIGNATURE = b'PK\x03\x04'
+RAR_SIGNATURE = b'Rar!\x1a\x07'
+
+# 압축 파일 제한 (압축 폭탄 방지)
+ARCHIVE_MAX_MEMBERS = 200                       # 최대 파일 수
+ARCHIVE_MAX_TOTAL_BYTES = 100 * 1024 * 1024     # 압축을 푼 전체 크기 상한
+ARCHIVE_MAX_RATIO = 100                         # 파일별 최대 압축률 (원본 크기 / 압축 크기)
+ARCHIVE_RATIO_MIN_BYTES = 1024 * 1024           # 이 크기 이상인 파일만 압축률 검사
+ARCHIVE_TEXT_BUDGET = 200000                    # 압축 파일에서 추출할 최대 글자 수
+# 압축 파일 안에서 텍스트를 추출할 형식 (압축 파일 안의 압축 파일은 읽지 않음)
+ARCHIVE_MEMBER_FORMATS = {'pdf', 'docx', 'pptx', 'hwp', 'hwpx', 'txt'}
+
+# 형식 이름 -> 추출 함수 (file_path -> (성공 여부, 내용 또는 오류 메시지))
+_HANDLERS = {}
+
+
+def register_handler(file_format):
+    """
+    파일 형식의 추출 함수를 등록하는 데코레이터
+
+    Args:
+        file_format (str): sniff_format이 반환하는 형식 이름
+    """
+    def decorator(handler):
+        _HANDLERS[file_format] = handler
+        return handler
+    return decorator
+
+
+def read_file_content(file_path):
+    """
+    파일 내용을 읽어서 반환
+
+    같은 내용의 파일은 추출 결과 캐시를 사용하므로, 미리보기와 자동 평가가 같은 파일을
+    여러 번 읽어도 실제 추출은 한 번만 수행됩니다.
+
+    Args:
+        file_path (str): 파일 경로
+
+    Returns:
+        tuple: (성공 여부, 파일 내용 또는 오류 메시지)
+    """
+    return cached_extract(file_path, _extract_file_content, EXTRACTOR_VERSION)
+
+
+def extract_document(file_path):
+    """
+    파일 텍스트와 페이지 수를 추출
+
+    Args:
+        file_path (str): 파일 경로
+
+    Returns:
+        tuple: (성공 여부, 파일 내용 또는 오류 메시지, 페이지 수 또는 None)
+    """
+    success, content = read_file_content(file_path)
+    return success, content, count_pages(file_path) if success else None
+
+
+def count_pages(file_path):
+    """PDF의 페이지 수나 PowerPoint의 슬라이드 수를 반환합니다. 페이지 개념이 없는 형식이면 None을 반환합니다."""
+    try:
+        file_format = sniff_format(file_path)
+        if file_format == 'pdf':
+            with _open_binary(file_path) as file:
+                return len(PyPDF2.PdfReader(file).pages)
+        if file_format == 'pptx':
+            with zipfile.ZipFile(file_path) as archive:
+                return len(_pptx_slide_names(archive))
+    except Exception:
+        pass
+    return None
+
+
+@contextmanager
+def _open_binary(source):
+    """파일 경로면 바이너리 모드로 열고, 이미 열린 파일 객체면 처음 위치로 되돌려 그대로 사용합니다."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield file
+    else:
+        source.seek(0)
+        yield source
+
+
+def sniff_format(file_path, name=None):
+    """
+    파일 앞부분의 시그니처로 형식을 판별
+
+    확장자는 사용하지 않습니다. 다만 olefile이 없어 OLE 파일 내부를 확인할 수 없을 때만
+    .hwp 확장자로 한글 문서를 구분합니다.
+
+    Args:
+        file_path (str): 파일 경로 (압축 파일 안의 파일이면 바이너리 파일 객체)
+        name (str, optional): 파일 객체의 원래 파일 이름
+
+    Returns:
+        str: 'pdf', 'docx', 'pptx', 'hwp', 'hwpx', 'ole', 'zip', 'rar', 'txt' 중 하나 (알 수 없으면 None)
+    """
+    with _open_binary(file_path) as file:
+        head = file.read(SNIFF_BYTES)
+
+    file_format = _sniff_head(head)
+    if file_format == 'zip':
+        return _sniff_zip_format(file_path)
+    if file_format == 'ole':
+        return _sniff_ole_format(file_path, name or file_path)
+    return file_format
+
+
+def _sniff_head(head):
+    """파일 앞부분만으로 형식을 판별합니다. ZIP/OLE 컨테이너는 내부를 확인하지 않습니다."""
+    # PDF 헤더는 파일 앞 1024바이트 안 어디에나 올 수 있음
+    if b'%PDF-' in head[:1024]:
+        return 'pdf'
+    if head.startswith(ZIP_SIGNATURE):
+        return 'zip'
+    if head.startswith(RAR_SIGNATURE):
+        return 'rar'
+    if head.startswith(OLE_SIGNATURE):
+        return 'ole'
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)) or b'\x00' not in head:
+        return 'txt'
+    return None
+
+
+def _sniff_zip_format(file_path):
+    """ZIP 컨테이너의 구성 파일로 Office Open XML/HWPX 문서를 구분합니다."""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            names = set(archive.namelist())
+            if 'word/document.xml' in names:
+                return 'docx'
+            if 'ppt/presentation.xml' in names:
+                return 'pptx'
+            if 'Contents/section0.xml' in names:
+                return 'hwpx'
+    except zipfile.BadZipFile:
+        return None
+    return 'zip'
+
+
+def _sniff_ole_format(file_path, name):
+    """OLE 복합 문서 중 한글(HWP 5.x) 문서를 구분합니다. 나머지는 이전 Office 형식으로 봅니다."""
+    try:
+        import olefile
+    except ImportError:
+        return 'hwp' if isinstance(name, str) and name.lower().endswith('.hwp') else 'ole'
+
+    try:
+        with _open_binary(file_path) as file, olefile.OleFileIO(file) as ole:
+            if ole.exists('FileHeader') and ole.exists('BodyText'):
+                return 'hwp'
+    except Exception:
+        return None
+    return 'ole'
+
+
+def _extract_file_content(file_path):
+    """파일 형식에 맞게 등록된 추출 함수로 파일 내용을 읽습니다."""
+    try:
+        handler = _HANDLERS.get(sniff_format(file_path))
+        if handler is None:
+            return False, UNSUPPORTED_FORMAT_MESSAGE
+        return handler(file_path)
+    
+    except Exception as e:
+        return False, f"파일을 읽는 중 오류가 발생했습니다: {str(e)}"
+
+
+def iter_pdf_pages(file_path, start_page=0, end_page=None):
+    """
+    PDF 페이지 텍스트를 한 페이지씩 생성
+
+    페이지는 요청될 때 하나씩 추출되므로, 문서 전체를 메모리에 올리지 않고 앞부분만
+    읽거나 중간에 멈출 수 있습니다.
+
+    Args:
+        file_path (str): PDF 파일 경로
+        start_page (int): 시작 페이지 (0부터)
+        end_page (int, optional): 끝 페이지 (포함하지 않음, 없으면 마지막 페이지까지)
+
+    Yields:
+        tuple: (페이지 번호, 페이지 텍스트)
+    """
+    with _open_binary(file_path) as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        yield from _iter_reader_pages(pdf_reader, start_page, end_page)
+
+
+def _iter_reader_pages(pdf_reader, start_page, end_page):
+    """열린 PdfReader에서 지정한 범위의 페이지 텍스트를 차례로 생성합니다."""
+    page_total = len(pdf_reader.pages)
+    end_page = page_total if end_page is None else min(end_page, page_total)
+    for page_number in range(start_page, end_page):
+        yield page_number, pdf_reader.pages[page_number].extract_text() or ""
+
+
+def read_pdf_pages(file_path, start_page=0, max_pages=None, max_chars=None):
+    """
+    PDF의 일부 페이지만 읽음
+
+    최소 한 페이지는 읽고, 누적 글자 수가 max_chars 이상이 되면 해당 페이지까지만 반환합니다.
+
+    Args:
+        file_path (str): PDF 파일 경로
+        start_page (int): 시작 페이지 (0부터)
+        max_pages (int, optional): 최대 페이지 수
+        max_chars (int, optional): 글자 수 예산
+
+    Returns:
+        tuple: (성공 여부, 페이지 내용 또는 오류 메시지, 다음에 읽을 페이지 번호 또는 None)
+    """
+    try:
+        with _open_binary(file_path) as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            page_total = len(pdf_reader.pages)
+            end_page = page_total if max_pages is None else min(start_page + max_pages, page_total)
+
+            pages = []
+            char_count = 0
+            next_page = start_page
+            for page_number, text in _iter_reader_pages(pdf_reader, start_page, end_page):
+                pages.append(text + "\n")
+                char_count += len(text) + 1
+                next_page = page_number + 1
+                if max_chars is not None and char_count >= max_chars:
+                    break
+
+        return True, "".join(pages), next_page if next_page < page_total else None
+    except Exception as e:
+        return False, f"PDF 읽기 오류: {str(e)}", None
+
+
+@register_handler('pdf')
+def read_pdf_content(file_path):
+    """PDF 파일 내용을 읽습니다."""
+    try:
+        content = "".join(text + "\n" for _, text in iter_pdf_pages(file_path))
+        
+        if content.strip():
+            return True, content
+        else:
+            return False, "PDF에서 텍스트를 추출할 수 없습니다."
+    
+    except Exception as e:
+        return False, f"PDF 읽기 오류: {str(e)}"
+
+
+_WORDML_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_MC_FALLBACK_TAG = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+
+def _iter_docx_blocks(stream):
+    """
+    WordprocessingML 파트를 iterparse로 읽으며 문단과 표 행 텍스트를 문서 순서대로 생성합니다.
+
+    표의 행은 셀 텍스트를 탭으로 구분한 한 줄로 만들고, 글상자 안의 문단도 포함합니다.
+    mc:Fallback 안의 내용은 mc:Choice와 같은 글상자의 대체 표현이므로 건너뜁니다.
+    """
+    paragraph_stack = []    # 작성 중인 문단별 텍스트 조각 (글상자 문단은 바깥 문단 안에 중첩)
+    cell_stack = []         # 작성 중인 표 셀별 문단 목록
+    row_stack = []          # 작성 중인 표 행별 셀 목록 (중첩 표 지원)
+    skip_depth = 0          # mc:Fallback, w:tabs(탭 정지 위치 정의) 안이면 0보다 큼
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if tag == _MC_FALLBACK_TAG or tag == f'{_WORDML_NS}tabs':
+            skip_depth += 1 if event == 'start' else -1
+            continue
+        if skip_depth:
+            continue
+
+        if event == 'start':
+            if tag == f'{_WORDML_NS}p':
+                paragraph_stack.append([])
+            elif tag == f'{_WORDML_NS}tc':
+                cell_stack.append([])
+            elif tag == f'{_WORDML_NS}tr':
+                row_stack.append([])
+            continue
+
+        if tag == f'{_WORDML_NS}t':
+            if paragraph_stack:
+                paragraph_stack[-1].append(elem.text or '')
+        elif tag == f'{_WORDML_NS}tab':
+            if paragraph_stack:
+                paragraph_stack[-1].append('\t')
+        elif tag in (f'{_WORDML_NS}br', f'{_WORDML_NS}cr'):
+            if paragraph_stack:
+                paragraph_stack[-1].append('\n')
+        elif tag == f'{_WORDML_NS}p':
+            text = ''.join(paragraph_stack.pop())
+            if cell_stack:
+                cell_stack[-1].append(text)
+            else:
+                yield text
+            elem.clear()
+        elif tag == f'{_WORDML_NS}tc':
+            cell = ' '.join(text for text in cell_stack.pop() if text)
+            if row_stack:
+                row_stack[-1].append(cell)
+        elif tag == f'{_WORDML_NS}tr':
+            row = '\t'.join(row_stack.pop())
+            if cell_stack:
+                cell_stack[-1].append(row)
+            else:
+                yield row
+            elem.clear()
+
+
+def _docx_part_names(archive, prefix):
+    """word/header1.xml, word/footer2.xml 같은 머리글/바닥글 파트 이름을 번호 순으로 반환합니다."""
+    pattern = re.compile(rf'word/{prefix}(\d*)\.xml')
+    names = [name for name in archive.namelist() if pattern.fullmatch(name)]
+    return sorted(names, key=lambda name: int(pattern.fullmatch(name).group(1) or 0))
+
+
+def _iter_docx_part_lines(archive, part_names, seen):
+    """머리글/바닥글 파트의 내용 있는 줄을 생성합니다. 구역마다 반복되는 같은 줄은 한 번만 포함합니다."""
+    for part_name in part_names:
+        with archive.open(part_name) as part:
+            for text in _iter_docx_blocks(part):
+                if text.strip() and text not in seen:
+                    seen.add(text)
+                    yield text
+
+
+@register_handler('docx')
+def read_docx_content(file_path):
+    """
+    Word 문서 내용을 읽습니다.
+
+    python-docx로 전체 개체 모델을 만들지 않고 word/document.xml과 머리글/바닥글 파트를
+    스트리밍으로 읽어 머리글, 본문(문단, 표, 글상자), 바닥글 순서로 반환합니다.
+    """
+    try:
+        with _open_binary(file_path) as file, zipfile.ZipFile(file) as archive:
+            seen = set()
+            lines = list(_iter_docx_part_lines(archive, _docx_part_names(archive, 'header'), seen))
+            with archive.open('word/document.xml') as part:
+                lines.extend(_iter_docx_blocks(part))
+            lines.extend(_iter_docx_part_lines(archive, _docx_part_names(archive, 'footer'), seen))
+        
+        content = "".join(line + "\n" for line in lines)
+        if content.strip():
+            return True, content
+        else:
+            return False, "Word 문서에 텍스트가 없습니다."
+    
+    except Exception as e:
+        return False, f"Word 문서 읽기 오류: {str(e)}"
+
+
+@register_handler('txt')
+def read_txt_content(file_path):
+    """
+    텍스트 파일 내용을 읽습니다.
+
+    파일을 한 번만 읽으면서 인코딩 후보(UTF-8, CP949)의 점진적 디코더에 차례로 넣고,
+    디코딩에 실패한 후보는 바로 제외합니다. 끝까지 남은 후보 중 우선순위가 가장 높은
+    인코딩의 결과를 사용합니다. BOM이 있으면 해당 인코딩만 사용합니다.
+    """
+    try:
+        with _open_binary(file_path) as file:
+            bom_encoding = _bom_encoding(file.read(4))
+            file.seek(0)
+            encodings = [bom_encoding] if bom_encoding else TEXT_ENCODINGS
+
+            decoders = {encoding: codecs.getincrementaldecoder(encoding)() for encoding in encodings}
+            parts = {encoding: [] for encoding in encodings}
+            for chunk in iter(lambda: file.read(TEXT_CHUNK_SIZE), b''):
+                _decode_chunk(decoders, parts, chunk)
+                if not decoders:
+                    break
+            _decode_chunk(decoders, parts, b'', final=True)
+        
+        if not decoders:
+            return False, f"텍스트 파일 인코딩 오류: {', '.join(encodings)}로 읽을 수 없습니다."
+        
+        encoding = next(encoding for encoding in encodings if encoding in decoders)
+        content = "".join(parts[encoding])
+        
+        if content.strip():
+            return True, content
+        else:
+            return False, "텍스트 파일이 비어있습니다."
+    
+    except Exception as e:
+        return False, f"텍스트 파일 읽기 오류: {str(e)}"
+
+
+def _bom_encoding(head):
+    """BOM에 해당하는 인코딩을 반환합니다. BOM이 없으면 None을 반환합니다."""
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    return None
+
+
+def _decode_chunk(decoders, parts, chunk, final=False):
+    """남아 있는 인코딩 후보마다 청크를 디코딩하고, 실패한 후보는 제외합니다."""
+    # ASCII 청크는 모든 후보에서 결과가 같으므로 한 번만 디코딩해 같은 문자열을 공유
+    if (len(decoders) > 1 and chunk.isascii()
+            and all(not decoder.getstate()[0] for decoder in decoders.values())):
+        text = chunk.decode('ascii')
+        for encoding in decoders:
+            parts[encoding].append(text)
+        return
+
+    for encoding in list(decoders):
+        try:
+            parts[encoding].append(decoders[encoding].decode(chunk, final=final))
+        except UnicodeDecodeError:
+            del decoders[encoding]
+            del parts[encoding]
+
+
+def _iter_xml_paragraphs(stream, paragraph_tag, text_tag):
+    """
+    XML 파트를 iterparse로 읽으며 문단 텍스트를 차례로 생성합니다.
+
+    문단이 끝날 때마다 해당 요소를 비워 메모리에 문서 전체 트리를 유지하지 않습니다.
+    """
+    texts = []
+    for _, elem in ET.iterparse(stream, events=('end',)):
+        if elem.tag == text_tag:
+            texts.append(''.join(elem.itertext()))
+        elif elem.tag == paragraph_tag:
+            yield ''.join(texts)
+            texts = []
+            elem.clear()
+
+
+_DRAWINGML_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+_PRESENTATIONML_NS = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+_OFFICE_RELATIONSHIPS_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PACKAGE_RELATIONSHIPS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def _pptx_slide_names(archive):
+    """presentation.xml의 슬라이드 목록 순서대로 슬라이드 파트 이름을 반환합니다."""
+    relationships = ET.fromstring(archive.read('ppt/_rels/presentation.xml.rels'))
+    targets = {
+        rel.get('Id'): posixpath.normpath(posixpath.join('ppt', rel.get('Target')))
+        for rel in relationships.iter(f'{_PACKAGE_RELATIONSHIPS_NS}Relationship')
+    }
+    presentation = ET.fromstring(archive.read('ppt/presentation.xml'))
+    return [
+        targets[slide_id.get(f'{_OFFICE_RELATIONSHIPS_NS}id')]
+        for slide_id in presentation.iter(f'{_PRESENTATIONML_NS}sldId')
+    ]
+
+
+@register_handler('pptx')
+def read_pptx_content(file_path):
+    """PowerPoint 슬라이드의 텍스트를 슬라이드 순서대로 읽습니다."""
+    try:
+        slides = []
+        has_text = False
+        with zipfile.ZipFile(file_path) as archive:
+            for number, slide_name in enumerate(_pptx_slide_names(archive), 1):
+                with archive.open(slide_name) as part:
+                    paragraphs = [
+                        text for text in _iter_xml_paragraphs(part, f'{_DRAWINGML_NS}p', f'{_DRAWINGML_NS}t')
+                        if text.strip()
+                    ]
+                has_text = has_text or bool(paragraphs)
+                slides.append(f"[슬라이드 {number}]\n" + "".join(text + "\n" for text in paragraphs))
+        
+        if has_text:
+            return True, "\n".join(slides)
+        else:
+            return False, "PowerPoint 파일에 텍스트가 없습니다."
+    
+    except Exception as e:
+        return False, f"PowerPoint 읽기 오류: {str(e)}"
+
+
+_HWPX_PARAGRAPH_NS = '{http://www.hancom.co.kr/hwpml/2011/paragraph}'
+
+
+@register_handler('hwpx')
+def read_hwpx_content(file_path):
+    """한글(HWPX) 문서의 본문 텍스트를 구역 순서대로 읽습니다."""
+    try:
+        paragraphs = []
+        with zipfile.ZipFile(file_path) as archive:
+            section_names = sorted(
+                (name for name in archive.namelist() if re.fullmatch(r'Contents/section\d+\.xml', name)),
+                key=lambda name: int(re.search(r'(\d+)\.xml$', name).group(1))
+            )
+            for section_name in section_names:
+                with archive.open(section_name) as part:
+                    paragraphs.extend(
+                        _iter_xml_paragraphs(part, f'{_HWPX_PARAGRAPH_NS}p', f'{_HWPX_PARAGRAPH_NS}t')
+                    )
+        
+        content = "".join(paragraph + "\n" for paragraph in paragraphs)
+        if content.strip():
+            return True, content
+        else:
+            return False, "한글 문서에 텍스트가 없습니다."
+    
+    except Exception as e:
+        return False, f"한글 문서 읽기 오류: {str(e)}"
+
+
+# HWP 5.x 본문 레코드 (한글 문서 파일 형식 5.0 공개 문서 기준)
+HWPTAG_PARA_TEXT = 67
+HWP_FLAG_COMPRESSED = 0x01
+HWP_FLAG_PASSWORD = 0x02
+HWP_FLAG_DISTRIBUTION = 0x04
+# 컨트롤 ID 등 추가 정보를 포함해 8개의 WCHAR를 차지하는 제어 문자
+_HWP_EXTENDED_CONTROLS = frozenset({1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23})
+
+
+def _iter_hwp_records(data, tag_id):
+    """HWP 본문 스트림에서 지정한 태그 레코드의 데이터를 차례로 생성합니다."""
+    offset = 0
+    while offset + 4 <= len(data):
+        header = struct.unpack_from('<I', data, offset)[0]
+        offset += 4
+        tag, size = header & 0x3FF, header >> 20
+        if size == 0xFFF:
+            size = struct.unpack_from('<I', data, offset)[0]
+            offset += 4
+        if tag == tag_id:
+            yield data[offset:offset + size]
+        offset += size
+
+
+def _decode_hwp_paragraph(payload):
+    """PARA_TEXT 레코드를 문자열로 바꿉니다. 표/그림 등 제어 문자는 건너뜁니다."""
+    units = struct.unpack(f'<{len(payload) // 2}H', payload[:len(payload) // 2 * 2])
+    chars = []
+    index = 0
+    while index < len(units):
+        unit = units[index]
+        if unit >= 32:
+            chars.append(chr(unit))
+            index += 1
+        elif unit in _HWP_EXTENDED_CONTROLS:
+            if unit == 9:
+                chars.append('\t')
+            index += 8
+        else:
+            if unit == 10:
+                chars.append('\n')
+            index += 1
+    # 서로게이트 쌍으로 저장된 문자를 합침
+    return ''.join(chars).encode('utf-16-le', 'surrogatepass').decode('utf-16-le', 'replace')
+
+
+@register_handler('hwp')
+def read_hwp_content(file_path):
+    """한글(HWP 5.x) 문서의 본문 텍스트를 구역 순서대로 읽습니다."""
+    try:
+        import olefile
+    except ImportError:
+        return False, "한글(HWP) 파일을 읽으려면 olefile 패키지가 필요합니다. (pip install olefile)"
+    
+    try:
+        paragraphs = []
+        with _open_binary(file_path) as file, olefile.OleFileIO(file) as ole:
+            header = ole.openstream('FileHeader').read()
+            flags = struct.unpack_from('<I', header, 36)[0]
+            if flags & (HWP_FLAG_PASSWORD | HWP_FLAG_DISTRIBUTION):
+                return False, "암호가 설정되었거나 배포용으로 저장된 한글 문서는 읽을 수 없습니다."
+            
+            sections = sorted(
+                (entry for entry in ole.listdir()
+                 if len(entry) == 2 and entry[0] == 'BodyText' and entry[1].startswith('Section')),
+                key=lambda entry: int(entry[1][len('Section'):])
+            )
+            for entry in sections:
+                data = ole.openstream(entry).read()
+                if flags & HWP_FLAG_COMPRESSED:
+                    data = zlib.decompress(data, -15)
+                paragraphs.extend(_decode_hwp_paragraph(payload) for payload in _iter_hwp_records(data, HWPTAG_PARA_TEXT))
+        
+        content = "".join(paragraph + "\n" for paragraph in paragraphs)
+        if content.strip():
+            return True, content
+        else:
+            return False, "한글 문서에 텍스트가 없습니다."
+    
+    except Exception as e:
+        return False, f"한글 문서 읽기 오류: {str(e)}"
+
+
+@register_handler('ole')
+def read_legacy_office_content(file_path):
+    """이전 Office 형식(.doc, .ppt)은 읽을 수 없으므로 변환 안내 메시지를 반환합니다."""
+    return False, "이전 Office 형식(.doc, .ppt)은 미리보기를 지원하지 않습니다. .docx 또는 .pptx로 저장한 뒤 업로드해주세요."
+
+
+class ArchiveLimitError(Exception):
+    """압축 파일이 파일 수/크기/압축률 제한을 넘었을 때 발생합니다."""
+
+
+def _archive_member_name(info):
+    """압축 파일 안의 파일 이름을 반환합니다. UTF-8 표시가 없는 ZIP 이름은 CP949로 해석합니다."""
+    name = info.filename
+    if isinstance(info, zipfile.ZipInfo) and not info.flag_bits & 0x800:
+        try:
+            name = name.encode('cp437').decode('cp949')
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            pass
+    return name
+
+
+def _check_archive_limits(infos):
+    """헤더에 기록된 파일 수, 전체 크기, 압축률이 제한 안에 있는지 확인합니다."""
+    if len(infos) > ARCHIVE_MAX_MEMBERS:
+        raise ArchiveLimitError(f"압축 파일 안의 파일이 너무 많습니다. ({len(infos)}개, 최대 {ARCHIVE_MAX_MEMBERS}개)")
+
+    total_size = sum(info.file_size for info in infos)
+    if total_size > ARCHIVE_MAX_TOTAL_BYTES:
+        raise ArchiveLimitError(
+            f"압축을 푼 전체 크기가 너무 큽니다. ({_format_size(total_size)}, 최대 {_format_size(ARCHIVE_MAX_TOTAL_BYTES)})"
+        )
+
+    for info in infos:
+        if info.file_size >= ARCHIVE_RATIO_MIN_BYTES and info.file_size > info.compress_size * ARCHIVE_MAX_RATIO:
+            raise ArchiveLimitError(f"압축률이 비정상적으로 높은 파일이 있습니다: {_archive_member_name(info)}")
+
+
+def _read_archive_member(archive, info, remaining_bytes):
+    """
+    압축 파일 안의 파일을 메모리로 읽음
+
+    먼저 앞부분만 읽어 형식을 판별하고, 텍스트를 추출할 수 없는 형식이면 나머지를 읽지
+    않습니다. 실제로 풀린 크기가 헤더 기록이나 남은 전체 크기 한도를 넘으면 중단합니다.
+
+    Returns:
+        bytes: 파일 내용 (추출할 수 없는 형식이면 None)
+    """
+    limit = min(info.file_size, remaining_bytes)
+    with archive.open(info) as member:
+        head = member.read(SNIFF_BYTES)
+        if _sniff_head(head) not in ARCHIVE_MEMBER_FORMATS | {'zip', 'ole'}:
+            return None
+
+        chunks = [head]
+        size = len(head)
+        for chunk in iter(lambda: member.read(TEXT_CHUNK_SIZE), b''):
+            size += len(chunk)
+            if size > limit:
+                raise ArchiveLimitError(f"압축을 푼 크기가 제한을 넘었습니다: {_archive_member_name(info)}")
+            chunks.append(chunk)
+    if size > limit:
+        raise ArchiveLimitError(f"압축을 푼 크기가 제한을 넘었습니다: {_archive_member_name(info)}")
+    return b''.join(chunks)
+
+
+def _extract_archive_member(data, name, budget):
+    """압축 파일 안의 파일 하나에서 최대 budget 글자의 텍스트를 추출합니다."""
+    stream = io.BytesIO(data)
+    member_format = sniff_format(stream, name)
+    if member_format in ('zip', 'rar'):
+        return False, "압축 파일 안의 압축 파일은 읽지 않습니다"
+    if member_format not in ARCHIVE_MEMBER_FORMATS:
+        return False, "텍스트를 추출할 수 없는 형식"
+    if member_format == 'pdf':
+        success, content, _ = read_pdf_pages(stream, max_chars=budget)
+    else:
+        success, content = _HANDLERS[member_format](stream)
+    return success, content[:budget] if success else content
+
+
+def _read_archive(archive):
+    """
+    압축 파일의 파일 목록과 각 파일에서 추출한 텍스트를 이어 붙여 반환
+
+    디스크에 풀지 않고 파일마다 메모리에서 추출하며, 전체 텍스트는 ARCHIVE_TEXT_BUDGET
+    글자까지만 추출합니다.
+    """
+    infos = [
+        info for info in archive.infolist()
+        if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+    ]
+    _check_archive_limits(infos)
+
+    listing = [f"[압축 파일 목록] {len(infos)}개 파일"]
+    sections = []
+    budget = ARCHIVE_TEXT_BUDGET
+    remaining_bytes = ARCHIVE_MAX_TOTAL_BYTES
+    for info in infos:
+        name = _archive_member_name(info)
+        listing.append(f"- {name} ({_format_size(info.file_size)})")
+        if budget <= 0:
+            continue
+
+        try:
+            data = _read_archive_member(archive, info, remaining_bytes)
+        except ArchiveLimitError:
+            raise
+        except Exception as e:
+            sections.append(f"===== {name} =====\n(읽을 수 없음: {str(e)})\n")
+            continue
+        if data is None:
+            continue
+        remaining_bytes -= len(data)
+
+        success, content = _extract_archive_member(data, name, budget)
+        if success:
+            budget -= len(content)
+            sections.append(f"===== {name} =====\n{content}\n")
+        elif data:
+            sections.append(f"===== {name} =====\n({content})\n")
+
+    if budget <= 0:
+        sections.append(f"... (최대 {ARCHIVE_TEXT_BUDGET}자까지만 추출했습니다)\n")
+    return True, "\n".join(listing) + "\n\n" + "\n".join(sections)
+
+
+def _format_size(size):
+    """바이트 크기를 읽기 쉬운 문자열로 바꿉니다."""
+    for unit in ['B', 'KB', 'MB']:
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+@register_handler('zip')
+def read_zip_content(file_path):
+    """ZIP 압축 파일 안의 문서/소스 파일 텍스트를 읽습니다."""
+    try:
+        with _open_binary(file_path) as file, zipfile.ZipFile(file) as archive:
+            return _read_archive(archive)
+    
+    except ArchiveLimitError as e:
+        return False, str(e)
+    except Exception as e:
+        return False, f"압축 파일 읽기 오류: {str(e)}"
+
+
+@lru_cache(maxsize=None)
+def rar_supported():
+    """
+    RAR 압축 파일을 읽을 수 있는지(rarfile 패키지와 압축 해제 프로그램이 있는지) 확인합니다.
+
+    학생 화면을 다시 그릴 때마다 호출되므로, 압축 해제 프로그램을 찾는 하위 프로세스는
+    프로세스당 한 번만 실행합니다.
+    """
+    try:
+        import rarfile
+    except ImportError:
+        return False
+    try:
+        rarfile.tool_setup()
+    except rarfile.RarCannotExec:
+        return False
+    return True
+
+
+@register_handler('rar')
+def read_rar_content(file_path):
+    """
+    RAR 압축 파일 안의 문서/소스 파일 텍스트를 읽습니다.
+
+    rarfile은 파일 객체를 받으면 압축 해제 프로그램에 넘기기 위해 임시 파일로 복사하므로
+    저장된 파일 경로를 그대로 넘깁니다. 파일마다 임시 RAR을 만드는 rarfile의 추출 방식
+    (USE_EXTRACT_HACK)도 끄므로, 압축을 푼 내용은 디스크에 쓰지 않고 파이프로만 읽습니다.
+    """
+    try:
+        import rarfile
+    except ImportError:
+        return False, "RAR 압축 파일을 읽으려면 rarfile 패키지와 unrar 프로그램이 필요합니다. (pip install rarfile)"
+    
+    try:
+        rarfile.USE_EXTRACT_HACK = False
+        with rarfile.RarFile(file_path) as archive:
+            return _read_archive(archive)
+    
+    except ArchiveLimitError as e:
+        return False, str(e)
+    except Exception as e:
+        return False, f"압축 파일 읽기 오류: {str(e)}"
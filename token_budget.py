@@ -0,0 +1,114 @@
+"""
+평가 요청의 토큰 수 추정과 분할 계획
+
+Claude 토크나이저를 사용할 수 없으므로 글자 종류별 평균으로 토큰 수를 넉넉하게
+추정합니다. 영문, 숫자, 기호는 약 4글자에 1토큰, 한글 등 비ASCII 문자는 1글자에 약
+1토큰으로 계산합니다. 추정치가 실제보다 크게 나오도록 잡아 컨텍스트 한도를 넘지 않게 합니다.
+"""
+import os
+import re
+import math
+
+# 토큰 예산 설정 (환경 변수로 변경 가능)
+MODEL_CONTEXT_TOKENS = int(os.environ.get('BEDROCK_CONTEXT_TOKENS', '200000'))              # 모델 컨텍스트 크기
+EVALUATION_INPUT_TOKEN_BUDGET = int(os.environ.get('EVALUATION_INPUT_TOKEN_BUDGET', '50000'))  # 한 번에 평가할 최대 입력 토큰
+EVALUATION_MAX_CHUNKS = int(os.environ.get('EVALUATION_MAX_CHUNKS', '20'))                  # 제출물을 나눌 최대 부분 수
+MAX_OUTPUT_TOKENS = 1000        # 응답 최대 토큰 수
+MIN_CHUNK_TOKENS = 2000         # 부분 하나의 최소 크기 (너무 잘게 나누면 문맥이 끊김)
+REQUEST_OVERHEAD_TOKENS = 200   # 제출물 앞뒤 안내 문장과 메시지 형식
+
+SINGLE_PATH = 'single'
+MAP_REDUCE_PATH = 'map_reduce'
+
+_ASCII_PATTERN = re.compile(r'[\x00-\x7f]')
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+
+def estimate_tokens(text):
+    """
+    텍스트의 토큰 수를 추정
+
+    Args:
+        text (str): 텍스트
+
+    Returns:
+        int: 추정 토큰 수
+    """
+    if not text:
+        return 0
+    ascii_count = len(_ASCII_PATTERN.findall(text))
+    return math.ceil(ascii_count / 4) + (len(text) - ascii_count)
+
+
+def plan_evaluation(prefix_tokens, student_tokens):
+    """
+    한 번에 평가할지, 제출물을 나누어 평가할지 결정
+
+    Args:
+        prefix_tokens (int): 평가 지침, 평가 기준, 모범 답안의 추정 토큰 수
+        student_tokens (int): 학생 제출물의 추정 토큰 수
+
+    Returns:
+        tuple: (평가 방식 SINGLE_PATH/MAP_REDUCE_PATH, 부분당 최대 토큰 수 또는 None)
+
+    Raises:
+        ValueError: 평가 기준과 모범 답안만으로 컨텍스트 크기를 넘는 경우
+    """
+    context_room = MODEL_CONTEXT_TOKENS - MAX_OUTPUT_TOKENS - REQUEST_OVERHEAD_TOKENS - prefix_tokens
+    if context_room < MIN_CHUNK_TOKENS:
+        raise ValueError(
+            f"평가 기준과 모범 답안이 너무 깁니다 (약 {prefix_tokens}토큰). 내용을 줄여서 다시 업로드해주세요."
+        )
+
+    if prefix_tokens + student_tokens + REQUEST_OVERHEAD_TOKENS <= EVALUATION_INPUT_TOKEN_BUDGET:
+        return SINGLE_PATH, None
+
+    chunk_tokens = max(EVALUATION_INPUT_TOKEN_BUDGET - prefix_tokens - REQUEST_OVERHEAD_TOKENS, MIN_CHUNK_TOKENS)
+    # 부분이 너무 많아지면 부분 크기를 키움 (컨텍스트 크기 안에서)
+    chunk_tokens = max(chunk_tokens, math.ceil(student_tokens / EVALUATION_MAX_CHUNKS))
+    return MAP_REDUCE_PATH, min(chunk_tokens, context_room)
+
+
+def _split_oversized(text, max_tokens):
+    """문단 하나가 max_tokens보다 크면 줄 단위로, 그래도 크면 글자 수로 나눕니다."""
+    pieces = []
+    for line in text.split('\n'):
+        while estimate_tokens(line) > max_tokens:
+            # 비ASCII 문자 기준(1글자 1토큰)으로 잘라 항상 예산 안에 들어가게 함
+            pieces.append(line[:max_tokens])
+            line = line[max_tokens:]
+        pieces.append(line)
+    return pieces
+
+
+def split_into_chunks(text, max_tokens):
+    """
+    텍스트를 max_tokens 이하의 부분으로 순서대로 나눔
+
+    가능한 한 문단 경계에서 나누고, 작은 문단은 한 부분에 이어 붙입니다.
+
+    Args:
+        text (str): 나눌 텍스트
+        max_tokens (int): 부분당 최대 추정 토큰 수
+
+    Returns:
+        list: 부분 텍스트 목록
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        pieces = [paragraph] if estimate_tokens(paragraph) <= max_tokens else _split_oversized(paragraph, max_tokens)
+        separator = "\n\n" if pieces == [paragraph] else "\n"
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece) + 1
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("".join(current).strip())
+                current, current_tokens = [], 0
+            current.append(piece + separator)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("".join(current).strip())
+    return [chunk for chunk in chunks if chunk]
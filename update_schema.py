@@ -1,52 +1,28 @@
-import sqlite3
 import os
 import sys
+import database
+from backup import create_backup
+from migrations import get_schema_version, run_migrations
 
 def backup_database():
-    """데이터베이스 백업"""
-    if os.path.exists('database.db'):
-        backup_file = 'database.db.backup'
-        i = 1
-        while os.path.exists(backup_file):
-            backup_file = f'database.db.backup{i}'
-            i += 1
-        
-        os.system(f'cp database.db {backup_file}')
+    """데이터베이스 백업 (온라인 백업 API 사용, 무결성 검사 포함)"""
+    if os.path.exists(database.DATABASE_PATH):
+        backup_file = create_backup('manual')
         print(f"데이터베이스가 {backup_file}으로 백업되었습니다.")
     else:
         print("데이터베이스 파일이 존재하지 않습니다.")
         sys.exit(1)
 
 def update_schema():
-    """데이터베이스 스키마 업데이트"""
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+    """데이터베이스 스키마 업데이트 (적용되지 않은 마이그레이션 실행)"""
+    previous_version = get_schema_version()
+    # 백업은 backup_database()에서 이미 수행했으므로 마이그레이션 전 백업은 생략
+    current_version = run_migrations(backup=False)
     
-    # 기존 테이블 정보 확인
-    cursor.execute("PRAGMA table_info(evaluations)")
-    columns = cursor.fetchall()
-    column_names = [col[1] for col in columns]
-    
-    # 필요한 열 추가
-    if 'is_auto_evaluated' not in column_names:
-        print("is_auto_evaluated 열 추가 중...")
-        cursor.execute("ALTER TABLE evaluations ADD COLUMN is_auto_evaluated BOOLEAN DEFAULT 0")
-    
-    if 'auto_grade' not in column_names:
-        print("auto_grade 열 추가 중...")
-        cursor.execute("ALTER TABLE evaluations ADD COLUMN auto_grade TEXT CHECK(auto_grade IN ('A', 'B', 'C', 'D', 'F', NULL))")
-    
-    if 'auto_comments' not in column_names:
-        print("auto_comments 열 추가 중...")
-        cursor.execute("ALTER TABLE evaluations ADD COLUMN auto_comments TEXT")
-    
-    if 'auto_evaluation_time' not in column_names:
-        print("auto_evaluation_time 열 추가 중...")
-        cursor.execute("ALTER TABLE evaluations ADD COLUMN auto_evaluation_time DATETIME")
-    
-    conn.commit()
-    conn.close()
-    print("데이터베이스 스키마 업데이트가 완료되었습니다.")
+    if current_version == previous_version:
+        print(f"데이터베이스 스키마가 이미 최신 버전입니다. (버전 {current_version})")
+    else:
+        print(f"데이터베이스 스키마 업데이트가 완료되었습니다. (버전 {previous_version} → {current_version})")
 
 if __name__ == "__main__":
     backup_database()